@@ -17,4 +17,84 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES") or "6
 UPSTAGE_API_KEY = SecretStr(os.getenv("UPSTAGE_API_KEY", ''))
 OPENAI_API_KEY = SecretStr(os.getenv("OPENAI_API_KEY", ''))
 CODE_RUNNER_URL = os.getenv("CODE_RUNNER_URL", "http://code-runner:8000")
-BOJ_RUNNER_URL = os.getenv("BOJ_RUNNER_URL", "http://boj-runner:8000")
\ No newline at end of file
+BOJ_RUNNER_URL = os.getenv("BOJ_RUNNER_URL", "http://boj-runner:8000")
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/1")
+# provider별 동시 LLM 요청 수 (공유 커넥션 풀 크기)
+LLM_MAX_CONCURRENCY_UPSTAGE = int(os.getenv("LLM_MAX_CONCURRENCY_UPSTAGE") or "8")
+LLM_MAX_CONCURRENCY_OPENAI = int(os.getenv("LLM_MAX_CONCURRENCY_OPENAI") or "4")
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS") or "600")
+
+# Counterexample search budget (난이도 0 기준, 난이도에 비례해 확장)
+SEARCH_TIME_LIMIT_SECONDS = float(os.getenv("SEARCH_TIME_LIMIT_SECONDS") or "180")
+SEARCH_MAX_LLM_CALLS = int(os.getenv("SEARCH_MAX_LLM_CALLS") or "6")
+SEARCH_MAX_EXECUTIONS = int(os.getenv("SEARCH_MAX_EXECUTIONS") or "300")
+SEARCH_CASES_PER_ROUND = int(os.getenv("SEARCH_CASES_PER_ROUND") or "100")
+# 새로운 행동(출력 형태)을 만들지 못한 채 연속으로 실행된 케이스 수가 이 값을 넘으면
+# 변이 → 생성기 → LLM 재생성 순으로 입력 소스를 바꿈
+SEARCH_STALL_LIMIT = int(os.getenv("SEARCH_STALL_LIMIT") or "20")
+
+# 반례 최소화 (delta debugging)
+SHRINK_TIME_LIMIT_SECONDS = float(os.getenv("SHRINK_TIME_LIMIT_SECONDS") or "30")
+SHRINK_PARALLELISM = int(os.getenv("SHRINK_PARALLELISM") or "8")
+
+# 성능(TLE/MLE) 반례 스트레스 모드
+STRESS_CASES_PER_ROUND = int(os.getenv("STRESS_CASES_PER_ROUND") or "3")
+STRESS_TIME_RATIO = float(os.getenv("STRESS_TIME_RATIO") or "5")  # 참조 해답 대비 이 배수보다 느리면 보고
+STRESS_MIN_REFERENCE_MS = int(os.getenv("STRESS_MIN_REFERENCE_MS") or "100")  # 배수 비교 시 참조 시간 하한
+STRESS_KILL_FACTOR = float(os.getenv("STRESS_KILL_FACTOR") or "3")  # 시간 제한의 몇 배에서 강제 종료할지
+STRESS_DEFAULT_TIME_LIMIT_SECONDS = float(os.getenv("STRESS_DEFAULT_TIME_LIMIT_SECONDS") or "2")
+
+# 참조 해답 언어 (사용자 언어와 무관하게 생성/검증/저장, 앞쪽일수록 우선하므로 빠른 언어를 먼저)
+REFERENCE_LANGUAGES = [lang.strip() for lang in (os.getenv("REFERENCE_LANGUAGES") or "cpp,python").split(",") if lang.strip()]
+# 입력 생성기 언어 (저장된 생성기를 모든 사용자 언어에서 함께 쓰므로 고정)
+INPUT_GENERATOR_LANGUAGE = os.getenv("INPUT_GENERATOR_LANGUAGE") or "python"
+# 반례 탐색 중 참조 해답을 측정 모드로 실행할 때의 시간 제한 (가장 빠른 해답 선택용 실행 시간 기록, 넉넉하게)
+REFERENCE_TIME_LIMIT_SECONDS = float(os.getenv("REFERENCE_TIME_LIMIT_SECONDS") or "10")
+# 저장된 입력 생성기 선택: 수율 상위 N개를 돌아가며 사용, 이 라운드 수 동안 반례를 못 찾으면 (다른 생성기가 찾는 경우) 은퇴
+GENERATOR_POOL_SIZE = int(os.getenv("GENERATOR_POOL_SIZE") or "3")
+GENERATOR_RETIRE_AFTER_ROUNDS = int(os.getenv("GENERATOR_RETIRE_AFTER_ROUNDS") or "10")
+
+# 해결책 후보를 동시에 여러 개 생성 (샘플로 거른 뒤 순위대로 백준에 제출, 1이면 단일 후보)
+SOLVE_CANDIDATES = int(os.getenv("SOLVE_CANDIDATES") or "3")
+
+# 기록된 지연 시간/정답률로 solve tier 선택 (false면 난이도 고정 사다리)
+TIER_ROUTING_ENABLED = (os.getenv("TIER_ROUTING_ENABLED") or "true").lower() in ("1", "true", "yes")
+TIER_ROUTER_WINDOW = int(os.getenv("TIER_ROUTER_WINDOW") or "500")  # 난이도 구간별로 참고할 최근 기록 수
+TIER_ROUTER_MIN_CATEGORY_SAMPLES = int(os.getenv("TIER_ROUTER_MIN_CATEGORY_SAMPLES") or "20")  # 이보다 적으면 분류 무시
+TIER_ROUTER_PRIOR_LATENCY_SECONDS = float(os.getenv("TIER_ROUTER_PRIOR_LATENCY_SECONDS") or "60")  # 기록 없는 tier 가정치
+
+# LLM 응답 캐시 (solve/generate_inputs 프롬프트)
+LLM_CACHE_ENABLED = (os.getenv("LLM_CACHE_ENABLED") or "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS") or str(7 * 24 * 3600))
+
+# 반례 결과 캐시 (주석/공백/변수 이름만 바꾼 재제출은 저장된 반례 하나만 다시 실행해 바로 응답)
+RESULT_CACHE_ENABLED = (os.getenv("RESULT_CACHE_ENABLED") or "true").lower() in ("1", "true", "yes")
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS") or str(7 * 24 * 3600))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES") or "60000")  # 반례 입력+참조 출력이 이보다 크면 저장하지 않음
+
+# 프롬프트 압축 (문제 마크다운에서 프롬프트 종류별로 필요 없는 섹션을 빼고 예제 크기를 제한)
+PROMPT_MAX_SAMPLES = int(os.getenv("PROMPT_MAX_SAMPLES") or "3")
+PROMPT_SAMPLE_MAX_LINES = int(os.getenv("PROMPT_SAMPLE_MAX_LINES") or "30")
+PROMPT_SAMPLE_MAX_CHARS = int(os.getenv("PROMPT_SAMPLE_MAX_CHARS") or "2000")
+PROMPT_MAX_TOKENS = int(os.getenv("PROMPT_MAX_TOKENS") or "6000")  # 넘으면 예제를 빼고 보냄 (0이면 제한 없음)
+
+# 해결책이 없는 문제의 동시 요청 조정 (single-flight)
+SINGLEFLIGHT_LOCK_TTL_SECONDS = int(os.getenv("SINGLEFLIGHT_LOCK_TTL_SECONDS") or "900")  # 리더가 죽어도 락이 풀리는 시간
+SINGLEFLIGHT_WAIT_SECONDS = float(os.getenv("SINGLEFLIGHT_WAIT_SECONDS") or "900")  # 이보다 오래 기다리면 직접 만듦
+SINGLEFLIGHT_POLL_SECONDS = float(os.getenv("SINGLEFLIGHT_POLL_SECONDS") or "1")
+
+# 반례 탐색 실행 체크포인트 (재시작/연결 끊김 후 재개)
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH") or "./checkpoints.sqlite"
+RUN_DETACH_GRACE_SECONDS = float(os.getenv("RUN_DETACH_GRACE_SECONDS") or "60")  # 구독자가 없으면 이 시간 후 실행 중단
+RUN_EVENT_BUFFER = int(os.getenv("RUN_EVENT_BUFFER") or "500")  # 다시 연결한 클라이언트에게 재전송할 최근 이벤트 수
+
+# 반례 탐색 백그라운드 작업 (HTTP API)
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY") or "4")  # 프로세스 전체 동시 실행 수
+JOB_MAX_CONCURRENCY_PER_USER = int(os.getenv("JOB_MAX_CONCURRENCY_PER_USER") or "1")
+JOB_MAX_QUEUED_PER_USER = int(os.getenv("JOB_MAX_QUEUED_PER_USER") or "5")  # 넘으면 제출 거절 (429)
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS") or "3600")  # 끝난 작업 결과 보관 시간
+
+# 인기 문제 사전 풀이 배치 (python -m app.problem.presolve)
+PRESOLVE_CONCURRENCY = int(os.getenv("PRESOLVE_CONCURRENCY") or "2")  # 동시에 푸는 문제 수
+PRESOLVE_MAX_PER_MINUTE = float(os.getenv("PRESOLVE_MAX_PER_MINUTE") or "4")  # 분당 시작 문제 수 (LLM/백준 제출 속도 제한)
+PRESOLVE_PROGRESS_PATH = os.getenv("PRESOLVE_PROGRESS_PATH") or "./presolve_progress.jsonl"
@@ -0,0 +1,282 @@
+"""벤치마크용 문제/제출 코퍼스
+
+문제마다 참조 해답과 (시드를 표준 입력으로 받는) 입력 생성기를 두고, 가짜 LLM은 이 코드를 그대로 답한다.
+제출은 알려진 버그가 있는 코드 (expect_counterexample=False면 반례가 없어야 하는 대조군).
+모두 Python이라 가짜 code-runner가 로컬 인터프리터로 실행할 수 있다.
+"""
+from typing import List, TypedDict
+
+
+class BenchmarkSubmission(TypedDict):
+    name: str
+    code: str
+    expect_counterexample: bool
+
+
+class BenchmarkProblem(TypedDict):
+    problem_id: int
+    title: str  # 가짜 LLM이 프롬프트에서 문제를 찾는 키 (description의 첫 줄 제목과 같아야 함)
+    difficulty: int
+    description: str
+    solution: str
+    generator: str
+    stress_generator: str
+    submissions: List[BenchmarkSubmission]
+
+
+TILING = BenchmarkProblem(
+    problem_id=11727,
+    title="2×n 타일링 2",
+    difficulty=8,
+    description="""# 2×n 타일링 2
+
+|시간 제한|메모리 제한|
+|-------|----------|
+|1 초|256 MB|
+
+## 문제
+
+2×n 직사각형을 1×2, 2×1과 2×2 타일로 채우는 방법의 수를 구하는 프로그램을 작성하시오.
+
+## 입력
+
+첫째 줄에 n이 주어진다. (1 ≤ n ≤ 1,000)
+
+## 출력
+
+첫째 줄에 2×n 크기의 직사각형을 채우는 방법의 수를 10,007로 나눈 나머지를 출력한다.
+
+## 예제 입력/출력
+
+### 예제 1
+
+**입력:**
+```
+2
+```
+
+**출력:**
+```
+3
+```
+
+### 예제 2
+
+**입력:**
+```
+8
+```
+
+**출력:**
+```
+171
+```
+""",
+    solution="""n = int(input())
+a, b = 1, 1
+for _ in range(n - 1):
+    a, b = b, (b + 2 * a) % 10007
+print(b)
+""",
+    generator="""import random
+rng = random.Random(int(input()))
+print(rng.choice([1, 2, 3, rng.randint(1, 30), rng.randint(1, 1000)]))
+""",
+    stress_generator="""print(1000)
+""",
+    submissions=[
+        BenchmarkSubmission(
+            name="wrong-modulus",
+            code="""MOD = 100007
+N = int(input())
+if N <= 2:
+    print([1, 3][N - 1])
+else:
+    a, b = 1, 3
+    for _ in range(N - 2):
+        a, b = b, (b + 2 * a) % MOD
+    print(b)
+""",
+            expect_counterexample=True,
+        ),
+        BenchmarkSubmission(
+            name="missing-n1",
+            code="""n = int(input())
+a, b = 1, 3
+for _ in range(n - 2):
+    a, b = b, (b + 2 * a) % 10007
+print(b)
+""",
+            expect_counterexample=True,
+        ),
+    ],
+)
+
+MAX_SUBARRAY = BenchmarkProblem(
+    problem_id=1912,
+    title="연속합",
+    difficulty=9,
+    description="""# 연속합
+
+|시간 제한|메모리 제한|
+|-------|----------|
+|1 초|128 MB|
+
+## 문제
+
+n개의 정수로 이루어진 임의의 수열이 주어진다. 우리는 이 중 연속된 몇 개의 수를 선택해서 구할 수 있는 합 중 가장 큰 합을 구하려고 한다. 단, 수는 한 개 이상 선택해야 한다.
+
+## 입력
+
+첫째 줄에 정수 n(1 ≤ n ≤ 100,000)이 주어지고 둘째 줄에는 n개의 정수로 이루어진 수열이 주어진다. 수는 -1,000보다 크거나 같고, 1,000보다 작거나 같은 정수이다.
+
+## 출력
+
+첫째 줄에 답을 출력한다.
+
+## 예제 입력/출력
+
+### 예제 1
+
+**입력:**
+```
+10
+10 -4 3 1 5 6 -35 12 21 -1
+```
+
+**출력:**
+```
+33
+```
+
+### 예제 2
+
+**입력:**
+```
+5
+-1 -2 -3 -4 -5
+```
+
+**출력:**
+```
+-1
+```
+""",
+    solution="""n = int(input())
+best = current = -10**9
+for x in map(int, input().split()):
+    current = max(x, current + x)
+    best = max(best, current)
+print(best)
+""",
+    generator="""import random
+rng = random.Random(int(input()))
+n = rng.randint(1, 8)
+low, high = rng.choice([(-1000, -1), (-10, 10), (-1000, 1000), (0, 1000)])
+print(n)
+print(*(rng.randint(low, high) for _ in range(n)))
+""",
+    stress_generator="""import random
+rng = random.Random(int(input()))
+print(100000)
+print(*(rng.randint(-1000, 1000) for _ in range(100000)))
+""",
+    submissions=[
+        BenchmarkSubmission(
+            name="zero-initialized",
+            code="""n = int(input())
+best = current = 0
+for x in map(int, input().split()):
+    current = max(0, current + x)
+    best = max(best, current)
+print(best)
+""",
+            expect_counterexample=True,
+        ),
+        BenchmarkSubmission(
+            name="quadratic",
+            code="""n = int(input())
+a = list(map(int, input().split()))
+best = a[0]
+for i in range(n):
+    total = 0
+    for j in range(i, n):
+        total += a[j]
+        best = max(best, total)
+print(best)
+""",
+            expect_counterexample=False,  # 오답 탐색으로는 반례가 없음 (스트레스 모드 대상)
+        ),
+    ],
+)
+
+DEDUP_SORT = BenchmarkProblem(
+    problem_id=10867,
+    title="중복 빼고 정렬하기",
+    difficulty=5,
+    description="""# 중복 빼고 정렬하기
+
+|시간 제한|메모리 제한|
+|-------|----------|
+|1 초|256 MB|
+
+## 문제
+
+N개의 정수가 주어진다. 이때, N개의 정수를 오름차순으로 정렬하는 프로그램을 작성하시오. 같은 정수는 한 번만 출력한다.
+
+## 입력
+
+첫째 줄에 수의 개수 N (1 ≤ N ≤ 100,000)이 주어진다. 둘째에는 숫자가 주어진다. 이 수는 절댓값이 1,000보다 작거나 같은 정수이다.
+
+## 출력
+
+첫째 줄에 수를 오름차순으로 정렬한 결과를 출력한다. 이때, 같은 수는 한 번만 출력한다.
+
+## 예제 입력/출력
+
+### 예제 1
+
+**입력:**
+```
+10
+1 4 2 3 1 4 2 3 1 2
+```
+
+**출력:**
+```
+1 2 3 4
+```
+""",
+    solution="""input()
+print(*sorted(set(map(int, input().split()))))
+""",
+    generator="""import random
+rng = random.Random(int(input()))
+n = rng.randint(1, 10)
+print(n)
+print(*(rng.randint(-rng.choice([5, 1000]), rng.choice([5, 1000])) for _ in range(n)))
+""",
+    stress_generator="""import random
+rng = random.Random(int(input()))
+print(100000)
+print(*(rng.randint(-1000, 1000) for _ in range(100000)))
+""",
+    submissions=[
+        BenchmarkSubmission(
+            name="string-sort",
+            code="""input()
+print(*sorted(set(input().split())))
+""",
+            expect_counterexample=True,
+        ),
+        BenchmarkSubmission(
+            name="correct",
+            code="""input()
+print(' '.join(map(str, sorted(set(map(int, input().split()))))))
+""",
+            expect_counterexample=False,
+        ),
+    ],
+)
+
+CORPUS: List[BenchmarkProblem] = [TILING, MAX_SUBARRAY, DEDUP_SORT]
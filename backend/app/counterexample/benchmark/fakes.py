@@ -0,0 +1,228 @@
+"""벤치마크용 가짜 LLM / code-runner / boj-runner
+
+실제 서비스 없이 그래프 전체를 돌리기 위한 대역. 지연 시간은 설정값만큼 asyncio.sleep으로 흉내 내고,
+외부 호출 통계(node_stats)에는 실제 클라이언트와 똑같이 기록된다.
+"""
+import sys
+import time
+import asyncio
+import resource
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+from unittest import mock
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable, RunnableLambda
+from app.counterexample.benchmark.corpus import BenchmarkProblem
+from app.counterexample.tools.chat_client import get_tier
+from app.counterexample.utils.tracing import measure_call
+
+
+@dataclass
+class FakeLatencies:
+    """외부 호출 한 번에 더할 지연 시간(초)"""
+    llm: float = 0.0
+    code_runner: float = 0.0
+    boj: float = 0.0
+
+
+class StubChat:
+    """프롬프트에서 문제 제목과 프롬프트 종류를 찾아 코퍼스의 코드를 답하는 결정적 채팅 모델"""
+
+    def __init__(self, corpus: List[BenchmarkProblem], latency: float = 0.0):
+        self.corpus = corpus
+        self.latency = latency
+        self.calls = 0
+
+    def _answer(self, prompt: str) -> str:
+        problem = next((item for item in self.corpus if item["title"] in prompt), None)
+        if problem is None:
+            return "문제를 찾을 수 없습니다."
+        if "시간 초과(TLE)" in prompt:
+            code = problem["stress_generator"]
+        elif "테스트 데이터 생성기" in prompt:
+            code = problem["generator"]
+        else:
+            code = problem["solution"]
+        return f"```python\n{code}```"
+
+    async def _ainvoke(self, prompt_value: Any) -> AIMessage:
+        self.calls += 1
+        prompt = prompt_value.to_string()
+        await asyncio.sleep(self.latency)
+        response = self._answer(prompt)
+        return AIMessage(
+            content=response,
+            usage_metadata={
+                "input_tokens": len(prompt) // 2,
+                "output_tokens": len(response) // 2,
+                "total_tokens": (len(prompt) + len(response)) // 2,
+            },
+        )
+
+    def runnable(self) -> Runnable:
+        return RunnableLambda(self._ainvoke, name="stub_chat")
+
+
+async def run_python(code: str, input_data: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """로컬 인터프리터로 실행하고 (출력, 오류, 시간 ms, 최대 메모리 KB)를 반환"""
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", code,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(input_data.encode()), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return {"output": "", "error": "Time Limit Exceeded", "time_ms": timeout * 1000, "memory_kb": 0, "timed_out": True}
+    # 자식 프로세스 전체의 최대 RSS (실행마다 최댓값이 누적되므로 근사치)
+    memory_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "output": stdout.decode(errors="replace"),
+        "error": stderr.decode(errors="replace") if process.returncode else "",
+        "time_ms": round((time.perf_counter() - started) * 1000, 1),
+        "memory_kb": memory_kb,
+        "timed_out": False,
+    }
+
+
+class FakeCodeRunnerClient:
+    """CodeRunnerClient 대역 (Python 코드만 로컬 서브프로세스로 실행)"""
+
+    latency = 0.0
+    executions = 0
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def run_code(
+        self,
+        code: str,
+        input_data: str,
+        language: str = "python",
+        time_limit: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        with measure_call("code_runner"):
+            await asyncio.sleep(type(self).latency)
+            type(self).executions += 1
+            if language != "python":
+                return {"output": "", "error": f"Unsupported language: {language}", "status": "SUCCESS", "execution_time": 0}
+            result = await run_python(code, input_data, time_limit or 10.0)
+
+        verdict = None
+        if time_limit is not None:
+            if result["timed_out"]:
+                verdict = "TLE"
+            elif memory_limit_mb is not None and result["memory_kb"] > memory_limit_mb * 1024:
+                verdict = "MLE"
+            else:
+                verdict = "RE" if result["error"] else "OK"
+        return {
+            "output": result["output"],
+            "error": result["error"],
+            "status": "SUCCESS",
+            "execution_time": result["time_ms"] / 1000,
+            "time_ms": result["time_ms"] if time_limit is not None else None,
+            "memory_kb": result["memory_kb"] if time_limit is not None else None,
+            "verdict": verdict,
+        }
+
+    async def check_syntax(self, code: str, language: str) -> Dict[str, Any]:
+        return {"output": "", "verdict": "OK"}
+
+    async def revoke(self, task_ids: List[str]) -> bool:
+        return True
+
+
+class FakeAcmicpcClient:
+    """AcmicpcClient 대역 (코퍼스의 참조 해답과 같은 코드만 맞았다고 채점)"""
+
+    corpus: List[BenchmarkProblem] = []
+    latency = 0.0
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def submit_code(self, problem_id: int, code: str, language: str = "python") -> Dict[str, Any]:
+        with measure_call("boj"):
+            await asyncio.sleep(type(self).latency)
+        problem = next((item for item in type(self).corpus if item["problem_id"] == problem_id), None)
+        accepted = problem is not None and code.strip() == problem["solution"].strip()
+        return {"status": "Accepted" if accepted else "Wrong Answer", "raw_output": "", "error": ""}
+
+    async def abort(self, submission_id: str) -> bool:
+        return True
+
+
+async def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+async def _fixed_tier(problem_id: int, difficulty: int, category: str, try_count: int = 0, exclude=()):
+    return get_tier(difficulty + 2 * try_count)
+
+
+# 대역으로 바꿀 이름 -> 이 이름을 직접 import해서 쓰는 모듈
+_PATCH_TARGETS = {
+    "CodeRunnerClient": [
+        "app.counterexample.nodes.solver",
+        "app.counterexample.nodes.code_runner",
+        "app.counterexample.nodes.stress",
+        "app.counterexample.nodes.shrinker",
+        "app.counterexample.tools.generator_runner",
+        "app.counterexample.utils.preflight",
+    ],
+    "AcmicpcClient": ["app.counterexample.nodes.boj_submit"],
+    "get_tier_chat": ["app.counterexample.nodes.solver"],
+    "get_counterexample_chat": ["app.counterexample.nodes.input_gen", "app.counterexample.nodes.stress"],
+    # 기록/조회용 DB 접근은 하지 않음
+    "choose_solve_tier": ["app.counterexample.nodes.solver"],
+    "record_solve_attempts": ["app.counterexample.nodes.solver", "app.counterexample.nodes.boj_submit"],
+    "record_reference_runs": ["app.counterexample.nodes.code_runner"],
+    "record_generator_round": ["app.counterexample.nodes.code_runner"],
+    "LLM_CACHE_ENABLED": ["app.counterexample.tools.llm_cache"],
+}
+
+
+@contextmanager
+def fake_services(corpus: List[BenchmarkProblem], latencies: FakeLatencies) -> Iterator[StubChat]:
+    """그래프 노드가 쓰는 외부 서비스/DB 접근을 대역으로 바꿈 (with 블록 안에서만)"""
+    chat = StubChat(corpus, latencies.llm)
+    runnable = chat.runnable()
+    FakeCodeRunnerClient.latency = latencies.code_runner
+    FakeCodeRunnerClient.executions = 0
+    FakeAcmicpcClient.latency = latencies.boj
+    FakeAcmicpcClient.corpus = corpus
+    replacements = {
+        "CodeRunnerClient": FakeCodeRunnerClient,
+        "AcmicpcClient": FakeAcmicpcClient,
+        "get_tier_chat": lambda tier: runnable,
+        "get_counterexample_chat": lambda difficulty=0: runnable,
+        "choose_solve_tier": _fixed_tier,
+        "record_solve_attempts": _noop,
+        "record_reference_runs": _noop,
+        "record_generator_round": _noop,
+        "LLM_CACHE_ENABLED": False,
+    }
+    with ExitStack() as stack:
+        for name, modules in _PATCH_TARGETS.items():
+            for module in modules:
+                stack.enter_context(mock.patch(f"{module}.{name}", replacements[name]))
+        yield chat
@@ -0,0 +1,172 @@
+"""반례 탐색 파이프라인 오프라인 벤치마크
+
+실제 LLM/code-runner/boj-runner/DB 없이 (MySQL 접속 정보도 필요 없음) CounterexampleRunner를 코퍼스의 (문제, 버그 있는 제출) 전체에 돌려
+단계별 지연 시간, 첫 반례까지의 실행 횟수, 메모리를 보고한다. 그래프를 바꾼 뒤 전후를 비교하는 용도.
+
+    python -m app.counterexample.benchmark.run
+    python -m app.counterexample.benchmark.run --llm-latency 2 --runner-latency 0.05 --boj-latency 5 --repeat 3
+    python -m app.counterexample.benchmark.run --problem 1912 --stress --json bench.json
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+import resource
+import statistics
+import tracemalloc
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+# DB에는 접속하지 않지만 database.mysql_connection이 import 시점에 엔진 URL을 만들므로,
+# 접속 정보가 없는 환경에서도 파싱되도록 .env를 먼저 읽고 빈 항목만 자리표시 값으로 채움
+load_dotenv()
+for _key, _value in {
+    "MYSQL_USER": "benchmark",
+    "MYSQL_PASSWORD": "benchmark",
+    "MYSQL_HOST": "localhost",
+    "MYSQL_PORT": "3306",
+    "MYSQL_DB": "benchmark",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from app.counterexample.benchmark.corpus import CORPUS, BenchmarkProblem, BenchmarkSubmission
+from app.counterexample.benchmark.fakes import FakeLatencies, fake_services
+from app.counterexample.runner import CounterexampleRunner
+from app.counterexample.state import SearchBudget
+
+# 반례를 찾은 뒤의 최소화 단계 (첫 반례까지의 실행 횟수에서 제외)
+POST_COUNTEREXAMPLE_STAGES = ("shrink",)
+
+
+def executions_to_first_counterexample(stats: Dict[str, Any]) -> int:
+    """반례를 찾기까지 쓴 code-runner 실행 수 (예제 실행/생성기 실행 포함, 최소화 제외)"""
+    return int(sum(
+        stage.get("code_runner_calls", 0)
+        for name, stage in (stats.get("stages") or {}).items()
+        if name not in POST_COUNTEREXAMPLE_STAGES
+    ))
+
+
+async def run_case(
+    runner: CounterexampleRunner,
+    problem: BenchmarkProblem,
+    submission: BenchmarkSubmission,
+    budget: Optional[SearchBudget],
+    stress_mode: bool,
+) -> Dict[str, Any]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await runner.find_counterexample(
+        problem["problem_id"],
+        problem_description=problem["description"],
+        user_code=submission["code"],
+        language="python",
+        difficulty=problem["difficulty"],
+        budget=budget,
+        stress_mode=stress_mode,
+        solution_language="python",
+    )
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = result.stats or {}
+    found = bool(result.counterexample_found)
+    return {
+        "problem_id": problem["problem_id"],
+        "submission": submission["name"],
+        "success": result.success,
+        "error": getattr(result, "error", None),
+        "counterexample_found": found,
+        # expect_counterexample은 오답 탐색 기준이므로 스트레스 모드에서는 비교하지 않음
+        "expected": None if stress_mode else submission["expect_counterexample"],
+        "elapsed_seconds": round(elapsed, 3),
+        "executions": stats.get("executions", 0),
+        "executions_to_first_counterexample": executions_to_first_counterexample(stats) if found else None,
+        "test_cases_run": stats.get("test_cases_run", 0),
+        "llm_calls": stats.get("llm_calls", 0),
+        "peak_python_kb": peak // 1024,
+        "stages": stats.get("stages", {}),
+    }
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """실행 전체의 단계별 평균 시간과 첫 반례까지의 실행 수 분포"""
+    stages: Dict[str, List[float]] = {}
+    for item in results:
+        for name, stage in item["stages"].items():
+            stages.setdefault(name, []).append(stage["duration_ms"])
+    to_first = [item["executions_to_first_counterexample"] for item in results if item["counterexample_found"]]
+    return {
+        "runs": len(results),
+        "matched_expectation": sum(1 for item in results if item["counterexample_found"] == item["expected"]),
+        "with_expectation": sum(1 for item in results if item["expected"] is not None),
+        "stage_mean_ms": {name: round(statistics.mean(values), 1) for name, values in stages.items()},
+        "stage_total_ms": {name: round(sum(values), 1) for name, values in stages.items()},
+        "executions_to_first_counterexample": {
+            "median": statistics.median(to_first) if to_first else None,
+            "max": max(to_first) if to_first else None,
+        },
+        "elapsed_seconds_total": round(sum(item["elapsed_seconds"] for item in results), 3),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def print_report(results: List[Dict[str, Any]], summary: Dict[str, Any]) -> None:
+    print(f"{'problem':>8} {'submission':<20} {'found':>5} {'ok':>3} {'sec':>8} {'exec':>5} {'to-1st':>6} {'llm':>4} {'peak kb':>8}")
+    for item in results:
+        print(
+            f"{item['problem_id']:>8} {item['submission']:<20} {str(item['counterexample_found']):>5} "
+            f"{'-' if item['expected'] is None else 'y' if item['counterexample_found'] == item['expected'] else 'n':>3} {item['elapsed_seconds']:>8.3f} "
+            f"{item['executions']:>5} {str(item['executions_to_first_counterexample'] or '-'):>6} "
+            f"{item['llm_calls']:>4} {item['peak_python_kb']:>8}"
+            + (f"  error: {item['error']}" if item["error"] else "")
+        )
+    print()
+    print("stage mean ms:", json.dumps(summary["stage_mean_ms"], ensure_ascii=False))
+    print("executions to first counterexample:", summary["executions_to_first_counterexample"])
+    print(f"matched expectation: {summary['matched_expectation']}/{summary['with_expectation']}, "
+          f"total {summary['elapsed_seconds_total']}s, max RSS {summary['max_rss_kb']} KB")
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="가짜 LLM/실행기로 반례 탐색 파이프라인 벤치마크")
+    parser.add_argument("--problem", type=int, action="append", help="이 문제만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="LLM 호출 한 번의 지연(초)")
+    parser.add_argument("--runner-latency", type=float, default=0.0, help="code-runner 실행 한 번의 지연(초)")
+    parser.add_argument("--boj-latency", type=float, default=0.0, help="백준 제출 한 번의 지연(초)")
+    parser.add_argument("--max-executions", type=int, default=200, help="제출마다 code-runner 실행 예산")
+    parser.add_argument("--time-limit", type=float, default=120.0, help="제출마다 탐색 시간 예산(초)")
+    parser.add_argument("--stress", action="store_true", help="성능(TLE/MLE) 반례 모드로 실행")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    corpus = [problem for problem in CORPUS if not args.problem or problem["problem_id"] in args.problem]
+    budget: SearchBudget = {
+        "time_limit_seconds": args.time_limit,
+        "max_llm_calls": 6,
+        "max_executions": args.max_executions,
+    }
+    latencies = FakeLatencies(llm=args.llm_latency, code_runner=args.runner_latency, boj=args.boj_latency)
+
+    results: List[Dict[str, Any]] = []
+    with fake_services(CORPUS, latencies):
+        runner = CounterexampleRunner()
+        for _ in range(args.repeat):
+            for problem in corpus:
+                for submission in problem["submissions"]:
+                    results.append(await run_case(runner, problem, submission, budget, args.stress))
+
+    summary = summarize(results)
+    print_report(results, summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"latencies": vars(latencies), "summary": summary, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
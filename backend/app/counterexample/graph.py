@@ -1,41 +1,107 @@
-from langgraph.graph import StateGraph, END
+from typing import List, Optional
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import StateGraph, START, END
 from app.counterexample.state import CounterexampleState
 from app.counterexample.nodes.solver import generate_solution
 from app.counterexample.nodes.input_gen import generate_test_cases
 from app.counterexample.nodes.code_runner import run_codes_and_compare
 from app.counterexample.nodes.boj_submit import boj_submit
+from app.counterexample.nodes.shrinker import shrink_counterexample
+from app.counterexample.nodes.stress import generate_stress_inputs, run_stress_test
+from app.counterexample.utils.budget import is_budget_exhausted
+from app.counterexample.utils.tracing import traced_node
+from app.counterexample.utils.cancel import cancellable_node
 
 def should_continue(state: CounterexampleState) -> str:
     """반례를 찾았는지 확인하여 다음 단계 결정"""
     if state.get("counterexample_found", False):
+        return "found"
+    # 예산을 모두 사용했다면 반례 없이 종료
+    if state.get("budget_exhausted") or is_budget_exhausted(state):
         return "end"
     
     return "continue"
 
+def route_start(state: CounterexampleState) -> List[str]:
+    """해결책 생성(solve)과 입력 생성기 작성(generate_inputs)을 동시에 시작
+
+    입력 생성기는 문제 설명에만 의존하므로 solve/boj_submit과 병렬로 만들어 두고,
+    두 갈래가 모두 준비되면(solution_ready, generator_ready) run_and_compare에서 합류한다.
+    스트레스 모드는 일반 입력 생성기를 쓰지 않으므로 solve만 시작한다.
+    """
+    if state.get("stress_mode"):
+        return ["solve"]
+    if state.get("test_case_generator"):
+        return ["solve", "generator_ready"]
+    return ["solve", "generate_inputs"]
+
+def mark_ready(state: CounterexampleState) -> CounterexampleState:
+    """병렬 갈래의 합류 지점 표시용 노드 (상태 변경 없음)"""
+    return {}
+
+def should_search(state: CounterexampleState) -> str:
+    """해결책과 입력 생성기가 준비된 뒤 반례 탐색을 할지 결정 (사전 풀이는 준비만 하고 종료)"""
+    return "end" if state.get("prepare_only") else "search"
+
 def should_have_solution(state: CounterexampleState) -> str:
     """solve 이후 올바른 해결책이 생성되었는지 확인하여 다음 단계 결정"""
-    return "ok" if state.get("correct_solution") else "retry"
+    if state.get("correct_solution"):
+        return "ok"
+    return "end" if is_budget_exhausted(state) else "retry"
 
 def should_solution_validated(state: CounterexampleState) -> str:
-    return "ok" if state.get("is_solution_validated") else "retry"
+    if state.get("is_solution_validated"):
+        # 스트레스 모드라면 최대 제약 입력 생성기로, 아니면 일반 입력 생성기로
+        return "stress" if state.get("stress_mode") else "ok"
+    return "end" if is_budget_exhausted(state) else "retry"
 
 def should_have_inputs(state: CounterexampleState) -> str:
     """generate_inputs 이후 테스트케이스 생성기가 있는지 확인하여 다음 단계 결정"""
-    return "ok" if state.get("test_case_generator") else "retry"
+    if state.get("test_case_generator"):
+        return "ok"
+    return "end" if is_budget_exhausted(state) else "retry"
+
+def should_have_stress_inputs(state: CounterexampleState) -> str:
+    """generate_stress_inputs 이후 스트레스 입력 생성기가 있는지 확인하여 다음 단계 결정"""
+    if state.get("stress_generator"):
+        return "ok"
+    return "end" if is_budget_exhausted(state) else "retry"
+
+def should_continue_stress(state: CounterexampleState) -> str:
+    """성능 반례를 찾았거나 예산을 소진했으면 종료, 아니면 다른 최악의 경우를 노린 생성기로 재시도"""
+    if state.get("counterexample_found", False):
+        return "end"
+    if state.get("budget_exhausted") or is_budget_exhausted(state):
+        return "end"
+    return "continue"
 
-def _build_base_graph(entry_point: str = "solve"):
-    """기본 그래프 구조를 생성하는 공통 함수"""
+def _node(name: str, func):
+    """작업 노드: 실행 통계를 기록하고, 취소되면 진행 중인 외부 호출까지 중단"""
+    return traced_node(name, cancellable_node(func))
+
+def _build_base_graph(entry_point: str = "solve", checkpointer: Optional[BaseCheckpointSaver] = None):
+    """기본 그래프 구조를 생성하는 공통 함수 (checkpointer가 있으면 노드마다 상태를 저장)"""
     # StateGraph 생성
     graph = StateGraph(CounterexampleState)
     
-    # 노드 추가
-    graph.add_node("solve", generate_solution)
-    graph.add_node("boj_submit", boj_submit)
-    graph.add_node("generate_inputs", generate_test_cases)
-    graph.add_node("run_and_compare", run_codes_and_compare)
+    # 노드 추가 (합류 표시용 노드를 제외하고 실행 시간/외부 호출 통계를 기록)
+    graph.add_node("solve", _node("solve", generate_solution))
+    graph.add_node("boj_submit", _node("boj_submit", boj_submit))
+    graph.add_node("generate_inputs", _node("generate_inputs", generate_test_cases))
+    graph.add_node("regenerate_inputs", _node("regenerate_inputs", generate_test_cases))
+    graph.add_node("solution_ready", mark_ready)
+    graph.add_node("generator_ready", mark_ready)
+    graph.add_node("prepared", mark_ready)
+    graph.add_node("run_and_compare", _node("run_and_compare", run_codes_and_compare))
+    graph.add_node("shrink", _node("shrink", shrink_counterexample))
+    graph.add_node("generate_stress_inputs", _node("generate_stress_inputs", generate_stress_inputs))
+    graph.add_node("run_stress_test", _node("run_stress_test", run_stress_test))
     
-    # 시작점 설정
-    graph.set_entry_point(entry_point)
+    # 시작점 설정 (solve부터 시작하면 generate_inputs와 병렬로 분기)
+    if entry_point == "solve":
+        graph.add_conditional_edges(START, route_start, ["solve", "generate_inputs", "generator_ready"])
+    else:
+        graph.set_entry_point(entry_point)
     
     # solve 이후 correct_solution이 없으면 다시 solve로 돌아가 재시도
     graph.add_conditional_edges(
@@ -44,15 +110,18 @@ def _build_base_graph(entry_point: str = "solve"):
         {
             "ok": "boj_submit",
             "retry": "solve",
+            "end": END,
         },
     )
-    # 백준 제출 후 올바른 해결책이 검증되지 않으면 다시 solve로 돌아가 재시도
+    # 백준 제출 후 올바른 해결책이 검증되지 않으면 다시 solve로 돌아가 재시도 (입력 생성기는 다시 만들지 않음)
     graph.add_conditional_edges(
         "boj_submit",
         should_solution_validated,
         {
-            "ok": "generate_inputs",
+            "ok": "solution_ready",
+            "stress": "generate_stress_inputs",
             "retry": "solve",
+            "end": END,
         },
     )
     # generate_inputs 이후 test_case_generator가 없으면 다시 generate_inputs로 돌아가 재시도
@@ -60,27 +129,75 @@ def _build_base_graph(entry_point: str = "solve"):
         "generate_inputs",
         should_have_inputs,
         {
-            "ok": "run_and_compare",
+            "ok": "generator_ready",
             "retry": "generate_inputs",
+            "end": END,
+        },
+    )
+    # 검증된 해결책과 입력 생성기가 모두 준비되면 합류
+    graph.add_edge(["solution_ready", "generator_ready"], "prepared")
+    graph.add_conditional_edges(
+        "prepared",
+        should_search,
+        {
+            "search": "run_and_compare",
+            "end": END,
+        },
+    )
+
+    # 라운드가 끝난 뒤 새 입력 생성기는 합류 지점을 거치지 않고 바로 run_and_compare로
+    # (새 생성기를 만들지 못해도 기존 생성기가 상태에 남아 있으므로 그대로 run_and_compare로 돌아감)
+    graph.add_conditional_edges(
+        "regenerate_inputs",
+        should_have_inputs,
+        {
+            "ok": "run_and_compare",
+            "retry": "regenerate_inputs",
+            "end": END,
         },
     )
     
-    # 조건부 엣지: 반례를 찾았으면 종료, 아니면 더 테스트케이스 생성
+    # 조건부 엣지: 반례를 찾았으면 최소화 후 종료, 예산을 소진했으면 종료, 아니면 더 테스트케이스 생성
     graph.add_conditional_edges(
         "run_and_compare",
         should_continue,
         {
+            "found": "shrink",
             "end": END,
-            "continue": "generate_inputs"
+            "continue": "regenerate_inputs"
         }
     )
+    graph.add_edge("shrink", END)
+
+    # 스트레스 모드: 최대 제약 입력으로 실행 시간/메모리 비교 (성능 반례는 최소화하지 않음)
+    graph.add_conditional_edges(
+        "generate_stress_inputs",
+        should_have_stress_inputs,
+        {
+            "ok": "run_stress_test",
+            "retry": "generate_stress_inputs",
+            "end": END,
+        },
+    )
+    graph.add_conditional_edges(
+        "run_stress_test",
+        should_continue_stress,
+        {
+            "end": END,
+            "continue": "generate_stress_inputs",
+        },
+    )
     
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
 
-def build_counterexample_graph():
+def build_counterexample_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
     """반례 찾기 워크플로우 그래프 구성 (solve 노드부터 시작)"""
-    return _build_base_graph("solve")
+    return _build_base_graph("solve", checkpointer)
 
-def build_counterexample_graph_from_compare():
+def build_counterexample_graph_from_compare(checkpointer: Optional[BaseCheckpointSaver] = None):
     """run_and_compare 노드부터 시작하는 반례 찾기 워크플로우 그래프 구성"""
-    return _build_base_graph("run_and_compare")
\ No newline at end of file
+    return _build_base_graph("run_and_compare", checkpointer)
+
+def build_stress_graph_from_solution(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """검증된 해결책이 있을 때 generate_stress_inputs 노드부터 시작하는 성능 반례 찾기 그래프 구성"""
+    return _build_base_graph("generate_stress_inputs", checkpointer)
\ No newline at end of file
@@ -1,25 +1,57 @@
 import logging
+from langchain_core.runnables import RunnableConfig
+from app.config import REFERENCE_LANGUAGES
 from app.counterexample.state import CounterexampleState
+from app.counterexample.utils.cancel import get_cancel_event
 from app.counterexample.tools.acmicpc_client import AcmicpcClient
+from app.counterexample.tools.llm_cache import invalidate
+from app.counterexample.tools.tier_router import record_solve_attempts
+from app.counterexample.utils.budget import is_time_exhausted
 
-async def boj_submit(state: CounterexampleState) -> CounterexampleState:
-    """백준 결과를 통해 올바른 해결책 검증"""
+async def boj_submit(state: CounterexampleState, config: RunnableConfig) -> CounterexampleState:
+    """백준 결과를 통해 올바른 해결책 검증
+
+    후보가 여러 개면 순위대로 하나씩 제출하고, 처음 맞은 후보를 올바른 해결책으로 채택한다.
+    (boj-runner는 문제별 작업 디렉터리 하나에 코드를 써서 제출하므로 같은 문제를 병렬로 제출할 수 없음)
+    """
     problem_id = state.get("problem_id", 1000)
-    correct_solution = state.get("correct_solution", "")
-    language = state.get("language", "python")
-    
+    candidates = state.get("solution_candidates") or [state.get("correct_solution", "")]
+    cache_keys = state.get("solution_cache_keys") or []
+    attempts = state.get("solution_attempts") or []
+    language = state.get("solution_language", REFERENCE_LANGUAGES[0])
+    cancel_event = get_cancel_event(config)
+    solution_generate_try = state.get("solution_generate_try", 0) + 1
+    rejected_keys = []
+    judged = []
+
     async with AcmicpcClient() as client:
-        submit_result = await client.submit_code(problem_id, correct_solution, language)
+        for rank, candidate in enumerate(candidates):
+            # 첫 후보는 항상 제출하고, 나머지는 취소/시간 예산이 남아 있을 때만
+            if rank > 0 and ((cancel_event and cancel_event.is_set()) or is_time_exhausted(state)):
+                break
+            submit_result = await client.submit_code(problem_id, candidate, language)
+            # 채점된 후보만 tier 라우팅 학습 기록에 남김
+            if not submit_result["error"] and rank < len(attempts) and attempts[rank]:
+                judged.append({**attempts[rank], "verdict": submit_result["status"]})
+
+            if submit_result["error"] or submit_result["status"] != "Accepted":
+                logging.info(f"Solution candidate {rank + 1}/{len(candidates)} rejected: {submit_result['status']}")
+                # 연결 오류 등 채점 결과가 없는 경우는 틀린 해결책으로 보지 않음
+                if not submit_result["error"] and rank < len(cache_keys):
+                    rejected_keys.append(cache_keys[rank])
+                continue
 
-        if submit_result["error"] or submit_result["status"] != "Accepted":
+            await invalidate(rejected_keys)
+            await record_solve_attempts(judged)
             return {
-                **state, 
-                "is_solution_validated": False, 
-                "solution_generate_try": state.get("solution_generate_try", 0) + 1,
+                "correct_solution": candidate,
+                "is_solution_validated": True,
+                "solution_generate_try": solution_generate_try,
             }
 
-        return {
-            **state,
-            "is_solution_validated": True,
-            "solution_generate_try": state.get("solution_generate_try", 0) + 1
-        }
+    await invalidate(rejected_keys)
+    await record_solve_attempts(judged)
+    return {
+        "is_solution_validated": False,
+        "solution_generate_try": solution_generate_try,
+    }
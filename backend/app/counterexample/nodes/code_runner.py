@@ -1,60 +1,202 @@
+import asyncio
 import logging
-from typing import Dict, Any
-from app.counterexample.state import CounterexampleState
+from typing import Dict, Any, List, Tuple
+from langchain_core.runnables import RunnableConfig
+from app.config import (
+    SEARCH_CASES_PER_ROUND,
+    SEARCH_STALL_LIMIT,
+    REFERENCE_LANGUAGES,
+    REFERENCE_TIME_LIMIT_SECONDS,
+)
+from app.counterexample.state import CaseRecord, CounterexampleState
+from app.counterexample.utils.cancel import get_cancel_event
 from app.counterexample.tools.code_runner_client import CodeRunnerClient
+from app.counterexample.tools.generator_runner import generator_version, input_digest, run_generator
+from app.counterexample.tools.reference_stats import record_generator_round, record_reference_runs
+from app.counterexample.utils.budget import is_time_exhausted, remaining_executions
+from app.counterexample.utils.compare import compare_outputs, detect_compare_options
+from app.counterexample.utils.markdown import extract_samples
+from app.counterexample.utils.mutator import InputMutator, MAX_SEED_LENGTH, behaviour_signature
 
-async def run_codes_and_compare(state: CounterexampleState) -> CounterexampleState:
-    """사용자 코드와 올바른 해결책을 실행하고 결과 비교"""
+# 라운드 사이에 유지하는 생성기 입력 코퍼스 / 관찰된 행동 시그니처 / 실행한 입력 해시 / 최근 케이스 요약 개수 상한
+MAX_INPUT_CORPUS = 32
+MAX_SEEN_BEHAVIOURS = 1000
+MAX_SEEN_INPUTS = 2000
+MAX_RECENT_CASES = 20
+
+
+async def run_codes_and_compare(state: CounterexampleState, config: RunnableConfig) -> CounterexampleState:
+    """사용자 코드와 올바른 해결책을 실행하고 결과 비교
+
+    입력은 우선 샘플/코퍼스 입력을 로컬에서 변이(mutation)시켜 만들고, 변이가 더 이상 새로운 행동을
+    만들지 못하면 LLM이 작성한 생성기를 실행한다. 생성기마저 정체되면 라운드를 끝내고
+    generate_inputs(LLM)로 돌아가 새 생성기를 받는다.
+    라운드가 끝나면 참조 해답의 실행 시간과 생성기의 수율을 기록한다 (다음 탐색의 해답/생성기 선택용).
+    생성기는 매번 다음 시드로 실행하고 케이스마다 (생성기 버전, 시드)를 남기므로, 생성기 입력은
+    materialize_input으로 다시 만들 수 있다. 이미 실행한 입력(해시 기준)은 다시 실행하지 않는다.
+    """
     user_code = state.get("user_code", "")
     correct_solution = state.get("correct_solution", "")
     test_case_generator = state.get("test_case_generator", "")
     language = state.get("language", "python")
-    cancel_event = state.get("_cancel_event")
+    solution_language = state.get("solution_language", REFERENCE_LANGUAGES[0])
+    cancel_event = get_cancel_event(config)
 
     if not user_code or not correct_solution or not test_case_generator:
-        return {**state, "counterexample_found": False}
+        return {"counterexample_found": False}
+
+    samples = extract_samples(state.get("problem_description", ""))
+    compare_options = detect_compare_options(state.get("problem_description", ""))
+    input_corpus = list(state.get("input_corpus", []))
+    mutator = InputMutator([sample_input for sample_input, _ in samples] + input_corpus)
+    seen_behaviours = dict.fromkeys(state.get("seen_behaviours", []))
+    seen_inputs = dict.fromkeys(state.get("seen_input_hashes", []))
+    generator_seed = state.get("generator_seed", 0)
+    generator_hash = generator_version(test_case_generator)
 
     async with CodeRunnerClient() as code_runner:
 
-        user_outputs = []
-        correct_outputs = []
+        # 반복 횟수와 무관하게 메모리가 일정하도록 최근 케이스의 해시만 링 버퍼로 유지
+        recent_cases: List[CaseRecord] = list(state.get("recent_cases", []))
         counterexample_found = False
         counterexample_input = None
         counterexample_detail = None
+        executions = state.get("executions", 0)
+        test_cases_run = state.get("test_cases_run", 0)
+        remaining = remaining_executions(state)
+        budget_exhausted = False
+        mutation_stall = 0
+        generator_stall = 0
+        reference_runs = 0
+        reference_time_ms = 0.0
+        generator_cases = 0
+
+        async def record_round(found: bool, generator_failed: bool = False) -> None:
+            problem_id = state.get("problem_id", 0)
+            await record_reference_runs(problem_id, correct_solution, reference_runs, reference_time_ms)
+            await record_generator_round(problem_id, test_case_generator, generator_cases, found, generator_failed)
 
-        for i in range(100):
+        for i in range(SEARCH_CASES_PER_ROUND):
             if cancel_event and cancel_event.is_set():
                 logging.info("Cancellation requested: stopping code-runner loop early")
                 break
-            logging.info(f"Running test case {i+1}")
 
-            input_gen_result = await code_runner.run_code(test_case_generator, language)
-            if input_gen_result["error"]:
-                logging.error(f"Input generation failed: {input_gen_result['error']}")
-                return {**state, "counterexample_found": False}
-            test_input = input_gen_result.get("output", "")
+            use_mutation = bool(mutator.seeds) and mutation_stall < SEARCH_STALL_LIMIT
+            if not use_mutation and generator_stall >= SEARCH_STALL_LIMIT:
+                logging.info("Mutation and generator stalled: requesting a new input generator")
+                break
+
+            # 변이 입력은 사용자/정답 코드 2번, 생성기 입력은 생성기까지 3번의 실행을 소모
+            spent = executions - state.get("executions", 0)
+            if is_time_exhausted(state) or remaining - spent < (2 if use_mutation else 3):
+                logging.info("Search budget exhausted: stopping code-runner loop")
+                budget_exhausted = True
+                break
+            logging.info(f"Running test case {i+1} ({'mutation' if use_mutation else 'generator'})")
+
+            seed = None
+            if use_mutation:
+                test_input = mutator.mutate() or ""
+            else:
+                generator_seed += 1
+                seed = generator_seed
+                input_gen_result = await run_generator(code_runner, test_case_generator, seed)
+                executions += 1
+                if input_gen_result["error"]:
+                    logging.error(f"Input generation failed: {input_gen_result['error']}")
+                    await record_round(False, generator_failed=True)
+                    return {
+                        "executions": executions,
+                        "test_cases_run": test_cases_run,
+                        "recent_cases": recent_cases,
+                        "input_corpus": input_corpus,
+                        "seen_behaviours": list(seen_behaviours)[-MAX_SEEN_BEHAVIOURS:],
+                        "seen_input_hashes": list(seen_inputs)[-MAX_SEEN_INPUTS:],
+                        "generator_seed": generator_seed,
+                        "counterexample_found": False,
+                    }
+                test_input = input_gen_result.get("output", "")
+                generator_cases += 1
+                mutator.add_seed(test_input)
+                if len(test_input) <= MAX_SEED_LENGTH:
+                    input_corpus = (input_corpus + [test_input])[-MAX_INPUT_CORPUS:]
             logging.info(f"Test input: {test_input}")
 
+            # 같은 입력은 같은 결과를 내므로 사용자/정답 코드를 다시 실행하지 않음 (새로운 행동이 없는 것으로 취급)
+            input_hash = input_digest(test_input)
+            if input_hash in seen_inputs:
+                if use_mutation:
+                    mutation_stall += 1
+                else:
+                    generator_stall += 1
+                continue
+            seen_inputs[input_hash] = None
+
             try:
-                # 사용자 코드 실행
-                user_result = await code_runner.run_code(user_code, test_input, language)
-                user_output = user_result.get("output", "").strip()
-                user_outputs.append(user_output)
-                
-                # 올바른 해결책 실행
-                correct_result = await code_runner.run_code(correct_solution, test_input, language)
-                correct_output = correct_result.get("output", "").strip()
-                correct_outputs.append(correct_output)
+                # 사용자 코드와 올바른 해결책을 동시에 실행
+                # 참조 해답의 시간 기록에는 라운드당 측정 한 번이면 충분하므로 나머지는 일반 실행
+                user_result, correct_result = await run_pair(
+                    code_runner, user_code, correct_solution, test_input, language, solution_language,
+                    measure=reference_runs == 0,
+                )
+                executions += 2
+                user_output = user_result.get("output", "")
+                if correct_result.get("verdict") == "OK" and correct_result.get("time_ms") is not None:
+                    reference_runs += 1
+                    reference_time_ms += correct_result["time_ms"]
+
+                # 정답 코드가 실패(RE/TLE/MLE)한 입력은 정답 출력이 없으므로 비교하지 않고 버림
+                # (변이 입력은 제약을 벗어난 입력, 생성기 입력은 생성기의 실패로 보고 정체로 셈)
+                if correct_result.get("error"):
+                    logging.warning(f"Reference solution failed on test case {i+1}: {correct_result['error']}")
+                    if use_mutation:
+                        mutation_stall += 1
+                    else:
+                        generator_stall += 1
+                    continue
+
+                test_cases_run += 1
+                correct_output = correct_result.get("output", "")
+                comparison = compare_outputs(correct_output, user_output, **compare_options)
+                recent_cases = (recent_cases + [{
+                    "index": test_cases_run,
+                    "source": "mutation" if use_mutation else "generator",
+                    "generator_hash": None if use_mutation else generator_hash,
+                    "seed": seed,
+                    "input_hash": input_hash,
+                    "input_size": len(test_input),
+                    "user_output_hash": input_digest(user_output),
+                    "correct_output_hash": input_digest(correct_output),
+                    "equal": comparison["equal"],
+                    "user_error": bool(user_result.get("error")),
+                }])[-MAX_RECENT_CASES:]
+
+                signature = behaviour_signature(user_result, correct_result, comparison["equal"])
+                is_new_behaviour = signature not in seen_behaviours
+                seen_behaviours[signature] = None
+                if use_mutation:
+                    mutation_stall = 0 if is_new_behaviour else mutation_stall + 1
+                elif is_new_behaviour:
+                    # 생성기 입력이 새 시드가 되었으니 변이를 다시 시도
+                    generator_stall = 0
+                    mutation_stall = 0
+                else:
+                    generator_stall += 1
                 
-                # 출력 비교
-                if user_output != correct_output:
+                # 출력 비교 (채점 방식에 맞게 정규화, 처음 다른 위치 기록)
+                if not comparison["equal"]:
                     counterexample_found = True
                     counterexample_input = test_input
                     counterexample_detail = {
                         "test_case_index": i,
                         "input": test_input,
-                        "user_output": user_output,
-                        "correct_output": correct_output,
+                        "user_output": user_output.strip(),
+                        "correct_output": correct_output.strip(),
+                        "diff": comparison,
+                        "source": "mutation" if use_mutation else "generator",
+                        "generator_hash": None if use_mutation else generator_hash,
+                        "seed": seed,
+                        "input_hash": input_hash,
                         "description": f"테스트케이스 {i+1}"
                     }
                     break
@@ -67,19 +209,53 @@ async def run_codes_and_compare(state: CounterexampleState) -> CounterexampleSta
                     "test_case_index": i,
                     "input": test_input,
                     "error": str(e),
+                    "generator_hash": None if use_mutation else generator_hash,
+                    "seed": seed,
+                    "input_hash": input_hash,
                     "description": f"테스트케이스 {i+1}"
                 }
                 break
-        
+
+        await record_round(counterexample_found)
         return {
-            **state,
-            "user_outputs": user_outputs,
-            "correct_outputs": correct_outputs,
+            "recent_cases": recent_cases,
+            "executions": executions,
+            "test_cases_run": test_cases_run,
+            "input_corpus": input_corpus,
+            "seen_behaviours": list(seen_behaviours)[-MAX_SEEN_BEHAVIOURS:],
+            "seen_input_hashes": list(seen_inputs)[-MAX_SEEN_INPUTS:],
+            "generator_seed": generator_seed,
+            "budget_exhausted": budget_exhausted,
             "counterexample_found": counterexample_found,
             "counterexample_input": counterexample_input,
             "counterexample_detail": counterexample_detail
         }
 
+async def run_pair(
+    code_runner: CodeRunnerClient,
+    user_code: str,
+    correct_solution: str,
+    test_input: str,
+    language: str,
+    solution_language: str,
+    measure: bool = False,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """같은 입력으로 사용자 코드와 올바른 해결책(참조 해답 언어)을 동시에 실행
+
+    measure면 참조 해답을 측정 모드로 실행해 time_ms를 받는다 (저장된 해답 중 가장 빠른 것을 고르는 기록용).
+    넉넉한 제한도 넘기면 참조 해답이 실패한 것으로 보고 error를 채운다.
+    """
+    user_result, correct_result = await asyncio.gather(
+        code_runner.run_code(user_code, test_input, language),
+        code_runner.run_code(
+            correct_solution, test_input, solution_language,
+            time_limit=REFERENCE_TIME_LIMIT_SECONDS if measure else None,
+        ),
+    )
+    if correct_result.get("verdict") in ("TLE", "MLE") and not correct_result.get("error"):
+        correct_result["error"] = f"Reference solution {correct_result['verdict']}"
+    return user_result, correct_result
+
 async def execute_single_code(code: str, test_input: str, language: str) -> Dict[str, Any]:
     """단일 코드 실행"""
     async with CodeRunnerClient() as code_runner:
@@ -1,30 +1,49 @@
 import logging
-from langchain_core.output_parsers import StrOutputParser
+from app.config import INPUT_GENERATOR_LANGUAGE
 from app.counterexample.state import CounterexampleState
-from app.counterexample.prompts.input_gen import INPUT_GEN_PROMPT
+from app.counterexample.prompts.input_gen import INPUT_GEN_PROMPT, INPUT_GEN_PROMPT_VERSION
 from app.counterexample.tools.chat_client import get_counterexample_chat
-from app.counterexample.utils.markdown import extract_code_block
+from app.counterexample.tools.llm_cache import invoke_with_cache, invalidate
+from app.counterexample.utils.preflight import preflight
+from app.counterexample.utils.prompt_compact import compact_problem
 
 async def generate_test_cases(state: CounterexampleState) -> CounterexampleState:
-    """문제에 맞는 다양한 테스트케이스 생성"""
+    """문제에 맞는 다양한 테스트케이스 생성
+
+    이미 생성기가 있는데 다시 호출된 경우(regenerate_inputs)는 새 생성기가 필요하므로 LLM 캐시를 읽지 않는다.
+    새 생성기를 만들지 못하면 test_case_generator를 반환하지 않으므로, 재생성 실패 시에는 기존 생성기로
+    run_and_compare를 이어간다. LLM 호출 수는 캐시에서 응답을 가져온 경우를 빼고 시도마다 센다.
+    """
     problem = state.get("problem_description", "")
-    language = state.get("language", "python")
-    
+    # 저장된 생성기를 모든 사용자 언어에서 함께 쓰므로 생성기 언어는 고정
+    language = INPUT_GENERATOR_LANGUAGE
+    # 클라이언트 생성이나 호출 중 예외가 나도 호출은 한 것으로 셈 (예산 없이 재시도가 반복되지 않도록)
+    usage: CounterexampleState = {"llm_calls": 1}
+
     try:
         chat = get_counterexample_chat()
-        chain = INPUT_GEN_PROMPT | chat | StrOutputParser()
-        response = await chain.ainvoke({
-            "problem_description": problem,
-            "language": language,
-        })
-        code = extract_code_block(response)
+        result = await invoke_with_cache(
+            INPUT_GEN_PROMPT,
+            chat,
+            {
+                "problem_description": compact_problem(problem, "input_gen"),
+                "language": language,
+            },
+            INPUT_GEN_PROMPT_VERSION,
+            bypass=bool(state.get("test_case_generator")),
+        )
+        usage = {"llm_cache_hits": 1} if result["cached"] else {"llm_calls": 1}
+        code = result["code"]
         if not code:
             raise ValueError("Code block not found.")
+        # 문법 오류/다른 언어 코드는 실행하지 않고 재시도 (같은 응답이 캐시에서 다시 나오지 않도록 제거)
+        error = await preflight(code, language)
+        if error:
+            await invalidate([result["cache_key"]])
+            raise ValueError(f"Pre-flight failed: {error}")
         
-        logging.info(f"LLM input generator Response: {response}")
-
-        return {**state, "test_case_generator": code}
-    except Exception:
-        return {**state, "test_case_generator": ""}
-
-
+        logging.info(f"LLM input generator Response: {result['response']}")
+        return {"test_case_generator": code, **usage}
+    except Exception as e:
+        logging.info(f"Input generator rejected: {e}")
+        return usage
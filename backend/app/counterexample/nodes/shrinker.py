@@ -0,0 +1,126 @@
+import time
+import asyncio
+import logging
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
+from app.config import SHRINK_TIME_LIMIT_SECONDS, SHRINK_PARALLELISM, REFERENCE_LANGUAGES
+from app.counterexample.state import CounterexampleState
+from app.counterexample.utils.cancel import get_cancel_event
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+from app.counterexample.nodes.code_runner import run_pair
+from app.counterexample.utils.budget import remaining_executions
+from app.counterexample.utils.compare import compare_outputs, detect_compare_options
+from app.counterexample.utils.markdown import extract_samples
+from app.counterexample.utils.mutator import InputMutator
+from app.counterexample.utils.shrink import shrink_candidates, input_size
+
+
+async def shrink_counterexample(state: CounterexampleState, config: RunnableConfig) -> CounterexampleState:
+    """찾은 반례를 불일치가 유지되는 한도에서 구조적으로 최소화 (delta debugging)
+
+    후보(원소 제거, 값 축소)를 SHRINK_PARALLELISM개씩 묶어 code-runner에서 병렬로 평가하고,
+    불일치를 유지하는 가장 작은 후보로 갱신하는 과정을 시간 예산과 남은 실행 예산 안에서 반복한다.
+    """
+    original_input = state.get("counterexample_input")
+    user_code = state.get("user_code", "")
+    correct_solution = state.get("correct_solution", "")
+    language = state.get("language", "python")
+    solution_language = state.get("solution_language", REFERENCE_LANGUAGES[0])
+    cancel_event = get_cancel_event(config)
+
+    if not state.get("counterexample_found") or not original_input:
+        return {}
+
+    # 값 하한은 샘플과 원래 반례에서 관찰된 최솟값 (제약 하한 추정)
+    samples = extract_samples(state.get("problem_description", ""))
+    value_floor = InputMutator([sample_input for sample_input, _ in samples] + [original_input]).value_min
+    compare_options = detect_compare_options(state.get("problem_description", ""))
+
+    deadline = time.monotonic() + SHRINK_TIME_LIMIT_SECONDS
+    executions = state.get("executions", 0)
+    # 후보 하나에 사용자/정답 코드를 한 번씩 실행
+    remaining_pairs = remaining_executions(state) // 2
+    current = original_input
+    current_results: Optional[tuple] = None  # (사용자 결과, 정답 결과, 비교 결과)
+    granularity = 2
+    steps = 0
+    # 현재 입력 기준으로 이미 평가해 실패한 후보 (granularity가 바뀌어도 재평가하지 않음)
+    rejected: set = set()
+
+    async with CodeRunnerClient() as code_runner:
+
+        async def still_fails(candidate: str):
+            user_result, correct_result = await run_pair(
+                code_runner, user_code, correct_solution, candidate, language, solution_language
+            )
+            # 정답 코드가 실패하면 제약을 벗어난 입력으로 보고 채택하지 않음
+            if correct_result.get("error"):
+                return None
+            comparison = compare_outputs(
+                correct_result.get("output", ""), user_result.get("output", ""), **compare_options
+            )
+            if user_result.get("error") or not comparison["equal"]:
+                return user_result, correct_result, comparison
+            return None
+
+        while time.monotonic() < deadline and remaining_pairs > 0:
+            if cancel_event and cancel_event.is_set():
+                break
+            candidates = [c for c in shrink_candidates(current, granularity, value_floor) if c not in rejected]
+
+            accepted = None
+            start = 0
+            while start < len(candidates) and remaining_pairs > 0:
+                if time.monotonic() >= deadline or (cancel_event and cancel_event.is_set()):
+                    break
+                batch = candidates[start:start + min(SHRINK_PARALLELISM, remaining_pairs)]
+                start += len(batch)
+                # 시간 제한으로 중간에 끊긴 실행도 code-runner에는 이미 제출되었으므로 먼저 셈
+                executions += 2 * len(batch)
+                remaining_pairs -= len(batch)
+                try:
+                    results = await asyncio.wait_for(
+                        asyncio.gather(*(still_fails(candidate) for candidate in batch)),
+                        timeout=max(deadline - time.monotonic(), 0),
+                    )
+                except asyncio.TimeoutError:
+                    break
+                failing = [(c, r) for c, r in zip(batch, results) if r is not None]
+                rejected.update(c for c, r in zip(batch, results) if r is None)
+                if failing:
+                    accepted = min(failing, key=lambda item: input_size(item[0]))
+                    break
+
+            if accepted:
+                current, current_results = accepted
+                rejected.clear()
+                steps += 1
+                granularity = max(granularity - 1, 2)
+                logging.info(f"Shrink step {steps}: {input_size(current)} tokens/chars")
+            elif granularity < len(current.split()):
+                granularity *= 2
+            else:
+                break
+
+    detail = dict(state.get("counterexample_detail") or {})
+    # generator_hash/seed/input_hash는 최소화 이전 입력(original_input)을 다시 만드는 정보로 그대로 둠
+    detail["original_input"] = original_input
+    detail["shrink_steps"] = steps
+    if current_results:
+        user_result, correct_result, comparison = current_results
+        detail.update({
+            "input": current,
+            "user_output": user_result.get("output", "").strip(),
+            "correct_output": correct_result.get("output", "").strip(),
+            "diff": comparison,
+        })
+        detail.pop("error", None)
+        if user_result.get("error"):
+            detail["error"] = user_result["error"]
+
+    return {
+        "executions": executions,
+        "original_counterexample_input": original_input,
+        "counterexample_input": current,
+        "counterexample_detail": detail,
+    }
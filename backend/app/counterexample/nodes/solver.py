@@ -1,35 +1,172 @@
+import asyncio
 import logging
-from langchain_core.output_parsers import StrOutputParser
-from app.counterexample.state import CounterexampleState
-from app.counterexample.prompts.solver import SOLVE_PROMPT
-from app.counterexample.tools.chat_client import get_counterexample_chat
-from app.counterexample.utils.markdown import extract_code_block
+from typing import Dict, List, Optional, Tuple
+from app.config import SOLVE_CANDIDATES, REFERENCE_LANGUAGES
+from app.counterexample.state import CounterexampleState, SolveAttempt
+from app.counterexample.prompts.solver import SOLVE_PROMPT, SOLVE_PROMPT_VERSION, SOLVE_APPROACH_HINTS
+from app.counterexample.tools.chat_client import get_tier_chat, tier_name
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+from app.counterexample.tools.llm_cache import CachedResponse, invoke_with_cache, invalidate
+from app.counterexample.tools.tier_router import choose_solve_tier, record_solve_attempts
+from app.counterexample.utils.budget import remaining_llm_calls
+from app.counterexample.utils.compare import compare_outputs, detect_compare_options
+from app.counterexample.utils.markdown import extract_samples
+from app.counterexample.utils.preflight import preflight
+from app.counterexample.utils.prompt_compact import compact_problem
+
+# 프롬프트에 쓰는 언어 이름 (code-runner/boj-runner는 C++17로 컴파일)
+PROMPT_LANGUAGE_NAMES = {"cpp": "C++17"}
 
 async def generate_solution(state: CounterexampleState) -> CounterexampleState:
-    """주어진 문제에 대한 올바른 해결 코드를 생성"""
+    """주어진 문제에 대한 올바른 해결 코드를 생성
+
+    SOLVE_CANDIDATES개의 후보를 서로 다른 접근 힌트로 동시에 요청하고, 예제 입출력으로 걸러
+    순위를 매긴다. boj_submit은 solution_candidates를 순위대로 제출한다.
+    재시도(solution_generate_try > 0)는 의도적인 재샘플링이므로 LLM 캐시를 읽지 않는다.
+    모델 tier는 기록된 지연 시간/정답률로 고르고, 후보별 결과는 tier 라우팅 학습을 위해 기록한다.
+    문법 검사(pre-flight)에 실패한 후보는 예제 실행/백준 제출 없이 버리며, 모두 실패하면 재시도로 이어진다.
+    """
+    problem_id = state.get("problem_id", 0)
     problem = state.get("problem_description", "")
-    language = state.get("language", "python")
+    # 참조 해답은 사용자 언어와 무관하게 빠른 언어(기본 C++)로 생성
+    language = state.get("solution_language", REFERENCE_LANGUAGES[0])
     difficulty = state.get("difficulty", 0)
+    category = state.get("category", "")
     try_count = state.get("solution_generate_try", 0)
 
     if not problem:
-        return {**state, "correct_solution": ""}
-    
-    # LLM을 사용해서 올바른 해결책 생성 시도
-    try:
-        chat = get_counterexample_chat(difficulty + 2 * try_count)
-        chain = SOLVE_PROMPT | chat | StrOutputParser()
-        response = await chain.ainvoke({
-            "problem_description": problem,
-            "language": language,
-        })
-        code = extract_code_block(response)
-
-        logging.info(f"LLM solver Response: {response}")
-
-        if not code:
-            raise ValueError("Code block not found.")
-        
-        return {**state, "correct_solution": code}
-    except Exception:
-        return {**state, "correct_solution": ""}
\ No newline at end of file
+        return {"correct_solution": "", "solution_candidates": [], "solution_cache_keys": []}
+
+    tiers_tried = state.get("solve_tiers_tried", [])
+    tier = await choose_solve_tier(problem_id, difficulty, category, try_count, tiers_tried)
+
+    # 남은 LLM 호출 예산을 넘겨서 후보를 요청하지 않음 (최소 1개)
+    count = max(1, min(SOLVE_CANDIDATES, remaining_llm_calls(state)))
+    hints = [SOLVE_APPROACH_HINTS[i % len(SOLVE_APPROACH_HINTS)] for i in range(count)]
+    # 프롬프트에는 풀이에 필요한 섹션과 크기를 제한한 예제만 보냄 (예제 실행은 원문 기준)
+    prompt_problem = compact_problem(problem, "solve")
+
+    async def request_candidate(index: int, hint: str) -> Optional[CachedResponse]:
+        # LLM을 사용해서 올바른 해결책 생성 시도
+        try:
+            chat = get_tier_chat(tier)
+            result = await invoke_with_cache(
+                SOLVE_PROMPT,
+                chat,
+                {
+                    "problem_description": prompt_problem,
+                    "language": PROMPT_LANGUAGE_NAMES.get(language, language),
+                    "approach_hint": hint,
+                },
+                SOLVE_PROMPT_VERSION,
+                variant=index,
+                bypass=try_count > 0,
+            )
+            logging.info(f"LLM solver Response: {result['response']}")
+            return result
+        except Exception:
+            return None
+
+    results = await asyncio.gather(*(request_candidate(i, hint) for i, hint in enumerate(hints)))
+    cache_hits = sum(1 for result in results if result and result["cached"])
+    # 같은 코드가 여러 번 나오면 한 번만 제출 (코드 -> 캐시 키)
+    cache_keys: Dict[str, str] = {}
+    # 새로 생성된 후보의 tier/지연 시간 (캐시 적중은 tier 성능 정보가 없으므로 기록하지 않음)
+    attempts: Dict[str, SolveAttempt] = {}
+    rejected: List[SolveAttempt] = []
+    for result in results:
+        if not result:
+            continue
+        if not result["cached"]:
+            attempt: SolveAttempt = {
+                "problem_id": problem_id,
+                "difficulty": difficulty,
+                "category": category,
+                "tier": tier_name(tier),
+                "latency_ms": result["elapsed_ms"],
+                "input_tokens": result["input_tokens"],
+                "output_tokens": result["output_tokens"],
+                "verdict": "no_code",
+            }
+            if result["code"]:
+                attempts.setdefault(result["code"], attempt)
+            else:
+                rejected.append(attempt)
+        if result["code"]:
+            cache_keys.setdefault(result["code"], result["cache_key"])
+    candidates = list(cache_keys)
+
+    # 문법 오류/다른 언어 코드는 백준이나 예제 실행까지 보내지 않고 버림 (캐시에서도 제거)
+    async with CodeRunnerClient() as code_runner:
+        errors = await asyncio.gather(*(preflight(code, language, code_runner) for code in candidates))
+    failed = [code for code, error in zip(candidates, errors) if error]
+    if failed:
+        logging.info(f"Solution candidates failed pre-flight: {[error for error in errors if error]}")
+        rejected += [{**attempts[code], "verdict": "preflight_failed"} for code in failed if code in attempts]
+        await invalidate([cache_keys[code] for code in failed])
+        candidates = [code for code in candidates if code not in failed]
+
+    executions = state.get("executions", 0)
+    # 후보가 하나여도 예제로 걸러서 예제에서 실패하는 코드를 백준까지 보내지 않음
+    if candidates:
+        ranked, sample_runs = await rank_candidates(candidates, problem, language)
+        executions += sample_runs
+        rejected += [
+            {**attempts[code], "verdict": "sample_failed"}
+            for code in candidates
+            if code not in ranked and code in attempts
+        ]
+        if not ranked:
+            await invalidate([cache_keys[code] for code in candidates])
+        candidates = ranked
+    await record_solve_attempts(rejected)
+
+    return {
+        "correct_solution": candidates[0] if candidates else "",
+        "solution_candidates": candidates,
+        "solution_cache_keys": [cache_keys[code] for code in candidates],
+        "solution_attempts": [attempts.get(code) for code in candidates],
+        "solve_tiers_tried": tiers_tried + [tier_name(tier)],
+        "llm_calls": count - cache_hits,
+        "llm_cache_hits": cache_hits,
+        "executions": executions,
+    }
+
+async def rank_candidates(candidates: List[str], problem: str, language: str) -> Tuple[List[str], int]:
+    """예제 입출력을 통과한 개수로 후보 순위를 매기고, 모두 통과한 후보만 남김
+
+    모두 통과한 후보가 없으면 (예제 파싱 실패, 스페셜 저지 등) 가장 많이 통과한 후보 하나만 남긴다.
+    다만 예제 실행에서 오류(RE/TLE 등)가 난 후보는 채점 방식과 무관하게 틀린 코드이므로 남기지 않는다.
+    반환: (순위가 매겨진 후보 목록, 실행 횟수)
+    """
+    samples = extract_samples(problem)
+    if not samples:
+        return candidates, 0
+    compare_options = detect_compare_options(problem)
+
+    async with CodeRunnerClient() as code_runner:
+
+        async def passed_samples(code: str) -> Optional[int]:
+            """통과한 예제 수 (실행 오류가 하나라도 있으면 None)"""
+            results = await asyncio.gather(
+                *(code_runner.run_code(code, sample_input, language) for sample_input, _ in samples)
+            )
+            if any(result.get("error") for result in results):
+                return None
+            return sum(
+                1
+                for result, (_, sample_output) in zip(results, samples)
+                if compare_outputs(sample_output, result.get("output", ""), **compare_options)["equal"]
+            )
+
+        scores = await asyncio.gather(*(passed_samples(code) for code in candidates))
+
+    # 점수가 같으면 먼저 요청한 후보(힌트 없는 후보) 우선
+    scored = sorted(
+        ((score, code) for score, code in zip(scores, candidates) if score is not None),
+        key=lambda item: -item[0],
+    )
+    ranked = [code for _, code in scored]
+    survivors = [code for score, code in scored if score == len(samples)]
+    logging.info(f"Solution candidates passed samples: {scores}/{len(samples)}")
+    return (survivors or ranked[:1]), len(candidates) * len(samples)
@@ -0,0 +1,214 @@
+import logging
+from typing import Any, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from app.config import (
+    STRESS_CASES_PER_ROUND,
+    STRESS_TIME_RATIO,
+    STRESS_MIN_REFERENCE_MS,
+    STRESS_KILL_FACTOR,
+    STRESS_DEFAULT_TIME_LIMIT_SECONDS,
+    REFERENCE_LANGUAGES,
+    INPUT_GENERATOR_LANGUAGE,
+)
+from app.counterexample.state import CounterexampleState
+from app.counterexample.utils.cancel import get_cancel_event
+from app.counterexample.prompts.stress_input_gen import STRESS_INPUT_GEN_PROMPT, STRESS_INPUT_GEN_PROMPT_VERSION
+from app.counterexample.tools.chat_client import get_counterexample_chat
+from app.counterexample.tools.llm_cache import invoke_with_cache, invalidate
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+from app.counterexample.tools.generator_runner import generator_version, run_generator
+from app.counterexample.utils.budget import is_time_exhausted, remaining_executions
+from app.counterexample.utils.compare import compare_outputs, detect_compare_options
+from app.counterexample.utils.limits import parse_problem_limits
+from app.counterexample.utils.preflight import preflight
+from app.counterexample.utils.prompt_compact import compact_problem
+
+
+async def generate_stress_inputs(state: CounterexampleState) -> CounterexampleState:
+    """최대 제약 조건의 입력을 만드는 스트레스 입력 생성기 작성
+
+    새 생성기를 만들지 못하면 stress_generator를 반환하지 않으므로, 다음 라운드는 기존 생성기의 다음 시드로 진행한다.
+    LLM 호출 수는 캐시에서 응답을 가져온 경우를 빼고 시도마다 센다.
+    """
+    problem = state.get("problem_description", "")
+    language = INPUT_GENERATOR_LANGUAGE
+    # 클라이언트 생성이나 호출 중 예외가 나도 호출은 한 것으로 셈 (예산 없이 재시도가 반복되지 않도록)
+    usage: CounterexampleState = {"llm_calls": 1}
+
+    try:
+        chat = get_counterexample_chat()
+        # 라운드를 반복할 때는 다른 최악의 경우를 노려야 하므로 캐시를 읽지 않음
+        result = await invoke_with_cache(
+            STRESS_INPUT_GEN_PROMPT,
+            chat,
+            {
+                "problem_description": compact_problem(problem, "stress"),
+                "language": language,
+            },
+            STRESS_INPUT_GEN_PROMPT_VERSION,
+            bypass=bool(state.get("stress_generator")),
+        )
+        usage = {"llm_cache_hits": 1} if result["cached"] else {"llm_calls": 1}
+        code = result["code"]
+        if not code:
+            raise ValueError("Code block not found.")
+        # 문법 오류/다른 언어 코드는 실행하지 않고 재시도 (같은 응답이 캐시에서 다시 나오지 않도록 제거)
+        error = await preflight(code, language)
+        if error:
+            await invalidate([result["cache_key"]])
+            raise ValueError(f"Pre-flight failed: {error}")
+
+        logging.info(f"LLM stress input generator Response: {result['response']}")
+        return {"stress_generator": code, **usage}
+    except Exception as e:
+        logging.info(f"Stress input generator rejected: {e}")
+        return usage
+
+
+def _performance_issue(
+    user_result: Dict[str, Any],
+    correct_result: Dict[str, Any],
+    time_limit_seconds: Optional[float],
+    memory_limit_mb: Optional[int],
+    same_language: bool = True,
+) -> Optional[str]:
+    """사용자 코드의 측정값이 문제 제한 또는 참조 해답 대비 배수를 넘는지 판정 (사유 반환)
+
+    참조 해답이 다른 언어(예: C++)면 실행 시간을 비교할 수 없으므로 배수 판정은 하지 않는다.
+    """
+    user_time = user_result.get("time_ms") or 0
+    user_memory = user_result.get("memory_kb") or 0
+    reference_time = correct_result.get("time_ms") or 0
+
+    if user_result.get("verdict") == "TLE":
+        return "time_limit"
+    if user_result.get("verdict") == "MLE":
+        return "memory_limit"
+    if time_limit_seconds is not None and user_time > time_limit_seconds * 1000:
+        return "time_limit"
+    if memory_limit_mb is not None and user_memory > memory_limit_mb * 1024:
+        return "memory_limit"
+    if same_language and user_time > STRESS_TIME_RATIO * max(reference_time, STRESS_MIN_REFERENCE_MS):
+        return "reference_ratio"
+    return None
+
+
+async def run_stress_test(state: CounterexampleState, config: RunnableConfig) -> CounterexampleState:
+    """최대 크기 입력으로 사용자 코드와 올바른 해결책의 실행 시간/메모리를 측정해 비교"""
+    user_code = state.get("user_code", "")
+    correct_solution = state.get("correct_solution", "")
+    stress_generator = state.get("stress_generator", "")
+    language = state.get("language", "python")
+    solution_language = state.get("solution_language", REFERENCE_LANGUAGES[0])
+    cancel_event = get_cancel_event(config)
+
+    if not user_code or not correct_solution or not stress_generator:
+        return {"counterexample_found": False}
+
+    limits = parse_problem_limits(state.get("problem_description", ""))
+    compare_options = detect_compare_options(state.get("problem_description", ""))
+    time_limit_seconds = limits["time_limit_seconds"]
+    memory_limit_mb = limits["memory_limit_mb"]
+    # 제한을 넘겨도 얼마나 넘는지 보고할 수 있도록 제한의 몇 배까지 기다린 뒤 강제 종료
+    kill_after = (time_limit_seconds or STRESS_DEFAULT_TIME_LIMIT_SECONDS) * STRESS_KILL_FACTOR
+
+    executions = state.get("executions", 0)
+    test_cases_run = state.get("test_cases_run", 0)
+    remaining = remaining_executions(state)
+    counterexample_found = False
+    counterexample_input = None
+    counterexample_detail = None
+    budget_exhausted = False
+    generator_seed = state.get("generator_seed", 0)
+    generator_hash = generator_version(stress_generator)
+
+    async with CodeRunnerClient() as code_runner:
+        for i in range(STRESS_CASES_PER_ROUND):
+            if cancel_event and cancel_event.is_set():
+                break
+            spent = executions - state.get("executions", 0)
+            if is_time_exhausted(state) or remaining - spent < 3:
+                budget_exhausted = True
+                break
+
+            generator_seed += 1
+            input_gen_result = await run_generator(code_runner, stress_generator, generator_seed)
+            executions += 1
+            if input_gen_result["error"]:
+                logging.error(f"Stress input generation failed: {input_gen_result['error']}")
+                break
+            test_input = input_gen_result.get("output", "")
+
+            # 측정은 서로 간섭하지 않도록 순차 실행
+            correct_result = await code_runner.run_code(
+                correct_solution, test_input, solution_language, kill_after, memory_limit_mb
+            )
+            user_result = await code_runner.run_code(
+                user_code, test_input, language, kill_after, memory_limit_mb
+            )
+            executions += 2
+            test_cases_run += 1
+
+            measurements = {
+                "user_time_ms": user_result.get("time_ms"),
+                "user_memory_kb": user_result.get("memory_kb"),
+                "user_verdict": user_result.get("verdict"),
+                "reference_time_ms": correct_result.get("time_ms"),
+                "reference_memory_kb": correct_result.get("memory_kb"),
+                "reference_verdict": correct_result.get("verdict"),
+                "time_limit_ms": time_limit_seconds * 1000 if time_limit_seconds is not None else None,
+                "memory_limit_kb": memory_limit_mb * 1024 if memory_limit_mb is not None else None,
+            }
+            logging.info(f"Stress case {i+1}: {measurements}")
+
+            # 참조 해답마저 제한을 넘기면 입력이 제약을 벗어났거나 측정이 불안정한 것으로 보고 건너뜀
+            if correct_result.get("verdict") != "OK":
+                continue
+
+            reason = _performance_issue(
+                user_result, correct_result, time_limit_seconds, memory_limit_mb, solution_language == language
+            )
+            if reason:
+                counterexample_found = True
+                counterexample_input = test_input
+                counterexample_detail = {
+                    "type": "performance",
+                    "reason": reason,
+                    "test_case_index": i,
+                    "input": test_input,
+                    "generator_hash": generator_hash,
+                    "seed": generator_seed,
+                    **measurements,
+                    "description": f"스트레스 테스트케이스 {i+1}",
+                }
+                break
+
+            user_output = user_result.get("output", "")
+            correct_output = correct_result.get("output", "")
+            comparison = compare_outputs(correct_output, user_output, **compare_options)
+            if user_result.get("error") or not comparison["equal"]:
+                counterexample_found = True
+                counterexample_input = test_input
+                counterexample_detail = {
+                    "type": "wrong_answer",
+                    "test_case_index": i,
+                    "input": test_input,
+                    "user_output": user_output.strip(),
+                    "correct_output": correct_output.strip(),
+                    "diff": comparison,
+                    "generator_hash": generator_hash,
+                    "seed": generator_seed,
+                    **measurements,
+                    "description": f"스트레스 테스트케이스 {i+1}",
+                }
+                break
+
+    return {
+        "executions": executions,
+        "test_cases_run": test_cases_run,
+        "generator_seed": generator_seed,
+        "budget_exhausted": budget_exhausted,
+        "counterexample_found": counterexample_found,
+        "counterexample_input": counterexample_input,
+        "counterexample_detail": counterexample_detail,
+    }
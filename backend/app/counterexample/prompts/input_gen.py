@@ -8,11 +8,13 @@ INPUT_GEN_TEMPLATE = """
 
 요구사항:
 - 아래 문제의 입력 형식과 제약을 준수하는 입력을 출력(stdout)하는 프로그램을 {language}로 작성해주세요.
-- 가능하다면 랜덤성을 사용하되, 제공된 시드(seed)가 있다면 이를 사용하여 재현 가능하도록 해주세요.
+- 표준 입력 첫 줄로 정수 시드(seed)가 주어집니다. 모든 난수는 이 시드로 초기화한 난수 생성기에서만 얻어, 같은 시드면 항상 같은 입력을 출력하도록 해주세요. (현재 시각, os.urandom 등 시드와 무관한 난수 사용 금지)
+- 시드가 다르면 크기와 값의 분포가 다양한 입력이 나오도록 해주세요.
 - 단일 파일로 전체 코드를 제공하고, 실행 시 표준 출력으로 테스트 케이스를 생성해야 합니다.
 - 여러 테스트 케이스(cases)가 주어질 수 있음을 고려하고, 해당 수만큼 생성하도록 옵션을 지원하세요(없다면 1개 생성).
 - 입력 형식이 애매하다면 합리적 가정을 명시하는 주석을 달아주세요.
 - 반드시 전체 코드를 마크다운 코드 블록(``` ... ```)으로 감싸서 제공해주세요.
 """
 
-INPUT_GEN_PROMPT = PromptTemplate.from_template(INPUT_GEN_TEMPLATE)
\ No newline at end of file
+INPUT_GEN_PROMPT = PromptTemplate.from_template(INPUT_GEN_TEMPLATE)
+INPUT_GEN_PROMPT_VERSION = "input-gen-v2"
\ No newline at end of file
@@ -11,6 +11,17 @@ SOLVE_TEMPLATE = """
 - 코드에는 각 로직에 대한 자세한 주석을 포함해주세요.
 - 코드 실행에 필요한 전체 코드를 제공해주세요. (예: 입력 처리 부분 포함)
 - **반드시 전체 코드를 마크다운 코드 블록(``` ... ```)으로 감싸서 제공해주세요.**
+{approach_hint}
 """
 
-SOLVE_PROMPT = PromptTemplate.from_template(SOLVE_TEMPLATE)
\ No newline at end of file
+# 여러 후보 해결책을 동시에 요청할 때 후보마다 다른 접근을 유도하기 위한 힌트 (첫 후보는 힌트 없음)
+SOLVE_APPROACH_HINTS = [
+    "",
+    "- 가장 단순하고 확실한 방법을 우선하되, 시간 복잡도가 제한 안에 드는지 먼저 확인해주세요.",
+    "- 경계 조건(최솟값/최댓값, 빈 입력, 중복 값, 오버플로)을 특히 꼼꼼하게 처리해주세요.",
+    "- 첫 번째로 떠오르는 풀이와 다른 알고리즘(예: 다른 자료구조나 점화식)으로 풀어주세요.",
+]
+
+SOLVE_PROMPT = PromptTemplate.from_template(SOLVE_TEMPLATE)
+# 템플릿을 바꾸면 버전도 올려서 LLM 응답 캐시가 이전 응답을 재사용하지 않도록 함
+SOLVE_PROMPT_VERSION = "solve-v2"
\ No newline at end of file
@@ -0,0 +1,20 @@
+from langchain.prompts import PromptTemplate
+
+STRESS_INPUT_GEN_TEMPLATE = """
+당신은 세계 최고의 알고리즘 테스트 데이터 생성기입니다. 주어진 문제의 입력 형식과 제약을 분석하여, 비효율적인 풀이가 시간 초과(TLE)나 메모리 초과(MLE)를 내도록 만드는 최대 크기의 입력을 생성하는 프로그램 코드를 작성해주세요.
+
+문제 설명:
+{problem_description}
+
+요구사항:
+- 아래 문제의 입력 형식과 제약을 준수하면서, 모든 크기 관련 값(N, M, Q 등)을 제약의 최댓값으로 설정한 입력을 출력(stdout)하는 프로그램을 {language}로 작성해주세요.
+- 값의 분포는 흔한 최악의 경우를 노려주세요. (예: 정렬/역정렬된 배열, 모두 같은 값, 일자형(선형) 트리/그래프, 최대 값 범위 등)
+- 표준 입력 첫 줄로 정수 시드(seed)가 주어집니다. 모든 난수는 이 시드로 초기화한 난수 생성기에서만 얻어 같은 시드면 항상 같은 입력을 출력하되, 시드마다 다른 최악의 경우 형태가 나오도록 해주세요.
+- 출력이 매우 클 수 있으므로 빠른 출력 방식(한 번에 모아서 출력 등)을 사용해주세요.
+- 단일 파일로 전체 코드를 제공하고, 실행 시 표준 출력으로 테스트 케이스를 생성해야 합니다.
+- 입력 형식이 애매하다면 합리적 가정을 명시하는 주석을 달아주세요.
+- 반드시 전체 코드를 마크다운 코드 블록(``` ... ```)으로 감싸서 제공해주세요.
+"""
+
+STRESS_INPUT_GEN_PROMPT = PromptTemplate.from_template(STRESS_INPUT_GEN_TEMPLATE)
+STRESS_INPUT_GEN_PROMPT_VERSION = "stress-input-gen-v2"
\ No newline at end of file
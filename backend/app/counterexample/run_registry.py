@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional
+from app.config import RUN_DETACH_GRACE_SECONDS, RUN_EVENT_BUFFER
+
+StreamFactory = Callable[[asyncio.Event], AsyncGenerator[Dict[str, Any], None]]
+
+
+class CounterexampleRun:
+    """웹소켓 연결과 분리되어 백그라운드에서 진행되는 반례 탐색 실행
+
+    이벤트를 최근 RUN_EVENT_BUFFER개까지 보관하여, 다시 연결한 클라이언트가
+    놓친 진행 상황을 받은 뒤 이어지는 이벤트를 받을 수 있게 한다.
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.cancel_event = asyncio.Event()
+        self.done = False
+        self.task: Optional[asyncio.Task] = None
+        self.subscribers = 0
+        self._events: List[Dict[str, Any]] = []
+        self._offset = 0  # 버퍼에서 밀려난 이벤트 수
+        self._changed = asyncio.Condition()
+        self._detach_timer: Optional[asyncio.TimerHandle] = None
+
+    async def _publish(self, event: Dict[str, Any]) -> None:
+        async with self._changed:
+            self._events.append(event)
+            if len(self._events) > RUN_EVENT_BUFFER:
+                dropped = len(self._events) - RUN_EVENT_BUFFER
+                del self._events[:dropped]
+                self._offset += dropped
+            self._changed.notify_all()
+
+    async def _finish(self) -> None:
+        async with self._changed:
+            self.done = True
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """보관 중인 이벤트부터 재전송한 뒤 실행이 끝날 때까지 새 이벤트를 전달"""
+        position = self._offset
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: self.done or position < self._offset + len(self._events)
+                )
+                position = max(position, self._offset)
+                pending = self._events[position - self._offset:]
+                position += len(pending)
+                finished = self.done and not pending
+            for event in pending:
+                yield event
+            if finished:
+                return
+
+
+class RunRegistry:
+    """프로세스 내 실행 중인 반례 탐색 목록 (run_id → 실행)"""
+
+    def __init__(self):
+        self._runs: Dict[str, CounterexampleRun] = {}
+
+    def get(self, run_id: str) -> Optional[CounterexampleRun]:
+        return self._runs.get(run_id)
+
+    def start(
+        self,
+        run_id: str,
+        make_stream: StreamFactory,
+        on_done: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> CounterexampleRun:
+        run = CounterexampleRun(run_id)
+        self._runs[run_id] = run
+        run.task = asyncio.create_task(self._drive(run, make_stream, on_done))
+        return run
+
+    async def _drive(
+        self,
+        run: CounterexampleRun,
+        make_stream: StreamFactory,
+        on_done: Optional[Callable[[], Awaitable[None]]],
+    ) -> None:
+        gen = make_stream(run.cancel_event)
+        try:
+            async for event in gen:
+                await run._publish(event)
+                if event.get("type") == "finish":
+                    break
+        except Exception as e:
+            logging.exception(f"Counterexample run {run.run_id} failed")
+            await run._publish({"type": "error", "message": str(e)})
+        finally:
+            try:
+                await gen.aclose()
+            except Exception:
+                pass
+            if on_done:
+                try:
+                    await on_done()
+                except Exception as e:
+                    logging.warning(f"on_done of run {run.run_id} failed: {e}")
+            await run._finish()
+            # 끝난 직후 다시 연결한 클라이언트가 결과를 받을 수 있도록 잠시 보관
+            asyncio.get_running_loop().call_later(
+                RUN_DETACH_GRACE_SECONDS, self._runs.pop, run.run_id, None
+            )
+
+    def attach(self, run: CounterexampleRun) -> None:
+        run.subscribers += 1
+        if run._detach_timer is not None:
+            run._detach_timer.cancel()
+            run._detach_timer = None
+
+    def detach(self, run: CounterexampleRun) -> None:
+        """구독자가 모두 떠난 뒤 RUN_DETACH_GRACE_SECONDS 안에 다시 연결하지 않으면 실행 중단
+
+        중단된 실행은 체크포인트가 남아 있으므로 run_id로 다시 이어갈 수 있다.
+        """
+        run.subscribers = max(run.subscribers - 1, 0)
+        if run.subscribers or run.done:
+            return
+        run._detach_timer = asyncio.get_running_loop().call_later(
+            RUN_DETACH_GRACE_SECONDS, run.cancel_event.set
+        )
+
+
+# 글로벌 인스턴스
+run_registry = RunRegistry()
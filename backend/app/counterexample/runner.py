@@ -1,20 +1,40 @@
 import json
+import uuid
 import asyncio
-from typing import Dict, Any, Literal, Optional, Union, AsyncGenerator, cast
+import logging
+from typing import Dict, Any, Literal, Optional, Union, AsyncGenerator, Awaitable, Callable, Mapping, cast
+import aiosqlite
 from pydantic import BaseModel
-from app.counterexample.graph import build_counterexample_graph, build_counterexample_graph_from_compare
-from app.counterexample.state import CounterexampleState
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from app.config import CHECKPOINT_DB_PATH, REFERENCE_LANGUAGES
+from app.counterexample.graph import (
+    build_counterexample_graph,
+    build_counterexample_graph_from_compare,
+    build_stress_graph_from_solution,
+)
+from app.counterexample.state import CounterexampleState, SearchBudget
+from app.counterexample.utils.budget import get_search_budget, get_search_stats, is_budget_exhausted
+from app.counterexample.utils.tracing import node_trace_from_stats
 from langchain_core.messages import BaseMessage
 
+# 루프(regenerate_inputs <-> run_and_compare)가 LangGraph 기본 recursion_limit(25)에 걸리지 않도록
+# 종료 조건은 탐색 예산이 담당
+GRAPH_RECURSION_LIMIT = 1000
+
 
 class CounterexampleSuccess(BaseModel):
     """반례 찾기 성공 결과"""
     success: Literal[True] = True
     counterexample_found: bool
     counterexample_input: Optional[str] = None
-    counterexample_detail: Optional[str] = None
+    original_counterexample_input: Optional[str] = None
+    counterexample_detail: Optional[Dict[str, Any]] = None
     test_cases_count: int = 0
+    budget_exhausted: bool = False
+    stats: Dict[str, Any] = {}
     correct_solution: str
+    solution_language: str = ""
     input_generator: str
 
 
@@ -23,46 +43,240 @@ class CounterexampleError(BaseModel):
     success: Literal[False] = False
     error: str
     counterexample_found: Literal[False] = False
+    stats: Dict[str, Any] = {}
 
 
 CounterexampleResult = Union[CounterexampleSuccess, CounterexampleError]
 
+# 검증된 해결책과 입력 생성기가 처음 준비되었을 때 호출 (correct_solution, input_generator, solution_language)
+PreparedCallback = Callable[[str, str, str], Awaitable[None]]
+
+
+def _is_prepared(state: Mapping[str, Any]) -> bool:
+    return bool(
+        state.get("is_solution_validated")
+        and state.get("correct_solution")
+        and state.get("test_case_generator")
+    )
+
+
+async def _notify_prepared(on_prepared: PreparedCallback, state: Mapping[str, Any]) -> None:
+    # 콜백(DB 저장 등) 실패가 반례 탐색을 중단시키지 않도록 로그만 남김
+    try:
+        await on_prepared(
+            state["correct_solution"],
+            state["test_case_generator"],
+            state.get("solution_language", REFERENCE_LANGUAGES[0]),
+        )
+    except Exception as e:
+        logging.error(f"on_prepared callback failed: {e}")
+
+# node_update로 클라이언트에 보내지 않는 상태 키 (퍼저 내부 상태는 라운드마다 커지므로)
+STREAM_OMITTED_KEYS = frozenset({"node_stats", "input_corpus", "seen_behaviours", "seen_input_hashes"})
+
+
+def _entry_point(start_from_compare: bool, stress_mode: bool) -> str:
+    if start_from_compare and stress_mode:
+        return "generate_stress_inputs"
+    return "run_and_compare" if start_from_compare else "solve"
+
+
+def _run_config(run_id: str, cancel_event: Optional[asyncio.Event] = None) -> RunnableConfig:
+    """run_id를 체크포인트 thread_id로 사용. 취소 이벤트는 상태가 아닌 configurable로 전달"""
+    return {
+        "recursion_limit": GRAPH_RECURSION_LIMIT,
+        "configurable": {"thread_id": run_id, "cancel_event": cancel_event},
+    }
+
+
+def _finish_event(state: Mapping[str, Any]) -> Dict[str, Any]:
+    budget_exhausted = not state.get("counterexample_found") and (
+        state.get("budget_exhausted", False) or is_budget_exhausted(state)
+    )
+    return {
+        "type": "finish",
+        "counterexample_found": state.get("counterexample_found"),
+        "counterexample_input": state.get("counterexample_input"),
+        "original_counterexample_input": state.get("original_counterexample_input"),
+        "counterexample_detail": state.get("counterexample_detail"),
+        "correct_solution": state.get("correct_solution"),
+        "solution_language": state.get("solution_language"),
+        "input_generator": state.get("test_case_generator"),
+        "budget_exhausted": budget_exhausted,
+        "stats": get_search_stats({**state, "budget_exhausted": budget_exhausted}),
+    }
+
+
 class CounterexampleRunner:
     """반례 찾기 워크플로우 실행기"""
     
     def __init__(self):
-        self._graph_from_solve = build_counterexample_graph()
-        self._graph_from_compare = build_counterexample_graph_from_compare()
+        self._checkpointer: Optional[AsyncSqliteSaver] = None
+        self._checkpoint_conn: Optional[aiosqlite.Connection] = None
+        self._compile_graphs()
+
+    def _compile_graphs(self):
+        self._graphs = {
+            "solve": build_counterexample_graph(self._checkpointer),
+            "run_and_compare": build_counterexample_graph_from_compare(self._checkpointer),
+            "generate_stress_inputs": build_stress_graph_from_solution(self._checkpointer),
+        }
+
+    async def enable_checkpointing(self, path: str = CHECKPOINT_DB_PATH):
+        """노드마다 상태를 SQLite에 저장하도록 그래프를 다시 컴파일 (애플리케이션 시작 시 한 번)
+
+        재시작/배포/연결 끊김 이후에도 run_id로 마지막으로 끝난 노드부터 이어서 실행할 수 있다.
+        """
+        conn = await aiosqlite.connect(path)
+        checkpointer = AsyncSqliteSaver(conn)
+        await checkpointer.setup()
+        self._checkpoint_conn = conn
+        self._checkpointer = checkpointer
+        self._compile_graphs()
+
+    async def close(self):
+        if self._checkpoint_conn is not None:
+            await self._checkpoint_conn.close()
+            self._checkpoint_conn = None
+            self._checkpointer = None
+            self._compile_graphs()
+
+    async def discard_run(self, run_id: str):
+        """끝났거나 버려진 실행의 체크포인트 삭제"""
+        if self._checkpointer is None:
+            return
+        try:
+            await self._checkpointer.adelete_thread(run_id)
+        except Exception as e:
+            logging.warning(f"Failed to discard checkpoints of run {run_id}: {e}")
+
+    async def is_resumable(self, run_id: str) -> bool:
+        """체크포인트가 남아 있고 아직 실행할 노드가 있는 실행인지"""
+        if self._checkpointer is None:
+            return False
+        snapshot = await self._get_snapshot(run_id)
+        return bool(snapshot.values) and bool(snapshot.next)
+
+    async def _get_snapshot(self, run_id: str):
+        """저장된 상태의 entry_point로 원래 그래프를 골라 스냅샷 조회 (다음 노드는 그래프 구조에 따라 달라짐)"""
+        config = _run_config(run_id)
+        snapshot = await self._graphs["solve"].aget_state(config)
+        entry_point = snapshot.values.get("entry_point", "solve") if snapshot.values else "solve"
+        if entry_point != "solve":
+            snapshot = await self._graphs[entry_point].aget_state(config)
+        return snapshot
     
-    def _get_graph(self, start_from_compare: bool = False):
-        if start_from_compare:
-            return self._graph_from_compare
-        else:
-            return self._graph_from_solve
+    def _get_graph(self, start_from_compare: bool = False, stress_mode: bool = False):
+        return self._graphs[_entry_point(start_from_compare, stress_mode)]
     
-    async def _execute_workflow(self, initial_state: CounterexampleState, start_from_compare: bool = False) -> CounterexampleResult:
+    async def _execute_workflow(
+        self,
+        initial_state: CounterexampleState,
+        start_from_compare: bool = False,
+        on_prepared: Optional[PreparedCallback] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+    ) -> CounterexampleResult:
         """워크플로우 실행 공통 로직"""
+        run_id = uuid.uuid4().hex
         try:
-            graph = self._get_graph(start_from_compare)
-            result = await graph.ainvoke(initial_state)
+            graph = self._get_graph(start_from_compare, initial_state.get("stress_mode", False))
+            result: Dict[str, Any] = dict(initial_state)
+            notified = on_prepared is None or start_from_compare
+            async for result in graph.astream(
+                initial_state,
+                _run_config(run_id, cancel_event),
+                stream_mode="values",
+            ):
+                if cancel_event and cancel_event.is_set():
+                    return CounterexampleError(error="Cancelled")
+                if not notified and _is_prepared(result):
+                    notified = True
+                    await _notify_prepared(on_prepared, result)
+
+            budget_exhausted = not result.get("counterexample_found") and (
+                result.get("budget_exhausted", False) or is_budget_exhausted(result)
+            )
+            stats = get_search_stats({**result, "budget_exhausted": budget_exhausted})
 
             correct_solution = result.get("correct_solution")
             input_generator = result.get("test_case_generator")
-            if not correct_solution or not input_generator:
+            # 스트레스 모드에서는 일반 입력 생성기를 만들지 않으므로 없어도 됨
+            if not correct_solution or (not input_generator and not result.get("stress_mode")):
+                if budget_exhausted:
+                    return CounterexampleError(
+                        error="Search budget exhausted before a validated solution and input generator were ready",
+                        stats=stats,
+                    )
                 raise ValueError("Correct solution or input generator is missing")
             
             return CounterexampleSuccess(
                 counterexample_found=result.get("counterexample_found", False),
                 counterexample_input=result.get("counterexample_input"),
-                counterexample_detail=None,
-                test_cases_count=len(result.get("test_cases", [])),
+                original_counterexample_input=result.get("original_counterexample_input"),
+                counterexample_detail=result.get("counterexample_detail"),
+                test_cases_count=result.get("test_cases_run", 0),
+                budget_exhausted=budget_exhausted,
+                stats=stats,
                 correct_solution=correct_solution,
-                input_generator=input_generator
+                solution_language=result.get("solution_language", REFERENCE_LANGUAGES[0]),
+                input_generator=input_generator or ""
             )
         except Exception as e:
+            if cancel_event and cancel_event.is_set():
+                return CounterexampleError(error="Cancelled")
             return CounterexampleError(
                 error=str(e)
             )
+        finally:
+            await self.discard_run(run_id)
+
+    @staticmethod
+    def _build_initial_state(
+        problem_id: int,
+        problem_description: str,
+        user_code: str,
+        language: str,
+        difficulty: int,
+        correct_solution: Optional[str],
+        input_generator: Optional[str],
+        budget: Optional[SearchBudget],
+        stress_mode: bool = False,
+        start_from_compare: bool = False,
+        category: str = "",
+        solution_language: Optional[str] = None,
+    ) -> CounterexampleState:
+        initial_state: CounterexampleState = {
+            "problem_id": problem_id,
+            "problem_description": problem_description,
+            "user_code": user_code,
+            "language": language,
+            "counterexample_found": False,
+            "difficulty": difficulty,
+            "category": category,
+            "search_budget": budget or get_search_budget(difficulty),
+            "search_elapsed_seconds": 0.0,
+            "llm_calls": 0,
+            "llm_cache_hits": 0,
+            "node_stats": {},
+            "executions": 0,
+            "test_cases_run": 0,
+            "stress_mode": stress_mode,
+            "entry_point": _entry_point(start_from_compare, stress_mode),
+        }
+
+        # 선택사항 매개변수 추가
+        # 참조 해답은 사용자 언어와 무관하게 생성 (언어를 모르는 기존 해답은 사용자 언어로 간주)
+        # 스트레스 모드는 실행 시간을 비교할 수 있도록 사용자 언어가 참조 해답 언어이면 그 언어로 생성
+        if correct_solution is not None:
+            initial_state["correct_solution"] = correct_solution
+            initial_state["solution_language"] = solution_language or language
+        elif stress_mode and language in REFERENCE_LANGUAGES:
+            initial_state["solution_language"] = solution_language or language
+        else:
+            initial_state["solution_language"] = solution_language or REFERENCE_LANGUAGES[0]
+        if input_generator is not None:
+            initial_state["test_case_generator"] = input_generator
+        return initial_state
     
     async def find_counterexample(
         self,
@@ -74,6 +288,12 @@ class CounterexampleRunner:
         correct_solution: Optional[str] = None,
         input_generator: Optional[str] = None,
         start_from_compare: bool = False,
+        budget: Optional[SearchBudget] = None,
+        stress_mode: bool = False,
+        on_prepared: Optional[PreparedCallback] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        category: str = "",
+        solution_language: Optional[str] = None,
     ) -> CounterexampleResult:
         """
         사용자 코드에서 반례를 찾는 메인 함수
@@ -86,26 +306,50 @@ class CounterexampleRunner:
             correct_solution: 정답 코드 (선택사항)
             input_generator: 입력 생성기 (선택사항)
             start_from_compare: True이면 run_and_compare 노드부터 시작, False이면 solve 노드부터 시작
+            budget: 탐색 예산 (선택사항, 없으면 난이도에 따라 자동 설정)
+            stress_mode: True이면 오답 대신 시간/메모리 초과(TLE/MLE) 반례를 탐색
+            on_prepared: 검증된 해결책과 입력 생성기가 준비되는 즉시 호출 (탐색이 끝나기 전에 저장/공유하기 위함)
+            cancel_event: 설정되면 진행 중인 노드가 멈추고 다음 노드로 넘어가지 않음 (작업 취소)
+            category: 문제 분류 (solve 모델 tier 라우팅에 사용)
+            solution_language: correct_solution의 언어 (없으면 REFERENCE_LANGUAGES 첫 언어로 새로 생성)
             
         Returns:
-            반례 찾기 결과
+            반례 찾기 결과. 예산 내에 반례를 찾지 못하면 counterexample_found=False,
+            budget_exhausted=True와 탐색 통계(stats)를 담아 반환
         """
-        initial_state: CounterexampleState = {
-            "problem_id": problem_id,
-            "problem_description": problem_description,
-            "user_code": user_code,
-            "language": language,
-            "counterexample_found": False,
-            "difficulty": difficulty,
-        }
-        
-        # 선택사항 매개변수 추가
-        if correct_solution is not None:
-            initial_state["correct_solution"] = correct_solution
-        if input_generator is not None:
-            initial_state["test_case_generator"] = input_generator
+        initial_state = self._build_initial_state(
+            problem_id, problem_description, user_code, language, difficulty,
+            correct_solution, input_generator, budget, stress_mode, start_from_compare, category,
+            solution_language,
+        )
         
-        return await self._execute_workflow(initial_state, start_from_compare)
+        return await self._execute_workflow(initial_state, start_from_compare, on_prepared, cancel_event)
+
+    async def prepare_solution(
+        self,
+        problem_id: int,
+        problem_description: str,
+        language: str = "python",
+        difficulty: int = 0,
+        category: str = "",
+        budget: Optional[SearchBudget] = None,
+        on_prepared: Optional[PreparedCallback] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        input_generator: Optional[str] = None,
+        solution_language: Optional[str] = None,
+    ) -> CounterexampleResult:
+        """사용자 코드 없이 검증된 해결책과 입력 생성기만 만들고 종료 (사전 풀이)
+
+        solve → boj_submit, generate_inputs까지만 실행하고 run_and_compare로 넘어가지 않는다.
+        input_generator가 있으면 다시 만들지 않고 해결책만 만든다 (다른 언어의 참조 해답 추가).
+        성공하면 correct_solution/input_generator를 담은 CounterexampleSuccess를 반환한다.
+        """
+        initial_state = self._build_initial_state(
+            problem_id, problem_description, "", language, difficulty,
+            None, input_generator, budget, category=category, solution_language=solution_language,
+        )
+        initial_state["prepare_only"] = True
+        return await self._execute_workflow(initial_state, False, on_prepared, cancel_event)
 
     async def stream_find_counterexample(
         self,
@@ -118,43 +362,109 @@ class CounterexampleRunner:
         input_generator: Optional[str] = None,
         start_from_compare: bool = False,
         cancel_event: Optional[asyncio.Event] = None,
+        budget: Optional[SearchBudget] = None,
+        stress_mode: bool = False,
+        on_prepared: Optional[PreparedCallback] = None,
+        run_id: Optional[str] = None,
+        category: str = "",
+        solution_language: Optional[str] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """LangGraph 그래프 astream 사용하여 노드 진행 상황/상태 업데이트 스트리밍.
 
         LangGraph의 astream 이벤트 포맷에 의존하므로, 가능한 한 일반적으로 매핑.
         토큰 단위 LLM 출력은 (현재 노드 함수가 토큰 스트리밍 노출 안 하므로) 제외.
         필요 시 향후 노드 내부를 스트리밍 지원 형태로 확장 가능.
+        체크포인팅이 켜져 있으면 run_id로 중단된 실행을 stream_resume_counterexample로 이어갈 수 있다.
         """
-        initial_state: CounterexampleState = {
-            "problem_id": problem_id,
-            "problem_description": problem_description,
-            "user_code": user_code,
-            "language": language,
-            "difficulty": difficulty,
-            "counterexample_found": False,
-        }
-        if correct_solution is not None:
-            initial_state["correct_solution"] = correct_solution
-        if input_generator is not None:
-            initial_state["test_case_generator"] = input_generator
-        if cancel_event is not None:
-            initial_state["_cancel_event"] = cancel_event
+        initial_state = self._build_initial_state(
+            problem_id, problem_description, user_code, language, difficulty,
+            correct_solution, input_generator, budget, stress_mode, start_from_compare, category,
+            solution_language,
+        )
+        graph = self._get_graph(start_from_compare, stress_mode)
+        async for event in self._stream_graph(
+            graph,
+            initial_state,
+            run_id or uuid.uuid4().hex,
+            dict(initial_state),
+            cancel_event,
+            on_prepared if not start_from_compare else None,
+        ):
+            yield event
+
+    async def stream_resume_counterexample(
+        self,
+        run_id: str,
+        cancel_event: Optional[asyncio.Event] = None,
+        on_prepared: Optional[PreparedCallback] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """체크포인트에 저장된 실행을 마지막으로 끝난 노드 다음부터 이어서 스트리밍"""
+        snapshot = await self._get_snapshot(run_id)
+        if not snapshot.values:
+            yield {"type": "error", "message": f"Run {run_id} not found"}
+            return
+        last_state = dict(snapshot.values)
+        if not snapshot.next:
+            # 이미 끝난 실행이면 저장된 최종 상태로 결과만 전송
+            yield _finish_event(last_state)
+            await self.discard_run(run_id)
+            return
 
-        graph = self._get_graph(start_from_compare)
-        last_state: Dict[str, Any] = dict(initial_state)
+        graph = self._graphs[last_state.get("entry_point", "solve")]
+        async for event in self._stream_graph(
+            graph,
+            None,  # 입력 없이 호출하면 마지막 체크포인트부터 재개
+            run_id,
+            last_state,
+            cancel_event,
+            on_prepared if not _is_prepared(last_state) else None,
+        ):
+            yield event
+
+    async def _stream_graph(
+        self,
+        graph,
+        graph_input: Optional[CounterexampleState],
+        run_id: str,
+        last_state: Dict[str, Any],
+        cancel_event: Optional[asyncio.Event],
+        on_prepared: Optional[PreparedCallback],
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        notified = on_prepared is None
+        failed = False
 
-        astream_gen = graph.astream(initial_state, stream_mode="updates")
+        astream_gen = graph.astream(
+            graph_input,
+            _run_config(run_id, cancel_event),
+            stream_mode=["updates", "values"],
+        )
         try:
-            async for event in astream_gen:
+            async for mode, event in astream_gen:
                 # 외부에서 취소 요청이 온 경우 중단
                 if cancel_event and cancel_event.is_set():
                     break
+                # values 모드: 리듀서(병렬 노드의 llm_calls 합산 등)가 적용된 전체 상태
+                if mode == "values":
+                    if isinstance(event, dict):
+                        last_state = dict(event)
+                        if not notified and _is_prepared(last_state):
+                            notified = True
+                            await _notify_prepared(on_prepared, last_state)
+                    continue
                 # 현재 LangGraph updates 모드: { node_name: partial_state, ... }
                 if isinstance(event, dict):
                     for node_name, partial in event.items():
+                        # 합류 지점 표시용 노드 등 변경 사항이 없는 업데이트는 전송하지 않음
+                        if not partial:
+                            continue
                         if isinstance(partial, dict):
-                            last_state.update(partial)
-                            yield {"type": "node_update", "node": node_name, "data": partial}
+                            # 노드 실행 통계는 상태 변경과 분리해 trace로 전송하고, 내부 탐색 상태는 보내지 않음
+                            data = {k: v for k, v in partial.items() if k not in STREAM_OMITTED_KEYS}
+                            stats = (partial.get("node_stats") or {}).get(node_name)
+                            update = {"type": "node_update", "node": node_name, "data": data}
+                            if stats:
+                                update["trace"] = node_trace_from_stats(node_name, stats)
+                            yield update
                         elif isinstance(partial, BaseMessage):
                             yield {"type": "message", "node": node_name, "role": partial.type, "content": partial.content}
                         else:
@@ -164,7 +474,10 @@ class CounterexampleRunner:
                 else:
                     yield {"type": "event", "raw": str(event)}
         except Exception as e:
-            yield {"type": "error", "message": str(e)}
+            # 취소로 중단된 노드(RunCancelled)는 오류로 알리지 않음
+            if not (cancel_event and cancel_event.is_set()):
+                failed = True
+                yield {"type": "error", "message": str(e)}
         finally:
             # 취소된 경우 그래프 astream 종료 (잔여 작업 취소 유도)
             if cancel_event and cancel_event.is_set():
@@ -176,18 +489,10 @@ class CounterexampleRunner:
                     except Exception:
                         pass
 
-        # 취소되지 않았다면 최종 결과 전송
-        if not (cancel_event and cancel_event.is_set()):
-            # 출력에 내부 제어 객체(_로 시작)는 포함하지 않도록 제거
-            sanitized = {k: v for k, v in last_state.items() if not k.startswith("_")}
-            yield {
-                "type": "finish",
-                "counterexample_found": sanitized.get("counterexample_found"),
-                "counterexample_input": sanitized.get("counterexample_input"),
-                "counterexample_detail": sanitized.get("counterexample_detail"),
-                "correct_solution": sanitized.get("correct_solution"),
-                "input_generator": sanitized.get("test_case_generator"),
-            }
+        # 끝까지 실행된 경우에만 최종 결과 전송 (취소되거나 실패한 실행은 재개할 수 있도록 체크포인트를 남김)
+        if not failed and not (cancel_event and cancel_event.is_set()):
+            yield _finish_event(last_state)
+            await self.discard_run(run_id)
 
 # 글로벌 인스턴스
 runner = CounterexampleRunner()
\ No newline at end of file
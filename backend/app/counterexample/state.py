@@ -1,5 +1,40 @@
-from asyncio import Event
-from typing import TypedDict, Optional, List, Any
+import operator
+from typing import TypedDict, Optional, List, Any, Annotated, Dict
+from app.counterexample.utils.tracing import NodeStats, merge_node_stats, merge_search_elapsed
+
+
+class SearchBudget(TypedDict):
+    """반례 탐색 예산 (하나라도 소진되면 탐색 종료)"""
+    time_limit_seconds: float  # 전체 탐색 wall-clock 제한
+    max_llm_calls: int         # solve/generate_inputs LLM 호출 최대 횟수
+    max_executions: int        # code-runner 실행 최대 횟수
+
+
+class SolveAttempt(TypedDict):
+    """해결책 후보 하나의 생성 결과 (tier 라우팅 학습 기록)"""
+    problem_id: int
+    difficulty: int
+    category: str
+    tier: str          # provider:model:effort
+    latency_ms: int    # LLM 호출 시간
+    input_tokens: int
+    output_tokens: int
+    verdict: str       # 백준 결과 또는 no_code / preflight_failed / sample_failed
+
+
+class CaseRecord(TypedDict):
+    """실행한 테스트케이스 하나의 요약 (출력 전문 대신 해시)"""
+    index: int               # 누적 테스트케이스 번호 (1부터)
+    source: str              # mutation / generator
+    generator_hash: Optional[str]  # 생성기 입력이면 생성기 버전 (code_hash), 변이 입력이면 None
+    seed: Optional[int]            # 생성기에 준 시드 (같은 생성기 버전과 시드면 같은 입력)
+    input_hash: str
+    input_size: int
+    user_output_hash: str
+    correct_output_hash: str
+    equal: bool
+    user_error: bool
+
 
 class CounterexampleState(TypedDict, total=False):
     # 입력
@@ -8,9 +43,17 @@ class CounterexampleState(TypedDict, total=False):
     user_code: str           # 사용자가 제출한 코드
     language: str
     difficulty: int  # 문제 난이도 (정수, 1~30. unlabeled: 0)
+    category: str    # 문제 분류 (쉼표로 구분된 태그)
+    entry_point: str  # 실행한 그래프의 시작 노드 (체크포인트에서 재개할 때 같은 그래프를 고르기 위함)
+    prepare_only: bool  # 해결책/입력 생성기만 준비하고 반례 탐색은 하지 않음 (사전 풀이)
 
-    # AI가 생성한 올바른 해결책
+    # AI가 생성한 올바른 해결책 (사용자 언어와 무관하게 solution_language로 생성/검증)
     correct_solution: str
+    solution_language: str
+    solution_candidates: List[str]  # 예제로 거른 후보 (제출 순위순)
+    solution_cache_keys: List[str]  # 후보별 LLM 캐시 키 (백준에서 틀리면 캐시에서 제거)
+    solution_attempts: List[Optional[SolveAttempt]]  # 후보별 tier/지연 시간 (백준 결과와 함께 기록, 캐시 적중은 None)
+    solve_tiers_tried: List[str]  # 이번 탐색에서 solve에 쓴 tier (재시도 시 제외)
 
     # 유효한 해결책인지 여부
     is_solution_validated: bool
@@ -18,15 +61,33 @@ class CounterexampleState(TypedDict, total=False):
 
     # 테스트케이스
     test_case_generator: str
-    
-    # 실행 결과 비교
-    user_outputs: List[str]
-    correct_outputs: List[str]
-    
+
+    # 성능(TLE/MLE) 반례 스트레스 모드
+    stress_mode: bool
+    stress_generator: str  # 최대 제약 입력 생성기
+
+    # 실행 결과 비교 (최근 케이스의 해시만 보관, 전체 출력은 반례의 counterexample_detail에만)
+    recent_cases: List[CaseRecord]
+
+    # 로컬 변이 퍼저 상태 (라운드 간 유지)
+    input_corpus: List[str]      # 생성기가 만든 입력 중 변이 시드로 쓸 것
+    seen_behaviours: List[str]   # 관찰된 실행 결과 시그니처
+    seen_input_hashes: List[str] # 이미 실행한 입력의 해시 (같은 입력은 다시 실행하지 않음)
+    generator_seed: int          # 마지막으로 생성기에 준 시드 (다음 실행은 +1)
+
+    # 탐색 예산 및 사용량
+    search_budget: SearchBudget
+    search_elapsed_seconds: Annotated[float, merge_search_elapsed]  # 노드 실행 시간의 누적 (재개 전까지 멈춰 있던 시간은 제외)
+    node_started_at: float  # 실행 중인 노드의 시작 시각 (traced_node가 노드에 넘기는 값, 저장하지 않음)
+    llm_calls: Annotated[int, operator.add]  # solve/generate_inputs가 병렬로 실행되므로 노드는 증가분(1)을 반환
+    llm_cache_hits: Annotated[int, operator.add]  # LLM 호출 대신 캐시에서 가져온 응답 수 (예산에 포함하지 않음)
+    executions: int
+    test_cases_run: int
+    budget_exhausted: bool
+    node_stats: Annotated[Dict[str, NodeStats], merge_node_stats]  # 노드 이름별 누적 실행 시간/외부 호출 통계
+
     # 최종 반례
     counterexample_found: bool
-    counterexample_input: Optional[str]
+    counterexample_input: Optional[str]          # 최소화된 반례
+    original_counterexample_input: Optional[str] # 최소화 이전의 원래 반례
     counterexample_detail: Optional[dict]
-
-    # 내부 제어용 (취소 등)
-    _cancel_event: Event
\ No newline at end of file
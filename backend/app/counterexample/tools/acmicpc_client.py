@@ -1,7 +1,10 @@
+import uuid
+import asyncio
 import aiohttp
 import json
 from typing import Dict, Any, List
 from app.config import BOJ_RUNNER_URL
+from app.counterexample.utils.tracing import measure_call
 
 class AcmicpcClient:
     """백준 제출 서비스와 통신하는 클라이언트"""
@@ -33,26 +36,37 @@ class AcmicpcClient:
         Returns:
             실행 결과 (output, error, status 등)
         """
+        with measure_call("boj"):
+            return await self._submit_code(problem_id, code, language)
+
+    async def _submit_code(self, problem_id: int, code: str, language: str) -> Dict[str, Any]:
         endpoint = f"{self.base_url}/submit"
         
+        submission_id = uuid.uuid4().hex
         payload = {
             "problem_id": problem_id,
             "language": language,
-            "code": code
+            "code": code,
+            "submission_id": submission_id,
         }
 
         if not self.session:
             raise RuntimeError("세션이 초기화되지 않았습니다. 'async with' 문을 사용하여 세션을 관리하세요.")
         
         try:
-            async with self.session.post(endpoint, json=payload, timeout=aiohttp.ClientTimeout(total=300)) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return {
-                    "status": result.get("status", ""),
-                    "raw_output": result.get("raw_output", ""),
-                    "error": result.get("error", "")
-                }
+            try:
+                async with self.session.post(endpoint, json=payload, timeout=aiohttp.ClientTimeout(total=300)) as response:
+                    response.raise_for_status()
+                    result = await response.json()
+            except asyncio.CancelledError:
+                # 결과를 기다리던 쪽이 취소되면 boj-runner의 제출 프로세스도 중단
+                await asyncio.shield(self.abort(submission_id))
+                raise
+            return {
+                "status": result.get("status", ""),
+                "raw_output": result.get("raw_output", ""),
+                "error": result.get("error", "")
+            }
             
         except aiohttp.ClientError as e:
             return {
@@ -73,6 +87,18 @@ class AcmicpcClient:
                 "status": "unknown_error"
             }
     
+    async def abort(self, submission_id: str) -> bool:
+        """진행 중인 제출의 boj-runner 프로세스 중단"""
+        if not self.session:
+            return False
+        try:
+            async with self.session.post(
+                f"{self.base_url}/abort/{submission_id}", timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                return response.status == 200
+        except Exception:
+            return False
+
     async def health_check(self) -> bool:
         """백준 제출 서비스 상태 확인"""
         if not self.session:
@@ -1,44 +1,113 @@
+import asyncio
+from typing import Dict, List, Tuple
+import httpx
 from langchain_upstage import ChatUpstage
 from langchain_openai import ChatOpenAI
 from langchain_openai.chat_models.base import BaseChatOpenAI
-from app.config import UPSTAGE_API_KEY, OPENAI_API_KEY
+from app.config import (
+    UPSTAGE_API_KEY,
+    OPENAI_API_KEY,
+    LLM_MAX_CONCURRENCY_UPSTAGE,
+    LLM_MAX_CONCURRENCY_OPENAI,
+    LLM_REQUEST_TIMEOUT_SECONDS,
+)
 
+# 난이도 상한별 (provider, model, reasoning effort)
+# TODO: 더욱 세련된 구현으로 바꿔볼 수 있음
+CHAT_TIERS = [
+    (0, "upstage", "solar-pro2", "medium"),
+    (5, "upstage", "solar-pro2", "minimal"),
+    (10, "upstage", "solar-pro2", "low"),
+    (15, "upstage", "solar-pro2", "medium"),
+    (20, "upstage", "solar-pro2", "high"),
+]
+TOP_TIER = ("openai", "gpt5", "high")
 
-def get_counterexample_chat(difficulty: int = 0) -> BaseChatOpenAI:
-    # TODO: 더욱 세련된 구현으로 바꿔볼 수 있음
-    if difficulty <= 0:
-        return ChatUpstage(
-            api_key=UPSTAGE_API_KEY,
-            model="solar-pro2",
-            reasoning_effort="medium",
-        )
-    elif difficulty <= 5:
-        return ChatUpstage(
-            api_key=UPSTAGE_API_KEY,
-            model="solar-pro2",
-            reasoning_effort="minimal",
-        )
-    elif difficulty <= 10:
-        return ChatUpstage(
-            api_key=UPSTAGE_API_KEY,
-            model="solar-pro2",
-            reasoning_effort="low",
-        )
-    elif difficulty <= 15:
-        return ChatUpstage(
-            api_key=UPSTAGE_API_KEY,
-            model="solar-pro2",
-            reasoning_effort="medium",
+Tier = Tuple[str, str, str]  # (provider, model, reasoning effort)
+# 라우터가 고를 수 있는 tier (사다리 순서, 중복 제거)
+SOLVE_TIERS: List[Tier] = list(dict.fromkeys(
+    [(provider, model, effort) for _, provider, model, effort in CHAT_TIERS] + [TOP_TIER]
+))
+
+PROVIDER_CONCURRENCY = {
+    "upstage": LLM_MAX_CONCURRENCY_UPSTAGE,
+    "openai": LLM_MAX_CONCURRENCY_OPENAI,
+}
+
+# 프로세스 전체에서 공유하는 채팅 모델 / HTTP 커넥션 풀 / 동시 요청 제한
+_chats: Dict[Tuple[str, str, str], BaseChatOpenAI] = {}
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def tier_name(tier: Tier) -> str:
+    return ":".join(tier)
+
+
+def get_tier(difficulty: int) -> Tier:
+    for max_difficulty, provider, model, effort in CHAT_TIERS:
+        if difficulty <= max_difficulty:
+            return provider, model, effort
+    return TOP_TIER
+
+
+def _get_http_client(provider: str) -> httpx.AsyncClient:
+    """provider별로 keep-alive 커넥션과 TLS 세션을 재사용하는 공유 HTTP 클라이언트"""
+    client = _http_clients.get(provider)
+    if client is None or client.is_closed:
+        concurrency = PROVIDER_CONCURRENCY[provider]
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT_SECONDS, connect=10.0),
         )
-    elif difficulty <= 20:
-        return ChatUpstage(
+        _http_clients[provider] = client
+    return client
+
+
+def get_counterexample_chat(difficulty: int = 0) -> BaseChatOpenAI:
+    """난이도 구간에 맞는 채팅 모델 (같은 구간이면 같은 인스턴스를 재사용)"""
+    return get_tier_chat(get_tier(difficulty))
+
+
+def get_tier_chat(tier: Tier) -> BaseChatOpenAI:
+    """tier의 채팅 모델 (같은 tier면 같은 인스턴스를 재사용)"""
+    provider, model, effort = tier
+    key = (provider, model, effort)
+    chat = _chats.get(key)
+    if chat is not None:
+        return chat
+
+    if provider == "upstage":
+        chat = ChatUpstage(
             api_key=UPSTAGE_API_KEY,
-            model="solar-pro2",
-            reasoning_effort="high",
+            model=model,
+            reasoning_effort=effort,
+            http_async_client=_get_http_client(provider),
         )
     else:
-        return ChatOpenAI(
+        chat = ChatOpenAI(
             api_key=OPENAI_API_KEY,
-            model="gpt5",
-            reasoning_effort="high",
+            model=model,
+            reasoning_effort=effort,
+            http_async_client=_get_http_client(provider),
         )
+    _chats[key] = chat
+    return chat
+
+
+def get_chat_semaphore(chat: BaseChatOpenAI) -> asyncio.Semaphore:
+    """채팅 모델의 provider별 동시 요청 수 제한 (사용자가 몰려도 소켓 고갈/레이트 리밋 방지)"""
+    provider = "upstage" if isinstance(chat, ChatUpstage) else "openai"
+    semaphore = _semaphores.get(provider)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(PROVIDER_CONCURRENCY[provider])
+        _semaphores[provider] = semaphore
+    return semaphore
+
+
+async def close_chat_clients() -> None:
+    """애플리케이션 종료 시 공유 HTTP 클라이언트 정리"""
+    for client in _http_clients.values():
+        await client.aclose()
+    _http_clients.clear()
+    _chats.clear()
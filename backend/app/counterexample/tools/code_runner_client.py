@@ -2,10 +2,12 @@ import aiohttp
 import asyncio
 import requests
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.config import CODE_RUNNER_URL
+from app.counterexample.utils.tracing import measure_call
 
 PENDING = "PENDING"
+REVOKED = "REVOKED"
 
 
 class CodeRunnerClient:
@@ -26,25 +28,59 @@ class CodeRunnerClient:
         if self.session:
             await self.session.close()
 
-    async def run_code(self, code: str, input_data: str, language: str = "python") -> Dict[str, Any]:
+    async def run_code(
+        self,
+        code: str,
+        input_data: str,
+        language: str = "python",
+        time_limit: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
-        코드 실행 요청
+        코드 실행 요청 (실행 중인 노드의 code-runner 호출 수/시간에 기록)
         
         Args:
             code: 실행할 코드
             input_data: 입력 데이터
             language: 프로그래밍 언어
+            time_limit: 시간 제한(초). 지정하면 실행 시간/메모리를 측정
+            memory_limit_mb: 메모리 제한(MB). 측정 모드에서 MLE 판정 기준
             
         Returns:
-            실행 결과 (output, error, status 등)
+            실행 결과 (output, error, status 등). 측정 모드에서는 time_ms, memory_kb, verdict 포함
+
+        Raises:
+            asyncio.CancelledError: 작업이 code-runner에서 취소(REVOKED)된 경우
         """
+        with measure_call("code_runner"):
+            return await self._run_code(code, input_data, language, time_limit, memory_limit_mb)
+
+    async def check_syntax(self, code: str, language: str) -> Dict[str, Any]:
+        """실행하지 않고 컴파일러로 문법만 검사 (실패하면 verdict CE, error에 진단 메시지)"""
+        with measure_call("code_runner"):
+            return await self._run_code(code, "", language, None, None, syntax_only=True)
+
+    async def _run_code(
+        self,
+        code: str,
+        input_data: str,
+        language: str,
+        time_limit: Optional[float],
+        memory_limit_mb: Optional[int],
+        syntax_only: bool = False,
+    ) -> Dict[str, Any]:
         endpoint = f"{self.base_url}/run-code"
         
-        payload = {
+        payload: Dict[str, Any] = {
             "code": code,
             "language": language,
             "input_value": input_data
         }
+        if time_limit is not None:
+            payload["time_limit"] = time_limit
+            payload["memory_limit_mb"] = memory_limit_mb
+        if syntax_only:
+            payload["syntax_only"] = True
         
         try:
             if not self.session:
@@ -60,15 +96,23 @@ class CodeRunnerClient:
                 raise ValueError("작업 ID가 없습니다.")
 
             task_status = PENDING
-            while task_status == PENDING:
-                task_response = await self.session.get(f"{self.base_url}/results/{task_id}", timeout=aiohttp.ClientTimeout(total=30))
-                task_response.raise_for_status()
-                task_result = await task_response.json()
-                task_status = task_result.get("status", PENDING)
-                if task_status == PENDING:
-                    await asyncio.sleep(0.1)
+            try:
+                while task_status == PENDING:
+                    task_response = await self.session.get(f"{self.base_url}/results/{task_id}", timeout=aiohttp.ClientTimeout(total=30))
+                    task_response.raise_for_status()
+                    task_result = await task_response.json()
+                    task_status = task_result.get("status", PENDING)
+                    if task_status == PENDING:
+                        await asyncio.sleep(0.1)
+            except asyncio.CancelledError:
+                # 결과를 기다리던 쪽이 취소되면 대기/실행 중인 작업도 취소해 워커를 비움
+                await asyncio.shield(self.revoke([task_id]))
+                raise
+            if task_status == REVOKED:
+                # 다른 곳에서 취소된 작업은 결과가 없으므로 빈 출력으로 비교하지 않고 취소로 전파
+                raise asyncio.CancelledError(f"code-runner 작업이 취소되었습니다: {task_id}")
 
-            task_result: dict[str, Any] = task_result.get("result", {})  # type: ignore
+            task_result: dict[str, Any] = task_result.get("result") or {}  # type: ignore
             task_output = task_result.get("output", "")
             task_error = task_result.get("error", "")
             task_status = task_result.get("status", "unknown")
@@ -77,7 +121,10 @@ class CodeRunnerClient:
                 "output": task_output,
                 "error": task_error,
                 "status": task_status,
-                "execution_time": result.get("execution_time", 0)
+                "execution_time": task_result.get("time_ms", 0) / 1000,
+                "time_ms": task_result.get("time_ms"),
+                "memory_kb": task_result.get("memory_kb"),
+                "verdict": task_result.get("verdict"),
             }
             
         except requests.exceptions.RequestException as e:
@@ -102,6 +149,18 @@ class CodeRunnerClient:
                 "execution_time": 0
             }
     
+    async def revoke(self, task_ids: List[str]) -> bool:
+        """code-runner 작업 취소 (대기 중이면 버리고, 실행 중이면 컨테이너까지 종료)"""
+        if not self.session or not task_ids:
+            return False
+        try:
+            response = await self.session.post(
+                f"{self.base_url}/revoke", json={"task_ids": task_ids}, timeout=aiohttp.ClientTimeout(total=5)
+            )
+            return response.status == 200
+        except Exception:
+            return False
+
     async def health_check(self) -> bool:
         """코드 실행 서비스 상태 확인"""
         if not self.session:
@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+from database.mysql_connection import SessionLocal
+from app.config import INPUT_GENERATOR_LANGUAGE
+from app.models.solved_problem_model import code_hash
+from app.models.input_generator_model import InputGeneratorModel
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+
+# 시드를 읽지 않는 생성기(이전 프롬프트로 만든 저장 생성기 등)도 재현되도록 표준 난수 생성기를 미리 초기화
+SEED_PRELUDES = {
+    "python": "import random as _seeded_random\n_seeded_random.seed({seed})\ndel _seeded_random\n",
+}
+
+
+def input_digest(text: str) -> str:
+    """입력/출력 요약 해시 (케이스 기록과 중복 입력 제거에 같이 씀)"""
+    return hashlib.blake2b((text or "").encode("utf-8", errors="replace"), digest_size=8).hexdigest()
+
+
+def generator_version(code: str) -> str:
+    """케이스 기록에 남기는 생성기 버전 (input_generators.code_hash와 같은 값)"""
+    return code_hash(code)
+
+
+def seeded_generator(code: str, seed: int, language: str = INPUT_GENERATOR_LANGUAGE) -> str:
+    prelude = SEED_PRELUDES.get(language)
+    # from __future__ import는 파일 맨 앞에 있어야 하므로 그런 코드에는 붙이지 않음 (표준 입력의 시드만 사용)
+    if not prelude or "from __future__" in code:
+        return code
+    return prelude.format(seed=seed) + code
+
+
+async def run_generator(
+    code_runner: CodeRunnerClient,
+    code: str,
+    seed: int,
+    language: str = INPUT_GENERATOR_LANGUAGE,
+) -> Dict[str, Any]:
+    """생성기를 시드와 함께 실행 (시드는 표준 입력 첫 줄로 전달, 같은 (생성기, 시드)면 같은 입력)"""
+    return await code_runner.run_code(seeded_generator(code, seed, language), f"{seed}\n", language)
+
+
+def _load_generator(problem_id: int, generator_hash: str) -> Optional[InputGeneratorModel]:
+    db = SessionLocal()
+    try:
+        return db.query(InputGeneratorModel).filter(
+            InputGeneratorModel.problem_id == problem_id,
+            InputGeneratorModel.code_hash == generator_hash,
+        ).first()
+    finally:
+        db.close()
+
+
+async def materialize_input(
+    problem_id: int,
+    generator_hash: str,
+    seed: int,
+    expected_input_hash: Optional[str] = None,
+) -> Optional[str]:
+    """반례 기록의 (생성기 버전, 시드)로 입력을 다시 만듦
+
+    저장되지 않은 생성기(스트레스 생성기 등)이거나, 생성기가 시드와 무관한 난수를 써서
+    다시 만든 입력의 해시가 기록과 다르면 None.
+    """
+    generator = await asyncio.to_thread(_load_generator, problem_id, generator_hash)
+    if generator is None:
+        return None
+    async with CodeRunnerClient() as code_runner:
+        result = await run_generator(code_runner, generator.code, seed, generator.generator_language)
+    if result.get("error"):
+        logging.warning(f"Failed to materialize input ({problem_id}, seed {seed}): {result['error']}")
+        return None
+    test_input = result.get("output", "")
+    if expected_input_hash and input_digest(test_input) != expected_input_hash:
+        logging.warning(f"Generator is not reproducible for seed {seed} (problem {problem_id})")
+        return None
+    return test_input
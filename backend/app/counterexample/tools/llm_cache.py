@@ -0,0 +1,190 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, TypedDict
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import BasePromptTemplate
+from langchain_openai.chat_models.base import BaseChatOpenAI
+from database.mysql_connection import SessionLocal
+from app.config import LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS
+from app.models.llm_cache_model import LlmCacheModel
+from app.counterexample.tools.chat_client import get_chat_semaphore
+from app.counterexample.utils.tracing import measure_call, record_llm_tokens
+from app.counterexample.utils.markdown import extract_code_block
+from app.counterexample.utils.prompt_compact import count_tokens
+
+
+class CachedResponse(TypedDict):
+    response: str     # LLM 원문 응답
+    code: str         # 응답에서 추출한 코드 블록 (없으면 "")
+    cache_key: str
+    cached: bool      # 캐시에서 가져왔는지 여부
+    elapsed_ms: int   # LLM 호출 시간 (캐시 적중 시 0)
+    prompt_tokens: int  # 보내기 전에 센 프롬프트 토큰 수 (캐시 적중 시 0)
+    input_tokens: int   # 응답의 usage 기준 (모델이 알려주지 않으면 0)
+    output_tokens: int
+
+
+# 프로세스 전체 캐시 사용 통계
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "bypassed": 0}
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """프로세스 시작 이후 LLM 캐시 적중률"""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+def _log_tokens(prompt_version: str, prompt_tokens: int, input_tokens: int, output_tokens: int, elapsed_ms: int) -> None:
+    # 탐색별 토큰 수는 노드 통계(stats.stages)에 남으므로 여기서는 프롬프트 버전별 로그만 남김
+    logging.info(
+        f"LLM call ({prompt_version}): prompt ~{prompt_tokens} tokens, "
+        f"usage {input_tokens} in / {output_tokens} out, {elapsed_ms}ms"
+    )
+
+
+def make_cache_key(
+    prompt_version: str,
+    inputs: Dict[str, Any],
+    chat: BaseChatOpenAI,
+    variant: int = 0,
+) -> str:
+    """(프롬프트 버전, 입력, 모델, reasoning effort, 후보 번호)의 해시"""
+    payload = {
+        "prompt_version": prompt_version,
+        "inputs": inputs,
+        "model": getattr(chat, "model_name", None),
+        "reasoning_effort": getattr(chat, "reasoning_effort", None),
+        "variant": variant,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _load(cache_key: str) -> Optional[Dict[str, str]]:
+    db = SessionLocal()
+    try:
+        entry = db.get(LlmCacheModel, cache_key)
+        if not entry or entry.expires_at <= datetime.now():
+            return None
+        entry.hit_count = (entry.hit_count or 0) + 1
+        db.commit()
+        return {"response": entry.response, "code": entry.code or ""}
+    finally:
+        db.close()
+
+
+def _store(cache_key: str, prompt_version: str, model: Optional[str], response: str, code: str) -> None:
+    db = SessionLocal()
+    try:
+        db.merge(LlmCacheModel(
+            cache_key=cache_key,
+            prompt_version=prompt_version,
+            model=model,
+            response=response,
+            code=code,
+            hit_count=0,
+            expires_at=datetime.now() + timedelta(seconds=LLM_CACHE_TTL_SECONDS),
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _delete(cache_keys: List[str]) -> None:
+    db = SessionLocal()
+    try:
+        db.query(LlmCacheModel).filter(LlmCacheModel.cache_key.in_(cache_keys)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def invoke_with_cache(
+    prompt: BasePromptTemplate,
+    chat: BaseChatOpenAI,
+    inputs: Dict[str, Any],
+    prompt_version: str,
+    variant: int = 0,
+    bypass: bool = False,
+) -> CachedResponse:
+    """`prompt | chat` 호출 결과를 캐시에서 찾고, 없으면 호출 후 저장합니다.
+
+    bypass=True이면 캐시를 읽지 않고 새로 샘플링한 결과로 덮어씁니다 (재시도 등 의도적 재샘플링).
+    캐시 DB 오류는 로그만 남기고 LLM 호출로 대신합니다.
+    """
+    cache_key = make_cache_key(prompt_version, inputs, chat, variant)
+
+    if LLM_CACHE_ENABLED and not bypass:
+        try:
+            entry = await asyncio.to_thread(_load, cache_key)
+        except Exception as e:
+            logging.warning(f"LLM cache lookup failed: {e}")
+            entry = None
+        if entry:
+            _stats["hits"] += 1
+            logging.info(f"LLM cache hit ({prompt_version}): {cache_key[:12]} {get_llm_cache_stats()}")
+            return {
+                **entry,
+                "cache_key": cache_key,
+                "cached": True,
+                "elapsed_ms": 0,
+                "prompt_tokens": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+            }
+        _stats["misses"] += 1
+    elif bypass:
+        _stats["bypassed"] += 1
+
+    # 지연 시간이 프롬프트 길이에 비례하므로 보내기 전에 세어 두고 실제 usage와 함께 기록
+    prompt_tokens = count_tokens(prompt.format(**inputs))
+    chain = prompt | chat
+    async with get_chat_semaphore(chat):
+        started = time.perf_counter()
+        with measure_call("llm"):
+            message = await chain.ainvoke(inputs)
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    record_llm_tokens(input_tokens, output_tokens)
+    _log_tokens(prompt_version, prompt_tokens, input_tokens, output_tokens, elapsed_ms)
+    response = StrOutputParser().invoke(message)
+    code = extract_code_block(response) or ""
+
+    # 코드 블록이 없는 응답은 재사용할 가치가 없으므로 저장하지 않음
+    if LLM_CACHE_ENABLED and code:
+        try:
+            await asyncio.to_thread(
+                _store, cache_key, prompt_version, getattr(chat, "model_name", None), response, code
+            )
+        except Exception as e:
+            logging.warning(f"LLM cache store failed: {e}")
+
+    return {
+        "response": response,
+        "code": code,
+        "cache_key": cache_key,
+        "cached": False,
+        "elapsed_ms": elapsed_ms,
+        "prompt_tokens": prompt_tokens,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+    }
+
+
+async def invalidate(cache_keys: List[str]) -> None:
+    """검증에 실패한 응답(예: 백준에서 틀린 해결책)이 다시 쓰이지 않도록 캐시에서 제거"""
+    keys = [key for key in cache_keys if key]
+    if not LLM_CACHE_ENABLED or not keys:
+        return
+    try:
+        await asyncio.to_thread(_delete, keys)
+    except Exception as e:
+        logging.warning(f"LLM cache invalidation failed: {e}")
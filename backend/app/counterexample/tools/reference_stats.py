@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from database.mysql_connection import SessionLocal
+from app.config import INPUT_GENERATOR_LANGUAGE, GENERATOR_RETIRE_AFTER_ROUNDS
+from app.models.solved_problem_model import SolvedProblemModel, code_hash
+from app.models.input_generator_model import InputGeneratorModel
+
+
+def _store_reference_runs(problem_id: int, solution_code: str, runs: int, total_time_ms: float) -> None:
+    db = SessionLocal()
+    try:
+        db.query(SolvedProblemModel).filter(
+            SolvedProblemModel.problem_id == problem_id,
+            SolvedProblemModel.code_hash == code_hash(solution_code),
+        ).update({
+            SolvedProblemModel.runs: SolvedProblemModel.runs + runs,
+            SolvedProblemModel.total_time_ms: SolvedProblemModel.total_time_ms + total_time_ms,
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+def _store_generator_round(problem_id: int, code: str, cases_run: int, found: bool, failed: bool) -> None:
+    db = SessionLocal()
+    try:
+        digest = code_hash(code)
+        query = db.query(InputGeneratorModel).filter(
+            InputGeneratorModel.problem_id == problem_id,
+            InputGeneratorModel.code_hash == digest,
+        )
+        generator = query.first()
+        if generator is None:
+            # 탐색 중 regenerate_inputs가 만든 생성기는 다음 버전으로 추가
+            version = (db.query(func.max(InputGeneratorModel.version)).filter(
+                InputGeneratorModel.problem_id == problem_id
+            ).scalar() or 0) + 1
+            generator = InputGeneratorModel(
+                problem_id=problem_id, version=version, generator_language=INPUT_GENERATOR_LANGUAGE,
+                code=code, code_hash=digest, rounds=0, cases_run=0, counterexamples_found=0,
+                last_used_at=func.now(),
+            )
+            db.add(generator)
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                generator = query.one()
+
+        generator.rounds += 1
+        generator.cases_run += cases_run
+        generator.counterexamples_found += int(found)
+        if failed and generator.cases_run == 0:
+            # 입력을 하나도 만들지 못하고 실패한 생성기는 다시 고르지 않음
+            generator.status = "broken"
+        elif (
+            generator.status == "active"
+            and generator.counterexamples_found == 0
+            and generator.rounds >= GENERATOR_RETIRE_AFTER_ROUNDS
+        ):
+            # 정답 코드에는 어떤 생성기도 반례를 못 찾으므로, 다른 생성기는 반례를 찾는 문제에서만 은퇴
+            productive = db.query(InputGeneratorModel).filter(
+                InputGeneratorModel.problem_id == problem_id,
+                InputGeneratorModel.status == "active",
+                InputGeneratorModel.counterexamples_found > 0,
+            ).count()
+            if productive:
+                generator.status = "retired"
+        db.commit()
+    finally:
+        db.close()
+
+
+async def record_reference_runs(problem_id: int, solution_code: str, runs: int, total_time_ms: float) -> None:
+    """저장된 참조 해답의 실행 시간 누적 (가장 빠른 해답 선택용, 기록 실패는 탐색에 영향 주지 않음)"""
+    if not runs:
+        return
+    try:
+        await asyncio.to_thread(_store_reference_runs, problem_id, solution_code, runs, total_time_ms)
+    except Exception as e:
+        logging.warning(f"Failed to record reference runs: {e}")
+
+
+async def record_generator_round(problem_id: int, code: str, cases_run: int, found: bool, failed: bool = False) -> None:
+    """입력 생성기 한 라운드의 결과 누적 (수율 기반 선택/은퇴용, 기록 실패는 탐색에 영향 주지 않음)
+
+    cases_run은 생성기가 직접 만든 입력 수, found는 라운드에서 반례를 찾았는지 (변이 입력도 생성기 코퍼스에서 나오므로 포함)
+    """
+    if not code:
+        return
+    try:
+        await asyncio.to_thread(_store_generator_round, problem_id, code, cases_run, found, failed)
+    except Exception as e:
+        logging.warning(f"Failed to record input generator round: {e}")
@@ -0,0 +1,205 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, TypedDict
+from database.mysql_connection import SessionLocal
+from app.config import RESULT_CACHE_ENABLED, RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_MAX_BYTES
+from app.models.counterexample_cache_model import CounterexampleCacheModel
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+from app.counterexample.tools.generator_runner import input_digest, materialize_input
+from app.counterexample.utils.compare import compare_outputs, detect_compare_options
+from app.counterexample.utils.normalize import normalized_code_hash
+
+# 정규화 방식을 바꾸면 올려서 이전 키를 버림
+RESULT_CACHE_VERSION = "v2"
+
+# 실행 결과가 아니라 code-runner 호출 자체가 실패한 경우 (반례 여부를 판단할 수 없음)
+_RUNNER_FAILURES = ("connection_error", "parse_error", "unknown_error")
+
+# 입력/출력 비교 결과는 따로 저장하거나 확인 실행에서 다시 만듦
+_DETAIL_OMITTED_KEYS = ("input", "original_input", "user_output", "correct_output", "diff", "error")
+
+
+class CachedCounterexample(TypedDict):
+    counterexample_input: str
+    original_counterexample_input: Optional[str]
+    counterexample_detail: Dict[str, Any]
+    stats: Dict[str, Any]
+
+
+# 프로세스 전체 결과 캐시 사용 통계 (stale: 저장된 반례에서 이번 코드가 맞게 출력해 전체 탐색으로 넘어감)
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stale": 0}
+
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    """프로세스 시작 이후 반례 결과 캐시 적중률"""
+    lookups = _stats["hits"] + _stats["misses"] + _stats["stale"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+def result_cache_key(problem_id: int, language: str, code: str) -> str:
+    """(문제, 언어, 정규화한 코드)의 해시"""
+    payload = f"{RESULT_CACHE_VERSION}:{problem_id}:{language}:{normalized_code_hash(code, language)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load(cache_key: str) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        entry = db.get(CounterexampleCacheModel, cache_key)
+        if not entry or entry.expires_at <= datetime.now():
+            return None
+        entry.hit_count = (entry.hit_count or 0) + 1
+        db.commit()
+        return {
+            "counterexample_input": entry.counterexample_input,
+            "original_counterexample_input": entry.original_counterexample_input,
+            "correct_output": entry.correct_output,
+            "detail": json.loads(entry.detail) if entry.detail else {},
+        }
+    finally:
+        db.close()
+
+
+def _store(cache_key: str, problem_id: int, language: str, counterexample_input: str,
+           original_input: Optional[str], correct_output: str, detail: Dict[str, Any]) -> None:
+    db = SessionLocal()
+    try:
+        db.merge(CounterexampleCacheModel(
+            cache_key=cache_key,
+            problem_id=problem_id,
+            language=language,
+            counterexample_input=counterexample_input,
+            original_counterexample_input=original_input,
+            correct_output=correct_output,
+            detail=json.dumps(detail, ensure_ascii=False),
+            hit_count=0,
+            expires_at=datetime.now() + timedelta(seconds=RESULT_CACHE_TTL_SECONDS),
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _replay_original_input(problem_id: int, entry: Dict[str, Any]) -> Optional[str]:
+    """크기 때문에 저장하지 않은 최소화 이전 입력을 반례 기록의 (생성기 버전, 시드)로 다시 만듦"""
+    detail = entry["detail"]
+    if not detail.get("generator_hash") or detail.get("seed") is None:
+        return None
+    # 최소화되지 않은 반례는 저장된 입력이 곧 원래 입력
+    if detail.get("input_hash") == input_digest(entry["counterexample_input"]):
+        return None
+    return await materialize_input(problem_id, detail["generator_hash"], detail["seed"], detail.get("input_hash"))
+
+
+async def lookup_result(
+    problem_id: int,
+    language: str,
+    user_code: str,
+    problem_description: str,
+) -> Optional[CachedCounterexample]:
+    """같은(정규화 기준) 코드로 찾은 반례가 있으면, 그 입력 하나로 이번 코드를 실행해 여전히 틀리는지 확인
+
+    주석/공백/변수 이름 외의 차이가 같은 키로 모일 수 있으므로 확인 실행에서 출력이 맞으면 None (전체 탐색).
+    캐시 DB/code-runner 오류도 로그만 남기고 None.
+    최소화 이전 입력이 저장되어 있지 않으면 생성기로 다시 만든다 (재현되지 않으면 None으로 둠).
+    """
+    if not RESULT_CACHE_ENABLED:
+        return None
+    started = time.perf_counter()
+    cache_key = result_cache_key(problem_id, language, user_code)
+    try:
+        entry = await asyncio.to_thread(_load, cache_key)
+    except Exception as e:
+        logging.warning(f"Result cache lookup failed: {e}")
+        return None
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+
+    async with CodeRunnerClient() as code_runner:
+        user_result = await code_runner.run_code(user_code, entry["counterexample_input"], language)
+    if user_result.get("status") in _RUNNER_FAILURES:
+        logging.warning(f"Result cache verification failed to run ({problem_id}): {user_result.get('error')}")
+        return None
+
+    user_output = user_result.get("output", "")
+    comparison = compare_outputs(entry["correct_output"], user_output, **detect_compare_options(problem_description))
+    if comparison["equal"]:
+        _stats["stale"] += 1
+        logging.info(f"Cached counterexample no longer fails for problem {problem_id}, searching again")
+        return None
+
+    _stats["hits"] += 1
+    executions = 1
+    original_input = entry["original_counterexample_input"]
+    if original_input is None:
+        try:
+            original_input = await _replay_original_input(problem_id, entry)
+        except Exception as e:
+            logging.warning(f"Failed to replay original counterexample input ({problem_id}): {e}")
+        if original_input is not None:
+            executions += 1
+    detail = {
+        **entry["detail"],
+        "input": entry["counterexample_input"],
+        "original_input": original_input,
+        "user_output": user_output.strip(),
+        "correct_output": entry["correct_output"],
+        "diff": comparison,
+        "cached": True,
+    }
+    if user_result.get("error"):
+        detail["error"] = user_result["error"]
+    return CachedCounterexample(
+        counterexample_input=entry["counterexample_input"],
+        original_counterexample_input=original_input,
+        counterexample_detail=detail,
+        stats={
+            "cached": True,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "llm_calls": 0,
+            "executions": executions,
+            "test_cases_run": 1,
+            "budget_exhausted": False,
+        },
+    )
+
+
+async def store_result(
+    problem_id: int,
+    language: str,
+    user_code: str,
+    counterexample_input: Optional[str],
+    original_input: Optional[str],
+    detail: Optional[Dict[str, Any]],
+) -> None:
+    """오답 반례(참조 해답의 출력이 있는 반례)만 저장
+
+    성능(TLE/MLE) 반례는 실행 환경에 따라 재현 여부가 달라 저장하지 않는다.
+    입력/출력이 RESULT_CACHE_MAX_BYTES를 넘으면 최소화 이전 입력을 빼고(적중 시 생성기로 다시 만듦), 그래도 크면 저장하지 않는다.
+    """
+    if not RESULT_CACHE_ENABLED or not counterexample_input or not detail or detail.get("cached"):
+        return
+    correct_output = detail.get("correct_output")
+    if correct_output is None or detail.get("type") == "performance":
+        return
+    size = len(counterexample_input.encode("utf-8")) + len(correct_output.encode("utf-8"))
+    if size > RESULT_CACHE_MAX_BYTES:
+        return
+    if original_input and size + len(original_input.encode("utf-8")) > RESULT_CACHE_MAX_BYTES:
+        original_input = None
+    stored_detail = {k: v for k, v in detail.items() if k not in _DETAIL_OMITTED_KEYS}
+    try:
+        await asyncio.to_thread(
+            _store, result_cache_key(problem_id, language, user_code), problem_id, language,
+            counterexample_input, original_input, correct_output, stored_detail,
+        )
+    except Exception as e:
+        logging.warning(f"Result cache store failed ({problem_id}): {e}")
@@ -0,0 +1,125 @@
+import random
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, TypedDict
+from database.mysql_connection import SessionLocal
+from app.config import (
+    TIER_ROUTING_ENABLED,
+    TIER_ROUTER_WINDOW,
+    TIER_ROUTER_MIN_CATEGORY_SAMPLES,
+    TIER_ROUTER_PRIOR_LATENCY_SECONDS,
+)
+from app.models.solve_attempt_model import SolveAttemptModel
+from app.counterexample.state import SolveAttempt
+from app.counterexample.tools.chat_client import SOLVE_TIERS, Tier, get_tier, tier_name
+
+# 같은 구간으로 묶는 난이도 폭 (5 = 브론즈/실버/골드/... 한 등급)
+DIFFICULTY_BUCKET = 5
+
+
+class TierStats(TypedDict):
+    attempts: int
+    accepted: int
+    latency_ms: float  # 평균 LLM 호출 시간
+
+
+def _primary_tag(category: Optional[str]) -> str:
+    return (category or "").split(",")[0].strip()
+
+
+def _load_stats(difficulty: int, category: str) -> Dict[str, TierStats]:
+    """같은 난이도 구간의 최근 기록을 tier별로 집계 (주 분류 기록이 충분하면 그것만 사용)"""
+    low = (max(difficulty, 0) // DIFFICULTY_BUCKET) * DIFFICULTY_BUCKET
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(SolveAttemptModel)
+            .filter(SolveAttemptModel.difficulty.between(low, low + DIFFICULTY_BUCKET - 1))
+            .order_by(SolveAttemptModel.id.desc())
+            .limit(TIER_ROUTER_WINDOW)
+            .all()
+        )
+    finally:
+        db.close()
+
+    tag = _primary_tag(category)
+    if tag:
+        same_tag = [row for row in rows if tag in (row.category or "").split(",")]
+        if len(same_tag) >= TIER_ROUTER_MIN_CATEGORY_SAMPLES:
+            rows = same_tag
+
+    stats: Dict[str, TierStats] = {}
+    for row in rows:
+        item = stats.setdefault(row.tier, {"attempts": 0, "accepted": 0, "latency_ms": 0.0})
+        item["attempts"] += 1
+        item["accepted"] += int(row.accepted)
+        item["latency_ms"] += row.latency_ms
+    for item in stats.values():
+        item["latency_ms"] /= item["attempts"]
+    return stats
+
+
+def _expected_seconds_to_accepted(stats: Optional[TierStats], rng: random.Random) -> float:
+    """Thompson sampling: 정답률을 Beta 사후 분포에서 뽑아 (평균 지연 / 정답률)로 기대 소요 시간 추정
+
+    기록이 적은 tier일수록 정답률 표본의 분산이 커서 자연스럽게 탐색된다.
+    """
+    attempts = stats["attempts"] if stats else 0
+    accepted = stats["accepted"] if stats else 0
+    latency = stats["latency_ms"] / 1000 if stats else TIER_ROUTER_PRIOR_LATENCY_SECONDS
+    p_accepted = rng.betavariate(1 + accepted, 1 + attempts - accepted)
+    return latency / max(p_accepted, 1e-6)
+
+
+async def choose_solve_tier(
+    problem_id: int,
+    difficulty: int,
+    category: str,
+    try_count: int = 0,
+    exclude: Sequence[str] = (),
+) -> Tier:
+    """기록된 결과로 기대 time-to-Accepted가 가장 짧은 tier 선택
+
+    같은 문제/시도 번호면 같은 난수를 써서 통계가 크게 바뀌지 않는 한 같은 tier(= 같은 LLM 캐시 키)를 고른다.
+    재시도에서는 이번 탐색에서 이미 틀린 tier를 제외한다. 기록 조회에 실패하면 난이도 고정 사다리를 따른다.
+    """
+    fallback = get_tier(difficulty + 2 * try_count)
+    if not TIER_ROUTING_ENABLED:
+        return fallback
+    try:
+        stats = await asyncio.to_thread(_load_stats, difficulty, category)
+    except Exception as e:
+        logging.warning(f"Tier router stats unavailable, using difficulty ladder: {e}")
+        return fallback
+
+    tiers = [tier for tier in SOLVE_TIERS if tier_name(tier) not in exclude] or list(SOLVE_TIERS)
+    rng = random.Random(f"{problem_id}:{try_count}")
+    scores = {tier: _expected_seconds_to_accepted(stats.get(tier_name(tier)), rng) for tier in tiers}
+    chosen = min(tiers, key=lambda tier: scores[tier])
+    logging.info(
+        f"Tier router (difficulty {difficulty}, {_primary_tag(category) or '-'}): "
+        f"{ {tier_name(tier): round(score, 1) for tier, score in scores.items()} } -> {tier_name(chosen)}"
+    )
+    return chosen
+
+
+def _store(attempts: List[SolveAttempt]) -> None:
+    db = SessionLocal()
+    try:
+        db.add_all([
+            SolveAttemptModel(**attempt, accepted=attempt["verdict"] == "Accepted")
+            for attempt in attempts
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def record_solve_attempts(attempts: List[SolveAttempt]) -> None:
+    """후보별 생성 결과 기록 (기록 실패는 탐색에 영향 주지 않음)"""
+    if not attempts:
+        return
+    try:
+        await asyncio.to_thread(_store, attempts)
+    except Exception as e:
+        logging.warning(f"Failed to record solve attempts: {e}")
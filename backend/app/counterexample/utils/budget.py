@@ -0,0 +1,89 @@
+from __future__ import annotations
+import time
+from typing import Any, Dict, Mapping
+
+from app.config import (
+    SEARCH_TIME_LIMIT_SECONDS,
+    SEARCH_MAX_LLM_CALLS,
+    SEARCH_MAX_EXECUTIONS,
+)
+from app.counterexample.state import SearchBudget
+from app.counterexample.utils.tracing import summarize_node_stats
+
+
+def get_search_budget(difficulty: int = 0) -> SearchBudget:
+    """문제 난이도에 비례하여 확장된 탐색 예산을 반환합니다.
+
+    난이도 0(unrated)은 기본 예산, 난이도 30(Ruby 1)은 기본 예산의 4배입니다.
+    """
+    scale = 1 + max(difficulty, 0) / 10
+    return {
+        "time_limit_seconds": SEARCH_TIME_LIMIT_SECONDS * scale,
+        "max_llm_calls": int(SEARCH_MAX_LLM_CALLS * scale),
+        "max_executions": int(SEARCH_MAX_EXECUTIONS * scale),
+    }
+
+
+def elapsed_seconds(state: Mapping[str, Any]) -> float:
+    """탐색에 쓴 시간 (끝난 노드의 누적 시간 + 실행 중인 노드의 경과 시간)"""
+    elapsed = state.get("search_elapsed_seconds") or 0.0
+    node_started_at = state.get("node_started_at")
+    if node_started_at is not None:
+        elapsed += time.time() - node_started_at
+    return elapsed
+
+
+def remaining_llm_calls(state: Mapping[str, Any]) -> int:
+    budget = state.get("search_budget")
+    if not budget:
+        return SEARCH_MAX_LLM_CALLS
+    return budget["max_llm_calls"] - state.get("llm_calls", 0)
+
+
+def remaining_executions(state: Mapping[str, Any]) -> int:
+    budget = state.get("search_budget")
+    if not budget:
+        return SEARCH_MAX_EXECUTIONS
+    return budget["max_executions"] - state.get("executions", 0)
+
+
+def is_time_exhausted(state: Mapping[str, Any]) -> bool:
+    budget = state.get("search_budget")
+    if not budget:
+        return False
+    return elapsed_seconds(state) >= budget["time_limit_seconds"]
+
+
+def is_budget_exhausted(state: Mapping[str, Any]) -> bool:
+    """시간/LLM 호출/실행 횟수 중 하나라도 예산을 넘었는지 확인"""
+    budget = state.get("search_budget")
+    if not budget:
+        return False
+    return (
+        is_time_exhausted(state)
+        or state.get("llm_calls", 0) >= budget["max_llm_calls"]
+        or state.get("executions", 0) >= budget["max_executions"]
+    )
+
+
+def _cache_hit_rate(state: Mapping[str, Any]) -> float:
+    hits = state.get("llm_cache_hits", 0)
+    requests = hits + state.get("llm_calls", 0)
+    return round(hits / requests, 3) if requests else 0.0
+
+
+def get_search_stats(state: Mapping[str, Any]) -> Dict[str, Any]:
+    """결과/스트림에 포함할 탐색 통계"""
+    return {
+        "elapsed_seconds": round(elapsed_seconds(state), 3),
+        "llm_calls": state.get("llm_calls", 0),
+        "llm_cache_hits": state.get("llm_cache_hits", 0),
+        "llm_cache_hit_rate": _cache_hit_rate(state),
+        "executions": state.get("executions", 0),
+        "test_cases_run": state.get("test_cases_run", 0),
+        "budget_exhausted": bool(state.get("budget_exhausted", False)),
+        "budget": state.get("search_budget"),
+        "difficulty": state.get("difficulty", 0),
+        "solve_tiers": state.get("solve_tiers_tried", []),
+        "stages": summarize_node_stats(state.get("node_stats")),
+    }
@@ -0,0 +1,62 @@
+import asyncio
+import inspect
+import contextlib
+from asyncio import Event
+from typing import Any, Callable, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+
+
+def get_cancel_event(config: Optional[RunnableConfig]) -> Optional[Event]:
+    """실행 설정(configurable)으로 전달된 취소 이벤트
+
+    체크포인트에 저장되는 그래프 상태에는 직렬화할 수 없는 제어 객체를 두지 않는다.
+    """
+    if not config:
+        return None
+    return config.get("configurable", {}).get("cancel_event")
+
+
+class RunCancelled(Exception):
+    """취소 이벤트로 노드 실행이 중단됨 (노드가 완료로 기록되지 않아 재개 시 다시 실행됨)"""
+
+
+def cancellable_node(func: Callable[..., Any]) -> Callable[..., Any]:
+    """취소 이벤트가 설정되면 진행 중인 노드를 즉시 중단하는 래퍼
+
+    노드 태스크를 cancel 하므로 대기 중인 LLM 요청, code-runner 작업(revoke), 백준 제출(abort)이
+    각 클라이언트의 CancelledError 처리로 함께 정리된다.
+    """
+    accepts_config = "config" in inspect.signature(func).parameters
+
+    async def node(state: Dict[str, Any], config: RunnableConfig) -> Any:
+        cancel_event = get_cancel_event(config)
+        call = func(state, config) if accepts_config else func(state)
+        if not inspect.isawaitable(call):
+            return call
+        if cancel_event is None:
+            return await call
+        if cancel_event.is_set():
+            if inspect.iscoroutine(call):
+                call.close()
+            raise RunCancelled()
+
+        task = asyncio.ensure_future(call)
+        waiter = asyncio.ensure_future(cancel_event.wait())
+        try:
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            task.cancel()
+            raise
+        finally:
+            waiter.cancel()
+        if task.done():
+            return task.result()
+
+        task.cancel()
+        # 클라이언트들이 원격 작업을 정리할 때까지 기다림
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        raise RunCancelled()
+
+    node.__name__ = getattr(func, "__name__", "node")
+    return node
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import math
+import re
+from itertools import zip_longest
+from typing import Iterator, Literal, Optional, Tuple, TypedDict
+
+# 채점 방식
+# - exact: 백준 기본 채점. 줄 끝 공백과 마지막 빈 줄은 무시하고 줄 단위로 비교
+# - token: 공백(개행 포함) 단위 토큰 비교
+# - float: 토큰 비교 + 실수 토큰은 절대/상대 오차 허용
+CompareMode = Literal["exact", "token", "float"]
+
+# 불일치 위치 주변으로 잘라 보여줄 최대 문자 수
+MAX_CONTEXT_CHARS = 200
+
+_TOKEN_PATTERN = re.compile(r"\S+")
+# 예: "절대/상대 오차는 10-9 까지 허용", "오차가 10^{-6} 이하이면 정답"
+_EPSILON_PATTERN = re.compile(r"오차[^\n]{0,40}?10\s*\^?\s*\{?\s*[-−]\s*(\d+)")
+
+
+class CompareOptions(TypedDict):
+    mode: CompareMode
+    abs_eps: Optional[float]
+    rel_eps: Optional[float]
+
+
+class CompareResult(TypedDict):
+    equal: bool
+    mode: CompareMode
+    line: Optional[int]      # 처음 다른 줄 (1부터)
+    token: Optional[int]     # 처음 다른 토큰의 전체 순번 (1부터, exact 모드는 None)
+    expected: Optional[str]  # 처음 다른 토큰/줄 (정답 쪽, 출력이 끝났으면 None)
+    actual: Optional[str]    # 처음 다른 토큰/줄 (사용자 쪽, 출력이 끝났으면 None)
+    expected_line: Optional[str]  # 불일치 줄 전체 (MAX_CONTEXT_CHARS로 자름)
+    actual_line: Optional[str]
+
+
+def detect_compare_options(problem_description: str) -> CompareOptions:
+    """문제 본문의 오차 허용 문구로 채점 방식을 추정합니다. 문구가 없으면 백준 기본(exact)."""
+    match = _EPSILON_PATTERN.search(problem_description or "")
+    if not match:
+        return {"mode": "exact", "abs_eps": None, "rel_eps": None}
+    eps = 10.0 ** -int(match.group(1))
+    context = problem_description[max(match.start() - 20, 0):match.end()]
+    # "절대/상대 오차"처럼 둘 다 언급되거나 아무것도 언급되지 않으면 둘 중 하나만 만족해도 정답
+    has_abs = "절대" in context
+    has_rel = "상대" in context
+    if not has_abs and not has_rel:
+        has_abs = has_rel = True
+    return {
+        "mode": "float",
+        "abs_eps": eps if has_abs else None,
+        "rel_eps": eps if has_rel else None,
+    }
+
+
+def compare_outputs(
+    expected: str,
+    actual: str,
+    mode: CompareMode = "exact",
+    abs_eps: Optional[float] = None,
+    rel_eps: Optional[float] = None,
+) -> CompareResult:
+    """정답 출력(expected)과 사용자 출력(actual)을 채점 방식에 맞게 비교하고 처음 다른 위치를 보고합니다.
+
+    전체 문자열을 strip/split 하여 복사하지 않고 줄/토큰 단위로 앞에서부터 비교하며,
+    완전히 같은 출력은 문자열 비교 한 번으로 끝냅니다.
+    """
+    expected = expected or ""
+    actual = actual or ""
+    if expected == actual:
+        return _equal(mode)
+    if mode == "exact":
+        return _compare_lines(expected, actual)
+    return _compare_tokens(expected, actual, mode, abs_eps, rel_eps)
+
+
+def outputs_match(expected: str, actual: str, options: Optional[CompareOptions] = None) -> bool:
+    return compare_outputs(expected, actual, **(options or {}))["equal"]
+
+
+def _equal(mode: CompareMode) -> CompareResult:
+    return {
+        "equal": True,
+        "mode": mode,
+        "line": None,
+        "token": None,
+        "expected": None,
+        "actual": None,
+        "expected_line": None,
+        "actual_line": None,
+    }
+
+
+def _clip(text: Optional[str]) -> Optional[str]:
+    if text is None or len(text) <= MAX_CONTEXT_CHARS:
+        return text
+    return text[:MAX_CONTEXT_CHARS] + "..."
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """줄 끝 공백을 뗀 줄을 하나씩 (splitlines처럼 전체 목록을 만들지 않음)"""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        yield text[start:end].rstrip()
+        start = end + 1
+
+
+def _compare_lines(expected: str, actual: str) -> CompareResult:
+    expected_lines = _iter_lines(expected)
+    actual_lines = _iter_lines(actual)
+    for line_no, (exp, act) in enumerate(zip_longest(expected_lines, actual_lines), start=1):
+        if exp == act:
+            continue
+        # 한쪽이 끝났더라도 남은 줄이 모두 빈 줄이면 같은 출력
+        if exp is None and not act and not any(actual_lines):
+            break
+        if act is None and not exp and not any(expected_lines):
+            break
+        return {
+            "equal": False,
+            "mode": "exact",
+            "line": line_no,
+            "token": None,
+            "expected": _clip(exp),
+            "actual": _clip(act),
+            "expected_line": _clip(exp),
+            "actual_line": _clip(act),
+        }
+    return _equal("exact")
+
+
+def _iter_tokens(text: str) -> Iterator[Tuple[str, int, int]]:
+    """(토큰, 줄 번호, 토큰 시작 위치)를 하나씩"""
+    line_no = 1
+    last = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        line_no += text.count("\n", last, match.start())
+        last = match.start()
+        yield match.group(), line_no, match.start()
+
+
+def _tokens_equal(exp: str, act: str, mode: CompareMode, abs_eps: Optional[float], rel_eps: Optional[float]) -> bool:
+    if exp == act:
+        return True
+    if mode != "float":
+        return False
+    try:
+        exp_value = float(exp)
+        act_value = float(act)
+    except ValueError:
+        return False
+    if not (math.isfinite(exp_value) and math.isfinite(act_value)):
+        return False
+    diff = abs(exp_value - act_value)
+    if abs_eps is not None and diff <= abs_eps:
+        return True
+    if rel_eps is not None and diff <= rel_eps * abs(exp_value):
+        return True
+    return False
+
+
+def _line_at(text: str, position: int) -> str:
+    start = text.rfind("\n", 0, position) + 1
+    end = text.find("\n", position)
+    return text[start:end if end != -1 else len(text)].rstrip()
+
+
+def _compare_tokens(
+    expected: str,
+    actual: str,
+    mode: CompareMode,
+    abs_eps: Optional[float],
+    rel_eps: Optional[float],
+) -> CompareResult:
+    for index, (exp, act) in enumerate(zip_longest(_iter_tokens(expected), _iter_tokens(actual)), start=1):
+        if exp is not None and act is not None and _tokens_equal(exp[0], act[0], mode, abs_eps, rel_eps):
+            continue
+        # 남은 쪽 토큰의 위치를 기준으로 줄 번호와 주변 줄을 보고
+        anchor = exp or act
+        return {
+            "equal": False,
+            "mode": mode,
+            "line": anchor[1],
+            "token": index,
+            "expected": _clip(exp[0]) if exp else None,
+            "actual": _clip(act[0]) if act else None,
+            "expected_line": _clip(_line_at(expected, exp[2])) if exp else None,
+            "actual_line": _clip(_line_at(actual, act[2])) if act else None,
+        }
+    return _equal(mode)
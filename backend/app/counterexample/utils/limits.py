@@ -0,0 +1,24 @@
+from __future__ import annotations
+import re
+from typing import Optional, TypedDict
+
+_TIME_LIMIT_PATTERN = re.compile(r"시간 제한[\s\S]{0,200}?(\d+(?:\.\d+)?)\s*초")
+_MEMORY_LIMIT_PATTERN = re.compile(r"메모리 제한[\s\S]{0,200}?(\d+(?:\.\d+)?)\s*MB", re.IGNORECASE)
+
+
+class ProblemLimits(TypedDict):
+    time_limit_seconds: Optional[float]
+    memory_limit_mb: Optional[int]
+
+
+def parse_problem_limits(markdown_text: str) -> ProblemLimits:
+    """문제 마크다운의 `|시간 제한|메모리 제한|` 표(또는 본문)에서 제한을 읽습니다.
+
+    찾지 못한 항목은 None (예: 제한 표가 없던 시절에 저장된 문제).
+    """
+    time_match = _TIME_LIMIT_PATTERN.search(markdown_text)
+    memory_match = _MEMORY_LIMIT_PATTERN.search(markdown_text)
+    return {
+        "time_limit_seconds": float(time_match.group(1)) if time_match else None,
+        "memory_limit_mb": int(float(memory_match.group(1))) if memory_match else None,
+    }
@@ -17,3 +17,34 @@ def extract_code_block(markdown_text: str) -> str | None:
         if match:
             return match.group(1).strip()
     return None
+
+
+_SAMPLE_FENCED_PATTERN = re.compile(
+    r"\*\*입력:\*\*\s*```[^\n]*\n([\s\S]*?)\n?```\s*\*\*출력:\*\*\s*```[^\n]*\n([\s\S]*?)\n?```"
+)
+_SAMPLE_HEADING_PATTERN = re.compile(
+    r"^#+[ \t]*예제[ \t]*(입력|출력)[ \t]*(\d+)[^\n]*\n([\s\S]*?)(?=^#|\Z)",
+    re.MULTILINE,
+)
+
+
+def extract_samples(markdown_text: str) -> list[tuple[str, str]]:
+    """Extract (input, output) sample pairs from a problem markdown.
+
+    Supports the fenced `**입력:**`/`**출력:**` form produced by
+    SolvedProblemService._get_problem_markdown and the BOJ-style
+    `### 예제 입력 N` / `### 예제 출력 N` headings.
+    """
+    samples = [
+        (inp.strip() + "\n", out.strip() + "\n")
+        for inp, out in _SAMPLE_FENCED_PATTERN.findall(markdown_text)
+    ]
+    if samples:
+        return samples
+
+    inputs: dict[str, str] = {}
+    outputs: dict[str, str] = {}
+    for kind, index, body in _SAMPLE_HEADING_PATTERN.findall(markdown_text):
+        target = inputs if kind == "입력" else outputs
+        target[index] = body.strip() + "\n"
+    return [(inputs[i], outputs[i]) for i in inputs if i in outputs]
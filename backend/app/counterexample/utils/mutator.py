@@ -0,0 +1,213 @@
+from __future__ import annotations
+import math
+import random
+import re
+from typing import List, Optional, Sequence, Tuple
+
+_INT_PATTERN = re.compile(r"-?\d+")
+
+# 너무 큰 입력은 파싱/변이 비용이 커서 시드로 사용하지 않음
+MAX_SEED_LENGTH = 64 * 1024
+
+
+def _is_int(token: str) -> bool:
+    return _INT_PATTERN.fullmatch(token) is not None
+
+
+class ParsedInput:
+    """입력을 줄/토큰 단위로 파싱하고, 개수(N) 토큰과 본문 사이의 연결을 추정한 구조"""
+
+    def __init__(self, text: str):
+        self.lines: List[List[str]] = [line.split() for line in text.strip().splitlines()]
+        # (첫 줄 토큰 위치, 종류) - "lines": 이후 줄 수, "tokens": 둘째 줄 토큰 수
+        self.count_link: Optional[Tuple[int, str]] = self._detect_count_link()
+
+    def _detect_count_link(self) -> Optional[Tuple[int, str]]:
+        if len(self.lines) < 2:
+            return None
+        body_lines = len(self.lines) - 1
+        for index, token in enumerate(self.lines[0]):
+            if not _is_int(token):
+                continue
+            value = int(token)
+            if value == body_lines and value > 0:
+                return index, "lines"
+            if len(self.lines) == 2 and value == len(self.lines[1]) and value > 0:
+                return index, "tokens"
+        return None
+
+    def copy(self) -> "ParsedInput":
+        copied = ParsedInput.__new__(ParsedInput)
+        copied.lines = [list(line) for line in self.lines]
+        copied.count_link = self.count_link
+        return copied
+
+    def elements(self) -> List:
+        """개수 토큰이 가리키는 원소 목록 (줄 또는 토큰)"""
+        if not self.count_link:
+            return []
+        return self.lines[1:] if self.count_link[1] == "lines" else self.lines[1]
+
+    def set_elements(self, elements: List) -> None:
+        assert self.count_link is not None
+        index, kind = self.count_link
+        self.lines[0][index] = str(len(elements))
+        if kind == "lines":
+            self.lines = [self.lines[0], *elements]
+        else:
+            self.lines[1] = elements
+
+    def value_positions(self) -> List[Tuple[int, int]]:
+        """개수 토큰을 제외한 정수 토큰 위치"""
+        positions = []
+        for i, line in enumerate(self.lines):
+            for j, token in enumerate(line):
+                if self.count_link and i == 0 and j == self.count_link[0]:
+                    continue
+                if _is_int(token):
+                    positions.append((i, j))
+        return positions
+
+    def render(self) -> str:
+        return "\n".join(" ".join(line) for line in self.lines) + "\n"
+
+
+class InputMutator:
+    """샘플/코퍼스 입력을 파싱된 형태 안에서 변이시키는 로컬 퍼저.
+
+    값의 범위, 원소 개수의 범위, 중복/정렬 여부는 시드에서 관찰된 것을 벗어나지 않도록 하여
+    문제의 제약을 (추정으로나마) 지킨 입력만 만든다.
+    """
+
+    def __init__(self, seeds: Sequence[str] = (), rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self.seeds: List[ParsedInput] = []
+        self.value_min: Optional[int] = None
+        self.value_max: Optional[int] = None
+        self.max_count = 0
+        self.allow_duplicates = False
+        self.allow_permutation = False
+        for seed in seeds:
+            self.add_seed(seed)
+
+    def add_seed(self, text: str) -> None:
+        if not text or not text.strip() or len(text) > MAX_SEED_LENGTH:
+            return
+        parsed = ParsedInput(text)
+        self.seeds.append(parsed)
+
+        values = [int(parsed.lines[i][j]) for i, j in parsed.value_positions()]
+        if values:
+            low, high = min(values), max(values)
+            self.value_min = low if self.value_min is None else min(self.value_min, low)
+            self.value_max = high if self.value_max is None else max(self.value_max, high)
+
+        for line in parsed.lines:
+            if len(line) != len(set(line)):
+                self.allow_duplicates = True
+            ints = [int(t) for t in line if _is_int(t)]
+            if len(ints) > 1 and ints != sorted(ints):
+                self.allow_permutation = True
+        elements = parsed.elements()
+        self.max_count = max(self.max_count, len(elements))
+        if elements and isinstance(elements[0], list) and len({tuple(e) for e in elements}) != len(elements):
+            self.allow_duplicates = True
+
+    def mutate(self) -> Optional[str]:
+        """시드 하나를 골라 1~3회 변이한 입력을 반환 (시드가 없으면 None)"""
+        if not self.seeds:
+            return None
+        parsed = self.rng.choice(self.seeds).copy()
+        operators = [self._mutate_value, self._mutate_size, self._permute, self._duplicate]
+        for _ in range(self.rng.randint(1, 3)):
+            self.rng.choice(operators)(parsed)
+        return parsed.render()
+
+    def _boundary_value(self, current: int) -> int:
+        low = self.value_min if self.value_min is not None else current
+        high = self.value_max if self.value_max is not None else current
+        candidates = [low, high, low + 1, high - 1, current + 1, current - 1, self.rng.randint(low, high)]
+        # 10의 거듭제곱 경계 (오버플로우/자릿수 변화 유발)
+        if high > 10:
+            power = 10 ** int(math.log10(high))
+            candidates.extend([power, power - 1])
+        return min(max(self.rng.choice(candidates), low), high)
+
+    def _mutate_value(self, parsed: ParsedInput) -> None:
+        positions = parsed.value_positions()
+        if not positions:
+            return
+        i, j = self.rng.choice(positions)
+        parsed.lines[i][j] = str(self._boundary_value(int(parsed.lines[i][j])))
+
+    def _mutate_size(self, parsed: ParsedInput) -> None:
+        elements = list(parsed.elements())
+        if not elements:
+            return
+        if self.allow_duplicates and len(elements) < self.max_count and self.rng.random() < 0.5:
+            # 원소를 복제해 관찰된 최대 개수까지 늘림
+            target = self.rng.randint(len(elements) + 1, self.max_count)
+            while len(elements) < target:
+                element = self.rng.choice(elements)
+                copied = list(element) if isinstance(element, list) else element
+                elements.insert(self.rng.randrange(len(elements) + 1), copied)
+        elif len(elements) > 1:
+            # 원소를 제거해 크기를 줄임 (1개, 2개 같은 경계 크기 우선)
+            target = self.rng.choice([1, 2, self.rng.randint(1, len(elements) - 1)])
+            target = min(target, len(elements) - 1)
+            keep = sorted(self.rng.sample(range(len(elements)), target))
+            elements = [elements[k] for k in keep]
+        else:
+            return
+        parsed.set_elements(elements)
+
+    def _permute(self, parsed: ParsedInput) -> None:
+        if not self.allow_permutation:
+            return
+        candidates = [line for line in parsed.lines if len(line) > 1]
+        if parsed.count_link and parsed.count_link[1] == "lines" and len(parsed.lines) > 2 and self.rng.random() < 0.5:
+            body = parsed.lines[1:]
+            self.rng.shuffle(body)
+            parsed.lines[1:] = body
+        elif candidates:
+            line = self.rng.choice(candidates)
+            if self.rng.random() < 0.5:
+                self.rng.shuffle(line)
+            else:
+                line.sort(key=lambda t: int(t) if _is_int(t) else 0, reverse=self.rng.random() < 0.5)
+
+    def _duplicate(self, parsed: ParsedInput) -> None:
+        if not self.allow_duplicates:
+            return
+        positions = parsed.value_positions()
+        if len(positions) < 2:
+            return
+        (si, sj), (ti, tj) = self.rng.sample(positions, 2)
+        if self.rng.random() < 0.3:
+            # 한 줄 전체를 같은 값으로 채움
+            value = parsed.lines[si][sj]
+            for i, j in positions:
+                if i == ti:
+                    parsed.lines[i][j] = value
+        else:
+            parsed.lines[ti][tj] = parsed.lines[si][sj]
+
+
+def behaviour_signature(user_result: dict, correct_result: dict, same: Optional[bool] = None) -> str:
+    """실행 결과를 거친 단위의 '행동'으로 요약 (새로운 행동을 만드는 입력인지 판단용)
+
+    same: 이미 비교한 출력 일치 여부 (없으면 토큰 단위로 직접 비교)
+    """
+
+    def summarize(result: dict) -> str:
+        output = result.get("output", "") or ""
+        tokens = output.split()
+        first = tokens[0] if tokens else ""
+        # 숫자는 자릿수로, 짧은 문자열(YES/NO/-1 등)은 그대로
+        head = f"d{len(first)}" if first.isdigit() else first[:16]
+        size = int(math.log2(len(output) + 1))
+        return f"{'E' if result.get('error') else 'O'}:{len(tokens)}:{size}:{head}"
+
+    if same is None:
+        same = (user_result.get("output", "") or "").split() == (correct_result.get("output", "") or "").split()
+    return f"{summarize(user_result)}|{summarize(correct_result)}|{int(same)}"
@@ -0,0 +1,100 @@
+"""제출 코드 정규화 (주석/공백/변수 이름만 다른 재제출을 같은 코드로 보기 위함)
+
+Python은 AST로 바꿔 문서 문자열을 빼고, 직접 정의한 이름을 나타난 순서대로 v0, v1, ...로 바꾼다.
+(내장 함수, import한 이름, 키워드 인자 이름, 속성 이름은 동작에 영향을 주므로 그대로 둔다)
+그 밖의 언어(와 문법 오류가 있는 Python)는 문자열 리터럴을 보존한 채 주석을 지우고 토큰 사이 공백을 하나로 줄인다.
+"""
+import re
+import ast
+import hashlib
+import builtins
+
+_PYTHON_LANGUAGES = ("python", "python3", "pypy", "pypy3")
+
+_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+_C_COMMENT_PATTERN = re.compile(rf'({_STRING})|//[^\n]*|/\*[\s\S]*?\*/')
+_HASH_COMMENT_PATTERN = re.compile(rf'({_STRING})|#[^\n]*')
+_TOKEN_PATTERN = re.compile(rf'{_STRING}|\w+|\S')
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+class _Canonicalizer(ast.NodeTransformer):
+    def __init__(self, keep: set):
+        self.keep = keep
+        self.names: dict = {}
+
+    def _rename(self, name: str) -> str:
+        if name in self.keep or name.startswith("__"):
+            return name
+        return self.names.setdefault(name, f"v{len(self.names)}")
+
+    def visit_Expr(self, node: ast.Expr):
+        # 문서 문자열과 주석 대신 쓴 문자열 문장은 실행 결과와 무관
+        if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            return None
+        return self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        node.id = self._rename(node.id)
+        return node
+
+    def visit_arg(self, node: ast.arg):
+        node.arg = self._rename(node.arg)
+        node.annotation = None
+        return node
+
+    def _visit_definition(self, node):
+        node.name = self._rename(node.name)
+        if hasattr(node, "returns"):
+            node.returns = None
+        return self.generic_visit(node)
+
+    visit_FunctionDef = _visit_definition
+    visit_AsyncFunctionDef = _visit_definition
+    visit_ClassDef = _visit_definition
+
+    def visit_Global(self, node: ast.Global):
+        node.names = [self._rename(name) for name in node.names]
+        return node
+
+    visit_Nonlocal = visit_Global
+
+
+def _imported_names(tree: ast.AST) -> set:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.split(".")[0])
+    return names
+
+
+def _normalize_python(code: str) -> str:
+    tree = ast.parse(code)
+    tree = _Canonicalizer(set(_BUILTIN_NAMES) | _imported_names(tree)).visit(tree)
+    return ast.dump(tree, annotate_fields=False, include_attributes=False)
+
+
+def _normalize_text(code: str, comment_pattern: re.Pattern) -> str:
+    without_comments = comment_pattern.sub(lambda m: m.group(1) or " ", code)
+    return " ".join(_TOKEN_PATTERN.findall(without_comments))
+
+
+def normalize_code(code: str, language: str) -> str:
+    """동작이 같은 사소한 수정(주석, 공백, Python 변수 이름)에 대해 같은 문자열"""
+    if language in _PYTHON_LANGUAGES:
+        try:
+            return "ast:" + _normalize_python(code)
+        except (SyntaxError, ValueError, RecursionError):
+            # 들여쓰기가 의미를 가지므로 줄 구분과 들여쓰기 폭은 남김
+            lines = (
+                (len(line) - len(line.lstrip()), _normalize_text(line, _HASH_COMMENT_PATTERN))
+                for line in code.expandtabs(4).splitlines()
+            )
+            return "text:" + "\n".join(f"{indent}:{tokens}" for indent, tokens in lines if tokens)
+    return "text:" + _normalize_text(code, _C_COMMENT_PATTERN)
+
+
+def normalized_code_hash(code: str, language: str) -> str:
+    return hashlib.sha256(normalize_code(code, language).encode("utf-8")).hexdigest()
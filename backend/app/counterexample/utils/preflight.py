@@ -0,0 +1,96 @@
+import re
+import logging
+from typing import Callable, Dict, Optional
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+
+# 다른 언어로 작성된 코드의 흔적 (LLM이 요청과 다른 언어의 코드 블록을 돌려주는 경우)
+_C_FAMILY_PATTERN = re.compile(r"^\s*#include\s*[<\"]|\bint\s+main\s*\(|\bstd::|\bpublic\s+static\s+void\s+main\b", re.MULTILINE)
+_PYTHON_PATTERN = re.compile(r"^\s*def\s+\w+\s*\(.*\)\s*(->.*)?:\s*$|^\s*(from\s+[\w.]+\s+)?import\s+[\w., ]+$|^\s*print\(", re.MULTILINE)
+_MAIN_PATTERN = re.compile(r"\bmain\s*\(")
+_JAVA_MAIN_PATTERN = re.compile(r"\bclass\s+Main\b")
+# console.log(...); 같은 JavaScript 코드는 Python 문법으로도 통과하므로 따로 구분
+_JAVASCRIPT_PATTERN = re.compile(r"\bconsole\.log\s*\(|\brequire\s*\(\s*['\"]|^\s*(const|let|var)\s+\w+\s*=|=>", re.MULTILINE)
+
+# 로컬에서 검사할 수 없어 code-runner의 syntax_only 실행으로 컴파일러 검사를 하는 언어
+REMOTE_SYNTAX_CHECK_LANGUAGES = ("c", "cpp", "java")
+
+
+def _check_python(code: str) -> Optional[str]:
+    if _C_FAMILY_PATTERN.search(code):
+        return "wrong language: expected Python, got C/C++/Java code"
+    try:
+        compile(code, "<solution>", "exec")
+    except SyntaxError as e:
+        return f"SyntaxError: {e.msg} (line {e.lineno})"
+    except ValueError as e:  # 널 문자 등
+        return f"SyntaxError: {e}"
+    return None
+
+
+def _check_c_family(code: str) -> Optional[str]:
+    if _PYTHON_PATTERN.search(code) and ";" not in code:
+        return "wrong language: expected C/C++, got Python code"
+    if not _MAIN_PATTERN.search(code):
+        return "no main function"
+    return None
+
+
+def _check_java(code: str) -> Optional[str]:
+    # 백준/code-runner 모두 Main.java로 컴파일하므로 public class 이름은 Main이어야 함
+    if not _JAVA_MAIN_PATTERN.search(code):
+        return "no class Main"
+    return None
+
+
+_LOCAL_CHECKS: Dict[str, Callable[[str], Optional[str]]] = {
+    "python": _check_python,
+    "c": _check_c_family,
+    "cpp": _check_c_family,
+    "java": _check_java,
+}
+
+
+def local_preflight(code: str, language: str) -> Optional[str]:
+    """실행 없이 로컬에서 할 수 있는 검사 (빈 코드, 언어 혼동, Python 문법). 통과하면 None"""
+    if not code.strip():
+        return "empty code"
+    check = _LOCAL_CHECKS.get(language)
+    return check(code) if check else None
+
+
+# 언어가 기록되지 않은 코드의 언어를 추정할 때 시도하는 순서 (Java의 main(도 C 계열의 main 검사를 통과하므로 Java 먼저)
+_DETECTION_ORDER = ("java", "python", "cpp")
+
+
+def detect_language(code: str) -> Optional[str]:
+    """로컬 검사를 통과하는 첫 언어 (어느 것도 통과하지 못하면 None)"""
+    if _JAVASCRIPT_PATTERN.search(code) and not _C_FAMILY_PATTERN.search(code):
+        return "javascript"
+    for language in _DETECTION_ORDER:
+        if language == "java" and not _JAVA_MAIN_PATTERN.search(code):
+            continue
+        if local_preflight(code, language) is None:
+            return language
+    return None
+
+
+async def preflight(code: str, language: str, code_runner: Optional[CodeRunnerClient] = None) -> Optional[str]:
+    """LLM이 만든 코드를 백준 제출/반복 실행 전에 검사하고, 실패 이유(없으면 None)를 반환
+
+    C/C++/Java는 로컬 검사를 통과하면 code-runner에서 컴파일러 문법 검사(-fsyntax-only 등)를 한 번 더 한다.
+    code-runner 연결 오류 등 검사 자체가 실패한 경우는 통과로 간주한다 (실제 실행에서 다시 드러남).
+    """
+    error = local_preflight(code, language)
+    if error or language not in REMOTE_SYNTAX_CHECK_LANGUAGES:
+        return error
+
+    if code_runner is None:
+        async with CodeRunnerClient() as client:
+            result = await client.check_syntax(code, language)
+    else:
+        result = await code_runner.check_syntax(code, language)
+    if result.get("verdict") == "CE":
+        return f"compile error: {(result.get('error') or '').strip()[:500]}"
+    if result.get("verdict") != "OK":
+        logging.warning(f"Syntax check unavailable ({language}): {result.get('error')}")
+    return None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import re
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+from app.config import PROMPT_MAX_SAMPLES, PROMPT_SAMPLE_MAX_LINES, PROMPT_SAMPLE_MAX_CHARS, PROMPT_MAX_TOKENS
+from app.counterexample.utils.markdown import extract_samples
+
+_SECTION_PATTERN = re.compile(r"^##[ \t]+(?!#)", re.MULTILINE)
+_LIMITS_TABLE_PATTERN = re.compile(r"^\|시간 제한\|메모리 제한\|\n\|[-|]+\|\n\|[^\n]*\|\n*", re.MULTILINE)
+_SAMPLE_HEADING_PATTERN = re.compile(r"^#{3,}[ \t]*예제[ \t]*(입력|출력)[^\n]*\n[\s\S]*?(?=^#|\Z)", re.MULTILINE)
+_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+
+class PromptProfile(TypedDict):
+    keep_limits: bool       # 시간/메모리 제한 표
+    keep_output: bool       # 출력 형식 섹션
+    max_samples: int
+    sample_outputs: bool    # 예제 출력 포함 여부 (생성기는 입력 형식만 알면 됨)
+
+
+# 프롬프트 종류별로 남길 부분
+PROMPT_PROFILES: Dict[str, PromptProfile] = {
+    "solve": {"keep_limits": True, "keep_output": True, "max_samples": PROMPT_MAX_SAMPLES, "sample_outputs": True},
+    "input_gen": {"keep_limits": False, "keep_output": False, "max_samples": PROMPT_MAX_SAMPLES, "sample_outputs": False},
+    "stress": {"keep_limits": True, "keep_output": False, "max_samples": 1, "sample_outputs": False},
+}
+
+
+@lru_cache(maxsize=1)
+def _encoder() -> Optional[Callable[[str], List[int]]]:
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base").encode
+    except Exception as e:  # 미설치 또는 인코딩 파일을 받을 수 없는 환경
+        logging.info(f"tiktoken unavailable, estimating prompt tokens: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """프롬프트 토큰 수 (tiktoken을 쓸 수 없으면 ASCII 4자당 1개, 그 외 문자 1자당 1개로 추정)"""
+    encode = _encoder()
+    if encode:
+        return len(encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def _truncate_sample(text: str) -> str:
+    text = text.strip()
+    lines = text.split("\n")
+    if len(lines) > PROMPT_SAMPLE_MAX_LINES:
+        text = "\n".join(lines[:PROMPT_SAMPLE_MAX_LINES]) + f"\n... ({len(lines) - PROMPT_SAMPLE_MAX_LINES} lines omitted)"
+    if len(text) > PROMPT_SAMPLE_MAX_CHARS:
+        text = text[:PROMPT_SAMPLE_MAX_CHARS] + " ... (truncated)"
+    return text
+
+
+def _format_samples(samples: List[Tuple[str, str]], profile: PromptProfile) -> str:
+    samples = samples[:profile["max_samples"]]
+    if not samples:
+        return ""
+    result = "## 예제 입력/출력\n\n" if profile["sample_outputs"] else "## 예제 입력\n\n"
+    for i, (sample_input, sample_output) in enumerate(samples):
+        result += f"### 예제 {i + 1}\n\n**입력:**\n```\n{_truncate_sample(sample_input)}\n```\n\n"
+        if profile["sample_outputs"]:
+            result += f"**출력:**\n```\n{_truncate_sample(sample_output)}\n```\n\n"
+    return result
+
+
+def compact_problem(markdown_text: str, purpose: str) -> str:
+    """문제 마크다운에서 프롬프트 종류(solve/input_gen/stress)에 필요 없는 부분을 빼고 예제 크기를 제한
+
+    예제는 개수와 줄/글자 수를 자르고, 그래도 PROMPT_MAX_TOKENS를 넘으면 예제를 모두 뺀다.
+    문제 설명/입력/제약 섹션은 정답에 필요하므로 자르지 않는다.
+    원문은 상태에 그대로 남으므로 예제 실행(rank_candidates) 등에는 영향이 없다.
+    """
+    profile = PROMPT_PROFILES[purpose]
+    samples = extract_samples(markdown_text)
+
+    parts = _SECTION_PATTERN.split(markdown_text)
+    head, sections = parts[0], parts[1:]
+    if not profile["keep_limits"]:
+        head = _LIMITS_TABLE_PATTERN.sub("", head)
+    kept = []
+    for section in sections:
+        heading = section.split("\n", 1)[0]
+        if "예제" in heading and samples:
+            continue  # 아래에서 다시 만듦 (파싱에 실패했다면 원문 유지)
+        if heading.strip() == "출력" and not profile["keep_output"]:
+            continue
+        if samples:
+            section = _SAMPLE_HEADING_PATTERN.sub("", section)
+        kept.append("## " + section)
+    body = head + "".join(kept)
+
+    result = body + _format_samples(samples, profile)
+    if PROMPT_MAX_TOKENS and count_tokens(result) > PROMPT_MAX_TOKENS:
+        result = body
+    return _BLANK_LINES_PATTERN.sub("\n\n", result).strip() + "\n"
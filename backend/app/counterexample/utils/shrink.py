@@ -0,0 +1,52 @@
+from __future__ import annotations
+import math
+from typing import List, Optional
+
+from app.counterexample.utils.mutator import ParsedInput
+
+# 한 단계에서 값 축소를 시도할 최대 토큰 수 (큰 값부터)
+MAX_VALUE_CANDIDATES = 16
+# 원소 제거 시 최대 분할 수 (큰 입력에서 후보 생성 비용 제한)
+MAX_GRANULARITY = 64
+
+
+def input_size(text: str) -> tuple[int, int]:
+    """축소 정도 비교용 크기 (토큰 수, 문자 수)"""
+    return len(text.split()), len(text)
+
+
+def shrink_candidates(text: str, granularity: int, value_floor: Optional[int] = None) -> List[str]:
+    """반례 입력을 구조를 유지한 채 줄인 후보 목록 (작은 것부터)
+
+    - 원소 제거: 개수(N) 토큰과 연결된 원소들을 granularity 등분하여 한 조각씩 제거 (ddmin)
+    - 값 축소: 정수 토큰을 value_floor, 절반, 1 감소한 값으로 교체
+    """
+    parsed = ParsedInput(text)
+    candidates: List[str] = []
+
+    elements = parsed.elements()
+    if len(elements) > 1:
+        chunk = math.ceil(len(elements) / min(granularity, MAX_GRANULARITY, len(elements)))
+        for start in range(0, len(elements), chunk):
+            remaining = elements[:start] + elements[start + chunk:]
+            if not remaining:
+                continue
+            reduced = parsed.copy()
+            reduced.set_elements(remaining)
+            candidates.append(reduced.render())
+
+    positions = parsed.value_positions()
+    positions.sort(key=lambda p: abs(int(parsed.lines[p[0]][p[1]])), reverse=True)
+    for i, j in positions[:MAX_VALUE_CANDIDATES]:
+        value = int(parsed.lines[i][j])
+        floor = value_floor if value_floor is not None else min(value, 0)
+        for smaller in (floor, (value + floor) // 2, value - 1):
+            if floor <= smaller < value:
+                reduced = parsed.copy()
+                reduced.lines[i][j] = str(smaller)
+                candidates.append(reduced.render())
+
+    normalized = text.strip() + "\n"
+    unique = list(dict.fromkeys(c for c in candidates if c != normalized))
+    unique.sort(key=input_size)
+    return unique
@@ -0,0 +1,182 @@
+import time
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypedDict
+from langchain_core.runnables import RunnableConfig
+from opentelemetry import trace
+
+# OpenTelemetry SDK/exporter가 설정되지 않았다면 no-op
+tracer = trace.get_tracer("app.counterexample")
+
+# 노드 안에서 외부 호출별로 모으는 횟수/시간
+CALL_KINDS = ("llm", "code_runner", "boj")
+
+
+class NodeTrace(TypedDict):
+    """노드 한 번 실행의 통계 (스트림의 trace와 span 속성으로만 내보내고 상태에는 누적값만 저장)"""
+    node: str
+    attempt: int            # 이번 실행에서 같은 노드가 실행된 순번 (1부터, 2 이상이면 재시도)
+    difficulty: int
+    started_at: float       # time.time() 기준
+    ended_at: float
+    duration_ms: float
+    llm_calls: int
+    llm_ms: float
+    llm_input_tokens: int
+    llm_output_tokens: int
+    code_runner_calls: int
+    code_runner_ms: float
+    boj_calls: int
+    boj_ms: float
+    error: Optional[str]
+
+
+class NodeStats(TypedDict, total=False):
+    """노드별 누적 통계 (노드 이름마다 한 항목이라 실행 횟수와 무관하게 크기가 일정)
+
+    runs와 시간/호출 수는 합산하고, 나머지(attempt, started_at, error 등)는 마지막 실행 값.
+    """
+    runs: int
+    duration_ms: float
+    llm_calls: int
+    llm_ms: float
+    llm_input_tokens: int
+    llm_output_tokens: int
+    code_runner_calls: int
+    code_runner_ms: float
+    boj_calls: int
+    boj_ms: float
+    attempt: int
+    difficulty: int
+    started_at: float
+    ended_at: float
+    error: Optional[str]
+
+
+_SUMMED_KEYS = frozenset(
+    ["runs", "duration_ms", "llm_input_tokens", "llm_output_tokens"]
+    + [f"{kind}_{suffix}" for kind in CALL_KINDS for suffix in ("calls", "ms")]
+)
+
+
+def merge_search_elapsed(left: Optional[float], right: Optional[float]) -> float:
+    """search_elapsed_seconds 리듀서: 병렬 노드는 같은 누적값에서 시작하므로 큰 값(가장 오래 걸린 갈래)을 남김"""
+    return max(left or 0.0, right or 0.0)
+
+
+def merge_node_stats(
+    left: Optional[Dict[str, NodeStats]],
+    right: Optional[Dict[str, NodeStats]],
+) -> Dict[str, NodeStats]:
+    """node_stats 리듀서 (병렬 노드의 갱신도 노드 이름별로 합산)"""
+    merged: Dict[str, NodeStats] = {name: dict(stats) for name, stats in (left or {}).items()}  # type: ignore[misc]
+    for name, stats in (right or {}).items():
+        current = merged.setdefault(name, {})
+        for key, value in stats.items():
+            if key in _SUMMED_KEYS:
+                total = (current.get(key) or 0) + (value or 0)
+                current[key] = round(total, 1) if isinstance(total, float) else total
+            else:
+                current[key] = value
+    return merged
+
+
+_current_metrics: ContextVar[Optional[Dict[str, Any]]] = ContextVar("counterexample_node_metrics", default=None)
+
+
+def _new_metrics() -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {"llm_input_tokens": 0, "llm_output_tokens": 0}
+    for kind in CALL_KINDS:
+        metrics[f"{kind}_calls"] = 0
+        metrics[f"{kind}_ms"] = 0.0
+    return metrics
+
+
+@contextmanager
+def measure_call(kind: str) -> Iterator[None]:
+    """실행 중인 노드에 외부 호출(llm/code_runner/boj) 한 번의 소요 시간을 기록 (노드 밖에서는 무시)"""
+    metrics = _current_metrics.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics[f"{kind}_calls"] += 1
+            metrics[f"{kind}_ms"] += (time.perf_counter() - started) * 1000
+
+
+def record_llm_tokens(input_tokens: int, output_tokens: int) -> None:
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics["llm_input_tokens"] += input_tokens or 0
+        metrics["llm_output_tokens"] += output_tokens or 0
+
+
+def traced_node(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """노드 실행 시간과 외부 호출 통계를 node_stats에 누적하고 trace span으로 내보내는 래퍼
+
+    실행마다의 상세(NodeTrace)는 span과 스트림의 trace로만 내보내므로 체크포인트 크기가 실행 횟수에 비례해 늘지 않는다.
+    탐색 시간(search_elapsed_seconds)도 노드 실행 시간으로 누적한다. 노드에는 시작 시각(node_started_at)을 더한
+    상태를 넘겨 실행 중에도 경과 시간을 알 수 있게 하고, 체크포인트에는 누적값만 남기므로
+    중단 후 재개할 때 멈춰 있던 시간은 예산에 포함되지 않는다.
+    """
+    accepts_config = "config" in inspect.signature(func).parameters
+
+    async def node(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        attempt = 1 + (state.get("node_stats") or {}).get(name, {}).get("runs", 0)
+        metrics = _new_metrics()
+        token = _current_metrics.set(metrics)
+        started_at = time.time()
+        started = time.perf_counter()
+        error: Optional[str] = None
+        run_id = (config or {}).get("configurable", {}).get("thread_id")
+        node_state = {**state, "node_started_at": started_at}
+        with tracer.start_as_current_span(f"counterexample.{name}") as span:
+            try:
+                result = func(node_state, config) if accepts_config else func(node_state)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as e:
+                error = str(e)
+                span.record_exception(e)
+                raise
+            finally:
+                _current_metrics.reset(token)
+                node_trace: NodeTrace = {
+                    "node": name,
+                    "attempt": attempt,
+                    "difficulty": state.get("difficulty", 0),
+                    "started_at": started_at,
+                    "ended_at": time.time(),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                    **{key: round(value, 1) if isinstance(value, float) else value for key, value in metrics.items()},
+                    "error": error,
+                }
+                span.set_attributes({
+                    f"counterexample.{key}": value
+                    for key, value in node_trace.items()
+                    if value is not None and key not in ("started_at", "ended_at")
+                })
+                span.set_attribute("counterexample.problem_id", state.get("problem_id", 0))
+                if run_id:
+                    span.set_attribute("counterexample.run_id", run_id)
+        stats: NodeStats = {"runs": 1, **{k: v for k, v in node_trace.items() if k != "node"}}
+        search_elapsed = (state.get("search_elapsed_seconds") or 0.0) + (time.perf_counter() - started)
+        return {**(result or {}), "node_stats": {name: stats}, "search_elapsed_seconds": round(search_elapsed, 3)}
+
+    node.__name__ = getattr(func, "__name__", name)
+    return node
+
+
+def node_trace_from_stats(name: str, stats: NodeStats) -> NodeTrace:
+    """노드가 반환한 한 번 실행분 node_stats를 스트림용 NodeTrace로"""
+    return {"node": name, **{k: v for k, v in stats.items() if k != "runs"}}  # type: ignore[return-value]
+
+
+def summarize_node_stats(node_stats: Optional[Dict[str, NodeStats]]) -> Dict[str, Dict[str, float]]:
+    """노드별 누적 시간/호출 수 (단계별 지연 분석용)"""
+    return {
+        name: {key: stats.get(key, 0) or 0 for key in ("runs", "duration_ms", *_new_metrics())}
+        for name, stats in (node_stats or {}).items()
+    }
@@ -1,7 +1,7 @@
 import httpx
 import asyncio
 from bs4 import BeautifulSoup, Tag
-from typing import Optional
+from typing import List, Optional
 
 from .crawler_schema import ProblemData, ProblemTag, SolvedAcData, FullProblemInfo, TestCase
 
@@ -9,6 +9,8 @@ from .crawler_schema import ProblemData, ProblemTag, SolvedAcData, FullProblemIn
 class AcmicpcCrawler:
     BASE_URL = "https://www.acmicpc.net/problem/{problem_id}"
     SOLVED_AC_URL = "https://solved.ac/api/v3/problem/show"
+    SOLVED_AC_SEARCH_URL = "https://solved.ac/api/v3/search/problem"
+    SOLVED_AC_PAGE_SIZE = 50
 
     async def fetch_problem(self, problem_id: int) -> Optional[ProblemData]:
         """
@@ -42,6 +44,11 @@ class AcmicpcCrawler:
         limit_h2 = soup.find("h2", string="제한")
         constraints = str(limit_h2.find_next_sibling("div")) if limit_h2 and isinstance(limit_h2.find_next_sibling("div"), Tag) else ""
         
+        # 시간/메모리 제한 (문제 정보 테이블의 첫 두 칸)
+        info_cells = soup.select("#problem-info tbody tr td")
+        time_limit = info_cells[0].get_text(strip=True) if len(info_cells) > 0 else ""
+        memory_limit = info_cells[1].get_text(strip=True) if len(info_cells) > 1 else ""
+
         # 예제 입출력 추출
         example_input_elements = soup.select('[id^=sample-input]')
         example_input = [tag.text for tag in example_input_elements]
@@ -56,6 +63,8 @@ class AcmicpcCrawler:
             constraints=constraints,
             input_description=input_desc,
             output_description=output_desc,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
             test_cases=example_test_cases
         )
     
@@ -84,6 +93,32 @@ class AcmicpcCrawler:
             tags=[ProblemTag(**tag) for tag in data.get("tags", [])]
         )
     
+    async def fetch_popular_problem_ids(self, count: int, query: str = "") -> List[int]:
+        """
+        Solved.ac 검색 API로 맞힌 사람이 많은 순서대로 문제 번호를 가져옵니다.
+        query는 solved.ac 검색 문법을 그대로 사용합니다 (예: "tier:s1..g5").
+        """
+        problem_ids: List[int] = []
+        headers = {
+            "x-solvedac-language": "ko"
+        }
+        async with httpx.AsyncClient(follow_redirects=True, headers=headers) as client:
+            page = 1
+            while len(problem_ids) < count:
+                params = {"query": query, "sort": "solved", "direction": "desc", "page": page}
+                try:
+                    response = await client.get(self.SOLVED_AC_SEARCH_URL, params=params)
+                    response.raise_for_status()
+                except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                    print(f"Error searching Solved.ac problems (page {page}): {e}")
+                    break
+                items = response.json().get("items", [])
+                problem_ids.extend(item["problemId"] for item in items if "problemId" in item)
+                if len(items) < self.SOLVED_AC_PAGE_SIZE:
+                    break
+                page += 1
+        return problem_ids[:count]
+
     async def fetch_full_problem(self, problem_id: int) -> Optional[FullProblemInfo]:
         acmicpc_data, solved_ac_data = await asyncio.gather(
             self.fetch_problem(problem_id),
@@ -15,6 +15,8 @@ class ProblemData(BaseModel):
     constraints: str = Field(..., description="제한사항 HTML")
     input_description: str = Field(..., description="입력 설명 HTML")
     output_description: str = Field(..., description="출력 설명 HTML")
+    time_limit: str = Field("", description="시간 제한 (예: '1 초')")
+    memory_limit: str = Field("", description="메모리 제한 (예: '256 MB')")
     test_cases: List[TestCase] = Field(default_factory=list, description="테스트 케이스 목록")
 
 
@@ -1,5 +1,8 @@
+from sqlalchemy import inspect, text
 from database.mysql_connection import engine, Base
+from app.config import REFERENCE_LANGUAGES
 from app.models.user_model import UserModel
+from app.counterexample.utils.preflight import detect_language
 
 
 def init_database():
@@ -9,11 +12,70 @@ def init_database():
     try:
         # 모든 모델의 테이블을 생성
         Base.metadata.create_all(bind=engine)
+        _migrate_solved_problems()
         print("✅ Database tables created successfully!")
     except Exception as e:
         print(f"❌ Error creating database tables: {e}")
         raise e
 
 
+def _migrate_solved_problems():
+    """문제당 한 행이던 solved_problems를 버전별 참조 해답 행으로 바꾸고, 입력 생성기는 input_generators로 복사
+
+    이전 행은 사용자 언어로 만들어졌지만 언어가 기록되지 않았으므로 코드로 언어를 추정해 채우고,
+    추정할 수 없거나 참조 해답 언어가 아닌 행은 retired로 바꿔 다음 요청에서 다시 만들게 한다.
+    input_generator 열은 남겨 두지만 더 이상 읽지 않는다.
+    """
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("solved_problems")}
+    if "id" in columns:
+        return
+    indexes = {index["name"] for index in inspector.get_indexes("solved_problems")}
+    detect_languages = "solution_language" not in columns
+    statements = []
+    if detect_languages:
+        statements.append(
+            "ALTER TABLE solved_problems ADD COLUMN solution_language VARCHAR(20) NOT NULL DEFAULT 'python'"
+        )
+    statements += [
+        "ALTER TABLE solved_problems DROP PRIMARY KEY, "
+        "ADD COLUMN id INT NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST, "
+        "ADD COLUMN version INT NOT NULL DEFAULT 1, "
+        "ADD COLUMN code_hash VARCHAR(64) NULL, "
+        "ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'validated', "
+        "ADD COLUMN runs INT NOT NULL DEFAULT 0, "
+        "ADD COLUMN total_time_ms DOUBLE NOT NULL DEFAULT 0, "
+        "MODIFY input_generator TEXT NULL",
+        "UPDATE solved_problems SET code_hash = SHA2(solution_code, 256)",
+        "ALTER TABLE solved_problems MODIFY code_hash VARCHAR(64) NOT NULL, "
+        "ADD CONSTRAINT uq_solved_problems_code UNIQUE (problem_id, code_hash)",
+        "INSERT IGNORE INTO input_generators "
+        "(problem_id, version, generator_language, code, code_hash, status, rounds, cases_run, counterexamples_found, created_at) "
+        "SELECT problem_id, 1, 'python', input_generator, SHA2(input_generator, 256), 'active', 0, 0, 0, submitted_at "
+        "FROM solved_problems WHERE input_generator IS NOT NULL AND input_generator <> ''",
+    ]
+    if "ix_solved_problems_problem_id" not in indexes:
+        statements.append("CREATE INDEX ix_solved_problems_problem_id ON solved_problems (problem_id)")
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+        if detect_languages:
+            _detect_solution_languages(conn)
+    print("✅ Migrated solved_problems to versioned reference solutions and input generators")
+
+
+def _detect_solution_languages(conn) -> None:
+    rows = conn.execute(text("SELECT id, solution_code FROM solved_problems")).all()
+    for row_id, solution_code in rows:
+        language = detect_language(solution_code or "")
+        if language in REFERENCE_LANGUAGES:
+            conn.execute(
+                text("UPDATE solved_problems SET solution_language = :language WHERE id = :id"),
+                {"language": language, "id": row_id},
+            )
+        else:
+            conn.execute(text("UPDATE solved_problems SET status = 'retired' WHERE id = :id"), {"id": row_id})
+
+
 if __name__ == "__main__":
     init_database()
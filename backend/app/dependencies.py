@@ -9,6 +9,8 @@ from app.problem.problem_service import SolvedProblemService
 from app.problem.problem_repository import SolvedProblemRepository
 from app.crawler.acmicpc_crawler import AcmicpcCrawler
 from app.counterexample.runner import CounterexampleRunner, runner
+from app.problem.solution_singleflight import SolutionSingleFlight, solution_singleflight
+from app.job.job_manager import JobManager, job_manager
 from app.user.user_schema import UserDB
 from app.auth import get_current_user_email
 
@@ -33,6 +35,14 @@ def get_counterexample_runner() -> CounterexampleRunner:
     return runner
 
 
+def get_solution_singleflight() -> SolutionSingleFlight:
+    return solution_singleflight
+
+
+def get_job_manager() -> JobManager:
+    return job_manager
+
+
 def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
     """
     FastAPI에서 사용할 UserRepository 객체를 의존성 주입으로 제공
@@ -58,12 +68,13 @@ def get_solved_problem_repository(db: Session = Depends(get_db)) -> SolvedProble
 def get_solved_problem_service(
     repo: SolvedProblemRepository = Depends(get_solved_problem_repository),
     crawler: AcmicpcCrawler = Depends(get_crawler),
-    counterexample_runner: CounterexampleRunner = Depends(get_counterexample_runner)
+    counterexample_runner: CounterexampleRunner = Depends(get_counterexample_runner),
+    singleflight: SolutionSingleFlight = Depends(get_solution_singleflight),
 ) -> SolvedProblemService:
     """
     FastAPI에서 사용할 SolvedProblemService 객체를 의존성 주입으로 제공
     """
-    return SolvedProblemService(repo, crawler, counterexample_runner)
+    return SolvedProblemService(repo, crawler, counterexample_runner, singleflight)
 
 
 def get_current_user(
@@ -0,0 +1,32 @@
+import asyncio
+from database.mysql_connection import SessionLocal
+from app.job.job_manager import JobFunc
+from app.problem.problem_repository import SolvedProblemRepository
+from app.problem.problem_schema import CalcCounterExampleRequest, CalcCounterExampleResponse
+from app.problem.problem_service import SolvedProblemService
+from app.crawler.acmicpc_crawler import AcmicpcCrawler
+from app.counterexample.runner import runner
+from app.problem.solution_singleflight import solution_singleflight
+
+
+def counterexample_job(problem_id: int, request: CalcCounterExampleRequest) -> JobFunc:
+    """반례 탐색 작업 본문
+
+    요청이 끝나면 요청 범위의 DB 세션이 닫히므로, 작업마다 세션과 서비스를 따로 만든다.
+    """
+    async def run(cancel_event: asyncio.Event) -> CalcCounterExampleResponse:
+        db = SessionLocal()
+        try:
+            service = SolvedProblemService(
+                SolvedProblemRepository(db), AcmicpcCrawler(), runner, solution_singleflight
+            )
+            return await service.calc_counter_example(
+                problem_id,
+                request.user_code,
+                request.user_code_language,
+                request.stress_mode,
+                cancel_event=cancel_event,
+            )
+        finally:
+            db.close()
+    return run
@@ -0,0 +1,189 @@
+import math
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.config import (
+    JOB_MAX_CONCURRENCY,
+    JOB_MAX_CONCURRENCY_PER_USER,
+    JOB_MAX_QUEUED_PER_USER,
+    JOB_RESULT_TTL_SECONDS,
+)
+from app.job.job_schema import JobStatus, JobStatusResponse
+
+# 취소 이벤트를 받아 결과를 반환하는 작업 본문
+JobFunc = Callable[[asyncio.Event], Awaitable[Any]]
+
+# 평균 소요 시간 지수 이동 평균 가중치
+DURATION_EMA_ALPHA = 0.2
+
+
+class JobQueueFullError(Exception):
+    """사용자별 대기 작업 수 초과"""
+
+
+class JobCancelledError(Exception):
+    """기다리던 작업이 취소됨"""
+
+
+class Job:
+    def __init__(self, user_id: int, problem_id: int, func: JobFunc):
+        self.job_id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.problem_id = problem_id
+        self.func = func
+        self.status: JobStatus = "queued"
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+        self.cancel_event = asyncio.Event()
+        self.finished = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+
+class JobManager:
+    """반례 탐색 작업 풀
+
+    전체 동시 실행 수와 사용자별 동시 실행 수를 제한하고, 나머지는 제출 순서대로 대기시킨다.
+    대기 중인 작업 중 사용자별 제한에 걸리지 않는 가장 오래된 작업부터 실행한다.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = JOB_MAX_CONCURRENCY,
+        max_per_user: int = JOB_MAX_CONCURRENCY_PER_USER,
+        max_queued_per_user: int = JOB_MAX_QUEUED_PER_USER,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_user = max_per_user
+        self.max_queued_per_user = max_queued_per_user
+        self._jobs: Dict[str, Job] = {}
+        self._queue: List[Job] = []
+        self._running: Dict[int, int] = {}  # user_id → 실행 중인 작업 수
+        self._running_total = 0
+        self._avg_duration: Optional[float] = None
+
+    def submit(self, user_id: int, problem_id: int, func: JobFunc) -> Job:
+        queued = sum(1 for job in self._queue if job.user_id == user_id)
+        if queued >= self.max_queued_per_user:
+            raise JobQueueFullError(f"Too many queued jobs (max {self.max_queued_per_user})")
+        job = Job(user_id, problem_id, func)
+        self._jobs[job.job_id] = job
+        self._queue.append(job)
+        self._dispatch()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job: Job) -> bool:
+        """대기 중이면 바로 취소, 실행 중이면 취소 이벤트를 설정 (노드가 멈춘 뒤 cancelled로 전환)"""
+        if job.finished.is_set():
+            return False
+        job.cancel_event.set()
+        if job in self._queue:
+            self._queue.remove(job)
+            self._finish(job, "cancelled")
+        elif job.task:
+            job.task.cancel()
+        return True
+
+    async def wait(self, job: Job) -> Any:
+        """작업이 끝날 때까지 기다린 뒤 결과 반환 (실패하면 예외를 그대로 발생)"""
+        await job.finished.wait()
+        if job.status == "cancelled":
+            raise JobCancelledError(f"Job {job.job_id} was cancelled")
+        if job.exception is not None:
+            raise job.exception
+        return job.result
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        if job.status != "queued" or job not in self._queue:
+            return None
+        return self._queue.index(job) + 1
+
+    def estimated_wait_seconds(self, job: Job) -> Optional[float]:
+        """앞선 작업들이 전체 동시 실행 수만큼씩 평균 소요 시간에 끝난다고 가정한 추정치"""
+        position = self.queue_position(job)
+        if position is None or self._avg_duration is None:
+            return None
+        waves = math.ceil(position / max(self.max_concurrency, 1))
+        return round(waves * self._avg_duration, 1)
+
+    def to_response(self, job: Job) -> JobStatusResponse:
+        return JobStatusResponse(
+            job_id=job.job_id,
+            problem_id=job.problem_id,
+            status=job.status,
+            queue_position=self.queue_position(job),
+            estimated_wait_seconds=self.estimated_wait_seconds(job),
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            error=str(job.exception) if job.exception is not None else None,
+        )
+
+    async def shutdown(self) -> None:
+        """애플리케이션 종료 시 대기/실행 중인 작업 모두 취소"""
+        for job in list(self._queue) + [job for job in self._jobs.values() if job.status == "running"]:
+            self.cancel(job)
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        while self._running_total < self.max_concurrency:
+            job = next(
+                (job for job in self._queue if self._running.get(job.user_id, 0) < self.max_per_user),
+                None,
+            )
+            if job is None:
+                return
+            self._queue.remove(job)
+            self._running[job.user_id] = self._running.get(job.user_id, 0) + 1
+            self._running_total += 1
+            job.status = "running"
+            job.started_at = datetime.now()
+            job.task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: Job) -> None:
+        status: JobStatus = "succeeded"
+        try:
+            job.result = await job.func(job.cancel_event)
+        except asyncio.CancelledError:
+            status = "cancelled"
+        except Exception as e:
+            logging.exception(f"Job {job.job_id} failed")
+            job.exception = e
+            status = "failed"
+        if job.cancel_event.is_set():
+            status = "cancelled"
+
+        self._running[job.user_id] -= 1
+        if not self._running[job.user_id]:
+            del self._running[job.user_id]
+        self._running_total -= 1
+
+        if status == "succeeded" and job.started_at:
+            duration = (datetime.now() - job.started_at).total_seconds()
+            self._avg_duration = duration if self._avg_duration is None else (
+                DURATION_EMA_ALPHA * duration + (1 - DURATION_EMA_ALPHA) * self._avg_duration
+            )
+        self._finish(job, status)
+        self._dispatch()
+
+    def _finish(self, job: Job, status: JobStatus) -> None:
+        job.status = status
+        job.finished_at = datetime.now()
+        job.finished.set()
+        # 끝난 작업은 결과 조회를 위해 잠시 보관
+        asyncio.get_running_loop().call_later(
+            JOB_RESULT_TTL_SECONDS, self._jobs.pop, job.job_id, None
+        )
+
+
+# 글로벌 인스턴스
+job_manager = JobManager()
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.dependencies import get_current_user, get_job_manager
+from app.job.counterexample_job import counterexample_job
+from app.job.job_manager import Job, JobManager, JobQueueFullError
+from app.job.job_schema import CounterexampleJobRequest, JobStatusResponse
+from app.problem.problem_schema import CalcCounterExampleResponse
+from app.user.user_schema import UserDB
+
+router = APIRouter(prefix="/jobs", tags=["job"])
+
+
+def _get_own_job(job_id: str, current_user: UserDB, manager: JobManager) -> Job:
+    job = manager.get(job_id)
+    # 다른 사용자의 작업은 존재 여부도 알려주지 않음
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.post("/counterexample", response_model=JobStatusResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_counterexample_job(
+    request: CounterexampleJobRequest,
+    current_user: UserDB = Depends(get_current_user),
+    manager: JobManager = Depends(get_job_manager),
+):
+    try:
+        job = manager.submit(current_user.id, request.problem_id, counterexample_job(request.problem_id, request))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    return manager.to_response(job)
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    current_user: UserDB = Depends(get_current_user),
+    manager: JobManager = Depends(get_job_manager),
+):
+    return manager.to_response(_get_own_job(job_id, current_user, manager))
+
+
+@router.get("/{job_id}/result", response_model=CalcCounterExampleResponse)
+async def get_job_result(
+    job_id: str,
+    current_user: UserDB = Depends(get_current_user),
+    manager: JobManager = Depends(get_job_manager),
+):
+    job = _get_own_job(job_id, current_user, manager)
+    if job.status in ("queued", "running"):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="작업이 아직 끝나지 않았습니다.")
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"작업이 {job.status} 상태로 끝났습니다: {job.exception}" if job.exception else f"작업이 {job.status} 상태로 끝났습니다.",
+        )
+    return job.result
+
+
+@router.post("/{job_id}/cancel", response_model=JobStatusResponse)
+async def cancel_job(
+    job_id: str,
+    current_user: UserDB = Depends(get_current_user),
+    manager: JobManager = Depends(get_job_manager),
+):
+    job = _get_own_job(job_id, current_user, manager)
+    manager.cancel(job)
+    return manager.to_response(job)
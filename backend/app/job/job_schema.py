@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from datetime import datetime
+from app.problem.problem_schema import CalcCounterExampleRequest
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class CounterexampleJobRequest(CalcCounterExampleRequest):
+    problem_id: int = Field(..., description="백준 문제 번호")
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    problem_id: int
+    status: JobStatus
+    queue_position: Optional[int] = Field(None, description="대기 순번 (1부터, 대기 중일 때만)")
+    estimated_wait_seconds: Optional[float] = Field(None, description="최근 작업 소요 시간으로 추정한 시작까지 대기 시간")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
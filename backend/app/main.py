@@ -6,8 +6,11 @@ from app.user.user_router import user
 from app.problem.problem_router import router as solved_problem_router
 from app.crawler.crawler_router import router as crawler_router
 from app.websocket.websocket_router import router as websocket_router
+from app.job.job_router import router as job_router
 from app.config import PORT
 from app.database_init import init_database
+from app.counterexample.tools.chat_client import close_chat_clients
+from app.dependencies import get_counterexample_runner, get_job_manager
 
 app = FastAPI()
 
@@ -23,6 +26,7 @@ app.include_router(user)
 app.include_router(solved_problem_router)
 app.include_router(crawler_router)
 app.include_router(websocket_router)
+app.include_router(job_router)
 
 @app.get("/")
 def root():
@@ -35,6 +39,16 @@ async def startup_event():
     """
     print("🚀 Starting BaekjoonHelper Backend...")
     init_database()
+    await get_counterexample_runner().enable_checkpointing()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    애플리케이션 종료 시 남은 작업 취소, 공유 LLM HTTP 클라이언트와 체크포인트 DB 연결 정리
+    """
+    await get_job_manager().shutdown()
+    await close_chat_clients()
+    await get_counterexample_runner().close()
 
 if __name__=="__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=PORT, reload=True)
\ No newline at end of file
@@ -1,5 +1,9 @@
 from .user_model import UserModel
 from .solved_problem_model import SolvedProblemModel
 from .problem_metadata_model import ProblemMetadataModel
+from .llm_cache_model import LlmCacheModel
+from .solve_attempt_model import SolveAttemptModel
+from .input_generator_model import InputGeneratorModel
+from .counterexample_cache_model import CounterexampleCacheModel
 
-__all__ = ["UserModel", "SolvedProblemModel", "ProblemMetadataModel"]
+__all__ = ["UserModel", "SolvedProblemModel", "ProblemMetadataModel", "LlmCacheModel", "SolveAttemptModel", "InputGeneratorModel", "CounterexampleCacheModel"]
@@ -0,0 +1,22 @@
+from sqlalchemy import Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from sqlalchemy.orm import mapped_column, Mapped
+from database.mysql_connection import Base
+
+
+class CounterexampleCacheModel(Base):
+    """
+    반례 결과 캐시 - (문제, 언어, 정규화한 제출 코드) 해시를 키로 찾은 반례와 참조 해답의 출력을 저장
+    """
+    __tablename__ = "counterexample_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    problem_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    language: Mapped[str] = mapped_column(String(20), nullable=False)
+    counterexample_input: Mapped[str] = mapped_column(Text, nullable=False)
+    original_counterexample_input: Mapped[str] = mapped_column(Text, nullable=True)
+    correct_output: Mapped[str] = mapped_column(Text, nullable=False)
+    detail: Mapped[str] = mapped_column(Text, nullable=True)  # 입력/출력을 뺀 반례 상세 (JSON)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False, index=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
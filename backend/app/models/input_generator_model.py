@@ -0,0 +1,30 @@
+from sqlalchemy import Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import mapped_column, Mapped
+from database.mysql_connection import Base
+
+
+class InputGeneratorModel(Base):
+    """
+    문제의 입력 생성기 - 버전마다 한 행, 실행한 라운드/케이스 수와 반례를 찾은 라운드 수를 누적 (수율 높은 생성기 선택용)
+    """
+    __tablename__ = "input_generators"
+    __table_args__ = (UniqueConstraint("problem_id", "code_hash", name="uq_input_generators_code"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    problem_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    generator_language: Mapped[str] = mapped_column(String(20), nullable=False, default="python")
+    code: Mapped[str] = mapped_column(Text, nullable=False)
+    code_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="active")  # active / retired / broken
+    rounds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cases_run: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    counterexamples_found: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_used_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def yield_score(self) -> float:
+        """반례를 찾은 라운드 비율 (기록이 적으면 1/2 쪽으로 당겨진 추정치)"""
+        return (self.counterexamples_found + 1) / (self.rounds + 2)
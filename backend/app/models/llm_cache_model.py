@@ -0,0 +1,20 @@
+from sqlalchemy import Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from sqlalchemy.orm import mapped_column, Mapped
+from database.mysql_connection import Base
+
+
+class LlmCacheModel(Base):
+    """
+    LLM 응답 캐시 - (프롬프트 버전, 입력, 모델, reasoning effort) 해시를 키로 원문 응답과 추출된 코드를 저장
+    """
+    __tablename__ = "llm_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=True)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    code: Mapped[str] = mapped_column(Text, nullable=True)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False, index=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,23 @@
+from sqlalchemy import Boolean, Integer, String, DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.orm import mapped_column, Mapped
+from database.mysql_connection import Base
+
+
+class SolveAttemptModel(Base):
+    """
+    해결책 후보 하나의 생성 결과 - 어떤 tier(provider:model:effort)가 얼마나 걸려 백준에서 맞았는지 기록 (tier 라우팅 학습용)
+    """
+    __tablename__ = "solve_attempts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    problem_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    difficulty: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    category: Mapped[str] = mapped_column(String(255), nullable=True)
+    tier: Mapped[str] = mapped_column(String(100), nullable=False)
+    latency_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    verdict: Mapped[str] = mapped_column(String(50), nullable=False)
+    accepted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
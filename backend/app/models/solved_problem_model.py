@@ -1,13 +1,33 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+import hashlib
+from sqlalchemy import Float, Integer, String, Text, DateTime, UniqueConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import mapped_column, Mapped, relationship
+from sqlalchemy.orm import mapped_column, Mapped
 from database.mysql_connection import Base
 
 
+def code_hash(code: str) -> str:
+    """같은 코드의 중복 저장을 막기 위한 키 (MySQL SHA2(code, 256)과 같은 값)"""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
 class SolvedProblemModel(Base):
+    """
+    문제의 검증된 참조 해답 - 버전마다 한 행, 반례 탐색에서 측정한 실행 시간을 누적 (가장 빠른 해답 선택용)
+    """
     __tablename__ = "solved_problems"
+    __table_args__ = (UniqueConstraint("problem_id", "code_hash", name="uq_solved_problems_code"),)
 
-    problem_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    problem_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    solution_language: Mapped[str] = mapped_column(String(20), nullable=False, server_default="python")
     solution_code: Mapped[str] = mapped_column(Text, nullable=False)
-    input_generator: Mapped[str] = mapped_column(Text, nullable=True)
+    code_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="validated")  # validated / retired
+    runs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_time_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0)
     submitted_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def avg_time_ms(self) -> float | None:
+        return self.total_time_ms / self.runs if self.runs else None
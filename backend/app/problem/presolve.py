@@ -0,0 +1,174 @@
+"""인기 문제 사전 풀이 (배치)
+
+사용자 요청 전에 검증된 해결책과 입력 생성기를 만들어 solved_problems에 저장해 두면,
+이후 요청은 LLM 풀이/백준 검증/생성기 작성 없이 run_and_compare부터 시작한다.
+
+    python -m app.problem.presolve 1000 1001 2000-2100
+    python -m app.problem.presolve --top 500 --query "tier:s5..g1"
+    python -m app.problem.presolve --file problem_ids.txt --concurrency 2 --rate 4
+
+진행 상황은 --progress 파일(JSON Lines)에 문제마다 추가되므로, 중단 후 같은 명령을 다시 실행하면
+끝난 문제는 건너뛴다. 실패한 문제는 --retry-failed를 주면 다시 시도한다.
+"""
+import json
+import time
+import asyncio
+import logging
+import argparse
+from typing import Dict, Iterable, List, Optional, Set
+from database.mysql_connection import SessionLocal
+from app.config import PRESOLVE_CONCURRENCY, PRESOLVE_MAX_PER_MINUTE, PRESOLVE_PROGRESS_PATH
+from app.database_init import init_database
+from app.problem.problem_repository import SolvedProblemRepository
+from app.problem.problem_schema import PresolveResult
+from app.problem.problem_service import SolvedProblemService
+from app.problem.solution_singleflight import solution_singleflight
+from app.crawler.acmicpc_crawler import AcmicpcCrawler
+from app.counterexample.runner import runner
+from app.counterexample.tools.chat_client import close_chat_clients
+
+
+class _RateLimiter:
+    """분당 최대 시작 횟수를 넘지 않도록 시작 간격을 벌림 (LLM/백준 제출 속도 제한용)"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60 / per_minute if per_minute > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = time.monotonic() + self.interval
+
+
+def parse_problem_ids(values: Iterable[str]) -> List[int]:
+    """"1000", "1000-1100" 형식의 문제 번호/범위를 순서를 유지한 채 중복 없이 펼침"""
+    problem_ids: List[int] = []
+    for value in values:
+        value = value.split("#", 1)[0].strip()
+        if not value:
+            continue
+        if "-" in value:
+            start, end = (int(part) for part in value.split("-", 1))
+            problem_ids.extend(range(start, end + 1))
+        else:
+            problem_ids.append(int(value))
+    return list(dict.fromkeys(problem_ids))
+
+
+def load_finished(progress_path: str, retry_failed: bool) -> Set[int]:
+    """진행 파일에서 다시 시도할 필요가 없는 문제 번호 (끝난 문제, retry_failed가 아니면 실패한 문제 포함)"""
+    last_status: Dict[int, str] = {}
+    try:
+        with open(progress_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 중단되며 잘린 마지막 줄
+                last_status[record["problem_id"]] = record.get("status", "failed")
+    except FileNotFoundError:
+        pass
+    return {
+        problem_id for problem_id, status in last_status.items()
+        if status != "failed" or not retry_failed
+    }
+
+
+async def presolve_one(problem_id: int) -> PresolveResult:
+    """문제 하나를 사전 풀이 (작업마다 DB 세션과 서비스를 따로 만듦)"""
+    db = SessionLocal()
+    try:
+        service = SolvedProblemService(
+            SolvedProblemRepository(db), AcmicpcCrawler(), runner, solution_singleflight
+        )
+        return await service.presolve_problem(problem_id)
+    except Exception as e:
+        return PresolveResult(problem_id=problem_id, status="failed", error=str(e))
+    finally:
+        db.close()
+
+
+async def presolve(
+    problem_ids: List[int],
+    concurrency: int = PRESOLVE_CONCURRENCY,
+    per_minute: float = PRESOLVE_MAX_PER_MINUTE,
+    progress_path: str = PRESOLVE_PROGRESS_PATH,
+    retry_failed: bool = False,
+) -> List[PresolveResult]:
+    finished = load_finished(progress_path, retry_failed)
+    pending = [problem_id for problem_id in problem_ids if problem_id not in finished]
+    logging.info(f"Presolve: {len(pending)} problems to go ({len(problem_ids) - len(pending)} already done)")
+
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for problem_id in pending:
+        queue.put_nowait(problem_id)
+    limiter = _RateLimiter(per_minute)
+    results: List[PresolveResult] = []
+
+    async def worker() -> None:
+        while True:
+            try:
+                problem_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await limiter.wait()
+            started = time.monotonic()
+            result = await presolve_one(problem_id)
+            results.append(result)
+            # 문제마다 바로 기록해야 중단되어도 다음 실행에서 이어갈 수 있음
+            with open(progress_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    **result.model_dump(exclude={"stats"}),
+                    "elapsed_seconds": round(time.monotonic() - started, 1),
+                    "finished_at": time.time(),
+                }, ensure_ascii=False) + "\n")
+            logging.info(
+                f"Presolve {problem_id}: {result.status}"
+                + (f" ({result.error})" if result.error else "")
+                + f" [{len(results)}/{len(pending)}]"
+            )
+
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return results
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="인기 문제의 해결책/입력 생성기 사전 생성")
+    parser.add_argument("problems", nargs="*", help="문제 번호 또는 범위 (예: 1000 2000-2100)")
+    parser.add_argument("--file", help="한 줄에 하나씩 문제 번호/범위가 적힌 파일")
+    parser.add_argument("--top", type=int, default=0, help="solved.ac에서 맞힌 사람이 많은 순서로 N개")
+    parser.add_argument("--query", default="", help="--top과 함께 쓰는 solved.ac 검색 조건")
+    parser.add_argument("--concurrency", type=int, default=PRESOLVE_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=PRESOLVE_MAX_PER_MINUTE, help="분당 최대 시작 문제 수 (0이면 제한 없음)")
+    parser.add_argument("--progress", default=PRESOLVE_PROGRESS_PATH, help="진행 상황 파일 (JSON Lines)")
+    parser.add_argument("--retry-failed", action="store_true", help="진행 파일에 실패로 기록된 문제도 다시 시도")
+    args = parser.parse_args(argv)
+
+    values = list(args.problems)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            values.extend(f.read().splitlines())
+    problem_ids = parse_problem_ids(values)
+    if args.top:
+        problem_ids = list(dict.fromkeys(
+            problem_ids + await AcmicpcCrawler().fetch_popular_problem_ids(args.top, args.query)
+        ))
+    if not problem_ids:
+        parser.error("no problem ids given")
+
+    init_database()
+    try:
+        results = await presolve(problem_ids, args.concurrency, args.rate, args.progress, args.retry_failed)
+    finally:
+        await close_chat_clients()
+    counts = {status: sum(1 for result in results if result.status == status) for status in ("solved", "exists", "failed")}
+    print(f"Presolve finished: {counts}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
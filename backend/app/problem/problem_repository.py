@@ -1,50 +1,138 @@
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.models.solved_problem_model import SolvedProblemModel
+from typing import List, Optional, Type, TypeVar
+from app.config import REFERENCE_LANGUAGES, INPUT_GENERATOR_LANGUAGE, GENERATOR_POOL_SIZE
+from app.models.solved_problem_model import SolvedProblemModel, code_hash
+from app.models.input_generator_model import InputGeneratorModel
 from app.models.problem_metadata_model import ProblemMetadataModel
-from app.problem.problem_schema import SolvedProblemCreate, ProblemMetadataCreate
+from app.problem.problem_schema import SolvedProblemCreate, ProblemMetadataCreate, PreparedProblem
+
+VersionedModel = TypeVar("VersionedModel", SolvedProblemModel, InputGeneratorModel)
+
+
+def _language_rank(language: str) -> int:
+    if language in REFERENCE_LANGUAGES:
+        return REFERENCE_LANGUAGES.index(language)
+    return len(REFERENCE_LANGUAGES)
 
 
 class SolvedProblemRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _add_version(self, model: Type[VersionedModel], problem_id: int, code: str, **fields) -> VersionedModel:
+        """같은 코드가 이미 있으면 기존 행, 없으면 다음 버전으로 추가 (동시에 추가하면 먼저 들어간 행 사용)"""
+        digest = code_hash(code)
+        existing = self.db.query(model).filter(model.problem_id == problem_id, model.code_hash == digest).first()
+        if existing:
+            return existing
+        version = (self.db.query(func.max(model.version)).filter(model.problem_id == problem_id).scalar() or 0) + 1
+        row = model(problem_id=problem_id, version=version, code_hash=digest, **fields)
+        self.db.add(row)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return self.db.query(model).filter(model.problem_id == problem_id, model.code_hash == digest).one()
+        self.db.refresh(row)
+        return row
+
+    def add_solution(self, problem_id: int, solution_code: str, solution_language: str) -> SolvedProblemModel:
+        return self._add_version(
+            SolvedProblemModel, problem_id, solution_code,
+            solution_code=solution_code, solution_language=solution_language,
+        )
+
+    def add_generator(self, problem_id: int, code: str, language: str = INPUT_GENERATOR_LANGUAGE) -> InputGeneratorModel:
+        return self._add_version(InputGeneratorModel, problem_id, code, code=code, generator_language=language)
+
     def create_solved_problem(self, solved_problem: SolvedProblemCreate) -> SolvedProblemModel:
-        db_solved_problem = SolvedProblemModel(
-            problem_id=solved_problem.problem_id,
-            solution_code=solved_problem.solution_code,
-            input_generator=solved_problem.input_generator
+        """검증된 참조 해답과 입력 생성기를 각각 새 버전으로 저장 (이미 있는 코드는 건너뜀)"""
+        if solved_problem.input_generator:
+            self.add_generator(solved_problem.problem_id, solved_problem.input_generator)
+        return self.add_solution(
+            solved_problem.problem_id, solved_problem.solution_code, solved_problem.solution_language
         )
-        self.db.add(db_solved_problem)
-        self.db.commit()
-        self.db.refresh(db_solved_problem)
-        return db_solved_problem
 
-    def get_problem_solution(self, problem_id: int) -> Optional[SolvedProblemModel]:
-        return self.db.query(SolvedProblemModel).filter(
-            SolvedProblemModel.problem_id == problem_id
-        ).first()
+    def get_problem_solutions(self, problem_id: int) -> List[SolvedProblemModel]:
+        """검증된 참조 해답을 빠른 순서로 (아직 측정하지 않은 해답은 언어 우선순위대로 먼저 시도해 측정)"""
+        rows = self.db.query(SolvedProblemModel).filter(
+            SolvedProblemModel.problem_id == problem_id,
+            SolvedProblemModel.status == "validated",
+        ).all()
+        return sorted(rows, key=lambda row: (
+            (0, _language_rank(row.solution_language), -row.version) if row.avg_time_ms is None
+            else (1, row.avg_time_ms, 0)
+        ))
 
-    def update_solved_problem(self, problem_id: int, solved_problem: SolvedProblemCreate) -> Optional[SolvedProblemModel]:
-        db_solved_problem = self.get_problem_solution(problem_id)
-        if not db_solved_problem:
-            return None
+    def get_problem_solution(self, problem_id: int, language: Optional[str] = None) -> Optional[SolvedProblemModel]:
+        """가장 빠른 참조 해답 (language가 있으면 그 언어 중에서)"""
+        solutions = [
+            row for row in self.get_problem_solutions(problem_id)
+            if language is None or row.solution_language == language
+        ]
+        return solutions[0] if solutions else None
+
+    def get_latest_problem_solution(self, problem_id: int, language: Optional[str] = None) -> Optional[SolvedProblemModel]:
+        """다른 요청/워커가 방금 저장한 행도 보이도록 현재 트랜잭션을 끝내고 다시 조회"""
+        self.db.rollback()
+        return self.get_problem_solution(problem_id, language)
 
-        db_solved_problem.solution_code = solved_problem.solution_code
-        db_solved_problem.input_generator = solved_problem.input_generator
+    def get_generators(self, problem_id: int) -> List[InputGeneratorModel]:
+        """사용 중인 입력 생성기를 수율 높은 순서로"""
+        rows = self.db.query(InputGeneratorModel).filter(
+            InputGeneratorModel.problem_id == problem_id,
+            InputGeneratorModel.status == "active",
+        ).all()
+        return sorted(rows, key=lambda row: (-row.yield_score, -row.version))
 
+    def pick_generator(self, problem_id: int) -> Optional[InputGeneratorModel]:
+        """수율 상위 GENERATOR_POOL_SIZE개 중 가장 오래전에 쓴 생성기 (라운드 로빈)"""
+        pool = self.get_generators(problem_id)[:max(GENERATOR_POOL_SIZE, 1)]
+        if not pool:
+            return None
+        return min(pool, key=lambda row: row.last_used_at or datetime.min)
+
+    def mark_generator_used(self, generator_id: int) -> None:
+        self.db.query(InputGeneratorModel).filter(InputGeneratorModel.id == generator_id).update(
+            {InputGeneratorModel.last_used_at: func.now()}
+        )
         self.db.commit()
-        self.db.refresh(db_solved_problem)
-        return db_solved_problem
 
-    def delete_solved_problem(self, problem_id: int) -> bool:
-        db_solved_problem = self.get_problem_solution(problem_id)
-        if not db_solved_problem:
-            return False
+    def get_prepared_problem(self, problem_id: int, require_generator: bool = True,
+                             language: Optional[str] = None) -> Optional[PreparedProblem]:
+        """가장 빠른 참조 해답과 라운드 로빈으로 고른 입력 생성기 (둘 중 필요한 것이 없으면 None)
+
+        language가 있으면 그 언어의 참조 해답을 우선한다 (스트레스 모드의 실행 시간 배수 비교용).
+        """
+        solution = (self.get_problem_solution(problem_id, language) if language else None) \
+            or self.get_problem_solution(problem_id)
+        if not solution:
+            return None
+        generator = self.pick_generator(problem_id)
+        if not generator and require_generator:
+            return None
+        return PreparedProblem(
+            problem_id=problem_id,
+            solution_id=solution.id,
+            solution_code=solution.solution_code,
+            solution_language=solution.solution_language,
+            generator_id=generator.id if generator else None,
+            input_generator=generator.code if generator else None,
+        )
 
-        self.db.delete(db_solved_problem)
+    def get_latest_prepared_problem(self, problem_id: int, require_generator: bool = True) -> Optional[PreparedProblem]:
+        self.db.rollback()
+        return self.get_prepared_problem(problem_id, require_generator)
+
+    def delete_solved_problem(self, problem_id: int) -> bool:
+        """문제의 모든 버전의 참조 해답과 입력 생성기 삭제"""
+        deleted = self.db.query(SolvedProblemModel).filter(SolvedProblemModel.problem_id == problem_id).delete()
+        deleted += self.db.query(InputGeneratorModel).filter(InputGeneratorModel.problem_id == problem_id).delete()
         self.db.commit()
-        return True
+        return deleted > 0
 
     def create_problem_metadata(self, problem_metadata: ProblemMetadataCreate) -> ProblemMetadataModel:
         db_problem_metadata = ProblemMetadataModel(
@@ -1,7 +1,10 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.dependencies import get_solved_problem_service, get_current_user
+from app.dependencies import get_solved_problem_service, get_current_user, get_job_manager
+from app.job.counterexample_job import counterexample_job
+from app.job.job_manager import JobManager, JobCancelledError, JobQueueFullError
 from app.problem.problem_service import SolvedProblemService
 from app.problem.problem_schema import (
     SolvedProblemCreate,
@@ -20,11 +23,21 @@ async def get_user_problem_solution(
     problem_id: int,
     request: CalcCounterExampleRequest,
     current_user: UserDB = Depends(get_current_user),
-    service: SolvedProblemService = Depends(get_solved_problem_service)
+    manager: JobManager = Depends(get_job_manager)
 ):
-    solution = await service.calc_counter_example(problem_id, 
-                                            request.user_code, 
-                                            request.user_code_language)
+    """작업 풀에서 실행하고 끝날 때까지 기다림 (오래 걸리는 경우 /jobs/counterexample 사용 권장)"""
+    try:
+        job = manager.submit(current_user.id, problem_id, counterexample_job(problem_id, request))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    try:
+        solution = await manager.wait(job)
+    except asyncio.CancelledError:
+        # 클라이언트가 연결을 끊으면 작업도 취소
+        manager.cancel(job)
+        raise
+    except JobCancelledError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if not solution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,31 +1,52 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 
 class SolvedProblemCreate(BaseModel):
     problem_id: int = Field(..., description="백준 문제 번호")
     solution_code: str = Field(..., description="해결 코드")
+    solution_language: str = Field("python", description="해결 코드 언어")
     input_generator: str = Field(..., description="입력 생성기")
 
 
 class SolvedProblemResponse(BaseModel):
+    id: int
     problem_id: int
+    version: int
     solution_code: str
-    input_generator: Optional[str]
+    solution_language: str
+    status: str
+    runs: int
+    avg_time_ms: Optional[float]
     submitted_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class PreparedProblem(BaseModel):
+    """반례 탐색에 쓸 참조 해답(가장 빠른 것)과 입력 생성기(수율 상위에서 돌아가며 선택)"""
+    problem_id: int
+    solution_id: int
+    solution_code: str
+    solution_language: str
+    generator_id: Optional[int] = None
+    input_generator: Optional[str] = None
+
+
 class CalcCounterExampleRequest(BaseModel):
     user_code: str = Field(..., description="유저 코드")
     user_code_language: str = Field(..., description="유저 코드 언어")
+    stress_mode: bool = Field(False, description="오답 대신 시간/메모리 초과(TLE/MLE) 반례 탐색 여부")
 
 
 class CalcCounterExampleResponse(BaseModel):
-    counter_example_input: str = Field(..., description="반례")
+    counter_example_found: bool = Field(True, description="반례 발견 여부")
+    counter_example_input: Optional[str] = Field(None, description="반례 (최소화된 입력)")
+    original_counter_example_input: Optional[str] = Field(None, description="최소화 이전의 원래 반례")
+    counter_example_detail: Optional[dict] = Field(None, description="반례 상세 (출력 비교 또는 실행 시간/메모리 측정값)")
+    stats: dict = Field(default_factory=dict, description="탐색 통계 (소요 시간, LLM 호출 수, 실행 수 등)")
 
 
 class ProblemMetadataCreate(BaseModel):
@@ -46,3 +67,11 @@ class ProblemMetadataResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PresolveResult(BaseModel):
+    """사전 풀이 한 문제의 결과"""
+    problem_id: int
+    status: Literal["exists", "solved", "failed"] = Field(..., description="이미 있음 / 새로 저장 / 실패")
+    error: Optional[str] = None
+    stats: Optional[dict] = None
@@ -1,77 +1,223 @@
-from typing import Optional
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Optional
 from bs4 import BeautifulSoup
+from app.config import REFERENCE_LANGUAGES
 from markdownify import markdownify as md
 from app.problem.problem_repository import SolvedProblemRepository
 from app.problem.problem_schema import (
     CalcCounterExampleResponse,
     ProblemMetadataCreate,
     ProblemMetadataResponse,
+    PresolveResult,
     SolvedProblemCreate
 )
 from app.crawler.crawler_schema import FullProblemInfo
 from app.crawler.acmicpc_crawler import AcmicpcCrawler
-from app.counterexample.runner import CounterexampleRunner, CounterexampleSuccess
+from app.counterexample.runner import CounterexampleRunner, CounterexampleSuccess, PreparedCallback
+from app.counterexample.tools.result_cache import lookup_result, store_result
+from app.counterexample.utils.limits import parse_problem_limits
+from app.problem.solution_singleflight import SolutionSingleFlight, SolutionLease
 
 
 class SolvedProblemService:
     def __init__(self, 
                  repository: SolvedProblemRepository, 
                  crawler: AcmicpcCrawler,
-                 counterexample_runner: CounterexampleRunner):
+                 counterexample_runner: CounterexampleRunner,
+                 solution_singleflight: SolutionSingleFlight):
         self.repository = repository
         self.crawler = crawler
         self.counterexample_runner = counterexample_runner
+        self.solution_singleflight = solution_singleflight
 
-    async def calc_counter_example(self, problem_id: int, user_code: str, user_code_language: str) -> CalcCounterExampleResponse:
-        metadata = await self.get_problem_metadata(problem_id)
-        solution = self.repository.get_problem_solution(problem_id)
-        counter_example = await self.counterexample_runner.find_counterexample(
+    async def acquire_problem_solution(self, problem_id: int, stress_mode: bool = False, on_wait=None,
+                                       language: Optional[str] = None):
+        """저장된 해결책을 가져오거나, 없으면 만들 권한(lease)을 얻음
+
+        해결책이 없는 문제에 요청이 몰리면 하나만 해결책/입력 생성기를 만들고 나머지는 저장될 때까지 기다린다.
+        스트레스 모드는 입력 생성기를 만들지 않아 저장할 것이 없으므로 조정하지 않는다.
+        저장된 참조 해답 중 가장 빠른 것과, 수율 높은 입력 생성기 중 이번 차례인 것을 쓴다.
+        스트레스 모드는 실행 시간을 사용자 코드와 비교할 수 있도록 사용자 언어(language)의 참조 해답을 우선한다.
+        """
+        if stress_mode:
+            return self.repository.get_prepared_problem(problem_id, require_generator=False, language=language), None
+        prepared, lease = await self.solution_singleflight.acquire(
             problem_id,
-            metadata.description,
-            user_code, 
-            user_code_language,
-            metadata.difficulty,
-            solution.solution_code if solution else None,
-            solution.input_generator if solution else None,
-            True if solution else False
+            lambda: self.repository.get_latest_prepared_problem(problem_id),
+            on_wait,
+        )
+        if prepared and prepared.generator_id is not None:
+            self.repository.mark_generator_used(prepared.generator_id)
+        return prepared, lease
+
+    def save_prepared_solution(self, problem_id: int, lease: Optional[SolutionLease] = None) -> PreparedCallback:
+        """검증된 해결책과 입력 생성기가 준비되는 즉시 저장하고 기다리는 요청들을 깨우는 콜백
+
+        체크포인트에서 재개한 실행은 lease 없이 저장만 한다. 참조 해답과 입력 생성기는 각각 새 버전으로 추가된다.
+        """
+        async def save(solution_code: str, input_generator: str, solution_language: str) -> None:
+            try:
+                self.repository.create_solved_problem(SolvedProblemCreate(
+                    problem_id=problem_id,
+                    solution_code=solution_code,
+                    solution_language=solution_language,
+                    input_generator=input_generator,
+                ))
+            finally:
+                if lease:
+                    await lease.release()
+        return save
+
+    async def find_cached_counterexample(self, problem_id: int, user_code: str, language: str,
+                                         problem_description: str) -> Optional[CalcCounterExampleResponse]:
+        """같은 코드(주석/공백/변수 이름 차이 무시)로 찾은 반례가 이번 코드에서도 틀리면 탐색 없이 바로 응답"""
+        cached = await lookup_result(problem_id, language, user_code, problem_description)
+        if not cached:
+            return None
+        return CalcCounterExampleResponse(
+            counter_example_input=cached["counterexample_input"],
+            original_counter_example_input=cached["original_counterexample_input"],
+            counter_example_detail=cached["counterexample_detail"],
+            stats=cached["stats"],
         )
+
+    async def cache_streamed_result(self, problem_id: int, user_code: str, language: str,
+                                    events: AsyncGenerator[Dict[str, Any], None]) -> AsyncGenerator[Dict[str, Any], None]:
+        """스트림 이벤트를 그대로 넘기면서 반례를 찾은 finish 이벤트의 결과를 캐시에 저장
+
+        finish 이후에는 스트림이 바로 닫히므로 이벤트를 넘기기 전에 저장한다.
+        """
+        try:
+            async for event in events:
+                if event.get("type") == "finish" and event.get("counterexample_found"):
+                    await store_result(
+                        problem_id, language, user_code,
+                        event.get("counterexample_input"),
+                        event.get("original_counterexample_input"),
+                        event.get("counterexample_detail"),
+                    )
+                yield event
+        finally:
+            # 실행 중단 시 원래 스트림의 정리(체크포인트/취소 처리)가 바로 돌도록 같이 닫음
+            await events.aclose()
+
+    async def calc_counter_example(self, problem_id: int, user_code: str, user_code_language: str,
+                                   stress_mode: bool = False,
+                                   cancel_event: Optional[asyncio.Event] = None) -> CalcCounterExampleResponse:
+        metadata = await self.get_problem_metadata(problem_id, refresh_limits=stress_mode)
+        # 성능 반례는 캐시하지 않으므로 오답 탐색만 조회
+        if not stress_mode:
+            cached = await self.find_cached_counterexample(problem_id, user_code, user_code_language, metadata.description)
+            if cached:
+                return cached
+        solution, lease = await self.acquire_problem_solution(problem_id, stress_mode, language=user_code_language)
+        try:
+            counter_example = await self.counterexample_runner.find_counterexample(
+                problem_id,
+                metadata.description,
+                user_code, 
+                user_code_language,
+                metadata.difficulty,
+                solution.solution_code if solution else None,
+                solution.input_generator if solution else None,
+                True if solution else False,
+                stress_mode=stress_mode,
+                on_prepared=self.save_prepared_solution(problem_id, lease) if lease else None,
+                cancel_event=cancel_event,
+                category=metadata.category,
+                solution_language=solution.solution_language if solution else None,
+            )
+        finally:
+            # 해결책을 만들지 못하고 끝난 경우에도 기다리는 요청이 이어받을 수 있도록 해제
+            if lease:
+                await lease.release()
         if not isinstance(counter_example, CounterexampleSuccess):
             raise ValueError("Failed to find counterexample")
-        if not solution:
-            solved_problem = SolvedProblemCreate(
-                problem_id=problem_id,
-                solution_code=counter_example.correct_solution,
-                input_generator=counter_example.input_generator
+        if not counter_example.counterexample_found:
+            # 예산 내에 반례를 찾지 못한 경우 (정답 코드일 가능성이 높음)
+            return CalcCounterExampleResponse(
+                counter_example_found=False,
+                stats=counter_example.stats,
             )
-            self.repository.create_solved_problem(solved_problem)
         if not counter_example.counterexample_input:
             raise ValueError("Counterexample input is missing")
+        if not stress_mode:
+            await store_result(
+                problem_id, user_code_language, user_code,
+                counter_example.counterexample_input,
+                counter_example.original_counterexample_input,
+                counter_example.counterexample_detail,
+            )
         return CalcCounterExampleResponse(
             counter_example_input=counter_example.counterexample_input,
+            original_counter_example_input=counter_example.original_counterexample_input,
+            counter_example_detail=counter_example.counterexample_detail,
+            stats=counter_example.stats,
         )
 
-    async def get_problem_metadata(self, problem_id: int) -> ProblemMetadataResponse:
+    async def presolve_problem(self, problem_id: int, cancel_event: Optional[asyncio.Event] = None) -> PresolveResult:
+        """사용자 요청 전에 검증된 해결책과 입력 생성기를 만들어 solved_problems에 저장
+
+        이미 저장된 문제는 건너뛰고, 다른 요청이 만드는 중이면 single-flight로 기다린다.
+        가장 우선하는 언어가 아닌 참조 해답만 있으면 저장된 입력 생성기를 그대로 쓰고 해결책만 추가한다.
+        이후 사용자 요청은 저장된 해결책으로 run_and_compare부터 시작한다.
+        """
+        metadata = await self.get_problem_metadata(problem_id)
+        solution, lease = await self.acquire_problem_solution(problem_id)
+        if solution and self.repository.get_problem_solution(problem_id, REFERENCE_LANGUAGES[0]):
+            return PresolveResult(problem_id=problem_id, status="exists")
+        try:
+            result = await self.counterexample_runner.prepare_solution(
+                problem_id,
+                metadata.description,
+                difficulty=metadata.difficulty,
+                category=metadata.category,
+                on_prepared=self.save_prepared_solution(problem_id, lease),
+                cancel_event=cancel_event,
+                input_generator=solution.input_generator if solution else None,
+            )
+        finally:
+            if lease:
+                await lease.release()
+        if not isinstance(result, CounterexampleSuccess):
+            return PresolveResult(problem_id=problem_id, status="failed", error=result.error, stats=result.stats)
+        return PresolveResult(problem_id=problem_id, status="solved", stats=result.stats)
+
+    async def get_problem_metadata(self, problem_id: int, refresh_limits: bool = False) -> ProblemMetadataResponse:
+        """저장된 문제 정보 (없으면 크롤링해서 저장)
+
+        refresh_limits면 제한 표가 없던 시절에 저장되어 시간/메모리 제한을 읽을 수 없는 문제를
+        다시 크롤링해 갱신한다 (스트레스 모드의 제한 판정용, 크롤링에 실패하면 기존 정보 사용).
+        """
         metadata = self.repository.get_problem_metadata(problem_id)
         if not metadata:
             data = await self.crawler.fetch_full_problem(problem_id)
             if not data:
                 raise ValueError("Failed to fetch problem metadata")
-            
-            category = ','.join(
-                tag.displayNames[0].name
-                for tag in data.tags
-                if tag.displayNames and len(tag.displayNames) > 0
-            )
-            problem_metadata = ProblemMetadataCreate(
-                problem_id=problem_id,
-                title=data.title,
-                description=self._get_problem_markdown(data),
-                category=category,
-                difficulty=data.level
-            )
-            metadata = self.repository.create_problem_metadata(problem_metadata)
+            metadata = self.repository.create_problem_metadata(self._build_problem_metadata(problem_id, data))
+        elif refresh_limits and parse_problem_limits(metadata.description)["time_limit_seconds"] is None:
+            data = await self.crawler.fetch_full_problem(problem_id)
+            if data and (data.time_limit or data.memory_limit):
+                metadata = self.repository.update_problem_metadata(
+                    problem_id, self._build_problem_metadata(problem_id, data)
+                ) or metadata
         return ProblemMetadataResponse.model_validate(metadata)
 
+    @classmethod
+    def _build_problem_metadata(cls, problem_id: int, data: FullProblemInfo) -> ProblemMetadataCreate:
+        category = ','.join(
+            tag.displayNames[0].name
+            for tag in data.tags
+            if tag.displayNames and len(tag.displayNames) > 0
+        )
+        return ProblemMetadataCreate(
+            problem_id=problem_id,
+            title=data.title,
+            description=cls._get_problem_markdown(data),
+            category=category,
+            difficulty=data.level
+        )
+
     @staticmethod
     def _get_problem_markdown(problem_info: FullProblemInfo):
         title = md(problem_info.title, strip=['img'])
@@ -80,8 +226,14 @@ class SolvedProblemService:
         output_description = md(problem_info.output_description, strip=['img'])
         constraints = md(problem_info.constraints, strip=['img'])
 
-        result = (
-            f"# {title}\n\n"
+        result = f"# {title}\n\n"
+        if problem_info.time_limit or problem_info.memory_limit:
+            result += (
+                "|시간 제한|메모리 제한|\n"
+                "|-------|----------|\n"
+                f"|{problem_info.time_limit}|{problem_info.memory_limit}|\n\n"
+            )
+        result += (
             f"## 문제 \n\n{description}\n\n"
             f"## 입력\n\n{input_description}\n\n"
             f"## 출력\n\n{output_description}\n\n"
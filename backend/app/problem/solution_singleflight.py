@@ -0,0 +1,153 @@
+import time
+import uuid
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import redis.asyncio as redis
+from app.config import (
+    REDIS_URL,
+    SINGLEFLIGHT_LOCK_TTL_SECONDS,
+    SINGLEFLIGHT_WAIT_SECONDS,
+    SINGLEFLIGHT_POLL_SECONDS,
+)
+
+T = TypeVar("T")
+
+LOCK_KEY_PREFIX = "singleflight:solution:"
+
+# 자신이 잡은 락일 때만 삭제 (TTL이 지나 다른 워커가 잡은 락을 지우지 않도록)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SolutionLease:
+    """문제의 해결책/입력 생성기를 만들 책임 (리더). 저장 후 또는 실패 시 반드시 release 해야 함"""
+
+    def __init__(
+        self,
+        owner: "SolutionSingleFlight",
+        problem_id: int,
+        token: Optional[str],
+        event: Optional[asyncio.Event],
+    ):
+        self.owner = owner
+        self.problem_id = problem_id
+        self.token = token  # None이면 Redis 락 없이 진행 (대기 시간 초과 또는 Redis 장애)
+        self.event = event  # 같은 프로세스에서 기다리는 요청을 깨우는 이벤트 (대기 시간 초과 시 None)
+        self.released = False
+
+    async def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        await self.owner._release(self)
+
+
+class SolutionSingleFlight:
+    """problem_id별 single-flight 조정
+
+    해결책이 없는 문제에 요청이 몰리면 하나(리더)만 solve/boj_submit/generate_inputs를 수행하고,
+    나머지는 리더가 DB에 저장할 때까지 기다린 뒤 저장된 해결책으로 run_and_compare부터 시작한다.
+    같은 프로세스 안에서는 asyncio.Event로, 워커 사이에서는 Redis 락으로 조정한다.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._local: Dict[int, asyncio.Event] = {}
+
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    async def acquire(
+        self,
+        problem_id: int,
+        load: Callable[[], Optional[T]],
+        on_wait: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> Tuple[Optional[T], Optional[SolutionLease]]:
+        """저장된 해결책을 읽거나(다른 요청이 만드는 중이면 기다림), 직접 만들 리더 권한을 얻음
+
+        Args:
+            load: 저장된 해결책 조회 (없으면 None). 기다린 뒤 다시 호출됨
+            on_wait: 처음 기다리기 시작할 때 한 번 호출 (진행 상황 알림용)
+
+        Returns:
+            (저장된 값, None) 또는 (None, 리더 lease)
+        """
+        deadline = time.monotonic() + SINGLEFLIGHT_WAIT_SECONDS
+        waited = False
+        while True:
+            value = load()
+            if value is not None:
+                return value, None
+
+            local_event = self._local.get(problem_id)
+            if local_event is None:
+                token = await self._try_lock(problem_id)
+                if token is not None:
+                    event = asyncio.Event()
+                    self._local[problem_id] = event
+                    return None, SolutionLease(self, problem_id, token or None, event)
+                waiter = self._wait_remote(problem_id)
+            else:
+                waiter = local_event.wait()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                waiter.close()
+                # 리더가 너무 오래 걸리면 기다리지 않고 직접 만듦
+                logging.warning(f"Single-flight wait timed out for problem {problem_id}")
+                return None, SolutionLease(self, problem_id, None, None)
+            logging.info(f"Waiting for another request to prepare problem {problem_id}")
+            if on_wait and not waited:
+                await on_wait()
+            waited = True
+            try:
+                await asyncio.wait_for(waiter, timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _try_lock(self, problem_id: int) -> Optional[str]:
+        """락을 잡으면 토큰, 다른 워커가 잡고 있으면 None. Redis 장애 시 ""(프로세스 내 조정만)"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._client().set(
+                LOCK_KEY_PREFIX + str(problem_id), token,
+                nx=True, ex=SINGLEFLIGHT_LOCK_TTL_SECONDS,
+            )
+        except redis.RedisError as e:
+            logging.warning(f"Redis lock unavailable, coordinating in-process only: {e}")
+            return ""
+        return token if acquired else None
+
+    async def _wait_remote(self, problem_id: int) -> None:
+        """다른 워커의 락이 풀릴 때까지 대기"""
+        key = LOCK_KEY_PREFIX + str(problem_id)
+        while True:
+            try:
+                if not await self._client().exists(key):
+                    return
+            except redis.RedisError:
+                return
+            await asyncio.sleep(SINGLEFLIGHT_POLL_SECONDS)
+
+    async def _release(self, lease: SolutionLease) -> None:
+        if lease.token:
+            try:
+                await self._client().eval(_RELEASE_SCRIPT, 1, LOCK_KEY_PREFIX + str(lease.problem_id), lease.token)
+            except redis.RedisError as e:
+                logging.warning(f"Redis lock release failed for problem {lease.problem_id}: {e}")
+        if lease.event:
+            if self._local.get(lease.problem_id) is lease.event:
+                del self._local[lease.problem_id]
+            lease.event.set()
+
+
+# 글로벌 인스턴스
+solution_singleflight = SolutionSingleFlight()
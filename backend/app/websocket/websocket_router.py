@@ -1,35 +1,40 @@
 import json
+import uuid
 import traceback
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from langchain_core.messages import BaseMessage  # (future use)
 
 from app.problem.problem_service import SolvedProblemService
-from app.problem.problem_repository import SolvedProblemRepository
 from app.counterexample.runner import CounterexampleRunner
+from app.counterexample.run_registry import CounterexampleRun, run_registry
 from app.dependencies import (
     get_solved_problem_service,
-    get_solved_problem_repository,
     get_counterexample_runner,
 )
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
-async def producer(websocket: WebSocket, gen: AsyncGenerator[dict, None], cancel_event: asyncio.Event):
+def sanitize_event(event: dict) -> dict:
+    """클라이언트에 보내지 않는 내부 키(_로 시작)를 이벤트 data에서 제거합니다."""
+    if (data := event.get("data")) and isinstance(data, dict):
+        event["data"] = {k: v for k, v in data.items() if not k.startswith("_")}
+    return event
+
+
+async def producer(websocket: WebSocket, gen: AsyncGenerator[dict, None], stop_event: asyncio.Event):
     """
     스트림 생성기(gen)의 이벤트를 클라이언트에게 전송합니다.
     """
     try:
         async for event in gen:
-            # cancel_event가 설정되면 즉시 중단합니다.
-            if cancel_event.is_set():
+            # stop_event가 설정되면 즉시 중단합니다.
+            if stop_event.is_set():
                 break
             
-            if (data := event.get("data")) and isinstance(data, dict):
-                sanitized_data = {k: v for k, v in data.items() if not k.startswith("_")}
-                event["data"] = sanitized_data
-            
+            event = sanitize_event(event)
+
             # send 중 연결이 끊기면 여기서 WebSocketDisconnect 예외가 발생합니다.
             await websocket.send_json(event)
 
@@ -38,62 +43,144 @@ async def producer(websocket: WebSocket, gen: AsyncGenerator[dict, None], cancel
     except WebSocketDisconnect:
         print("Producer: 클라이언트가 전송 중 연결을 끊었습니다.")
     finally:
-        # 이 태스크가 끝나면 cancel_event를 설정하여 다른 태스크도 종료시킵니다.
-        cancel_event.set()
+        # 이 태스크가 끝나면 stop_event를 설정하여 다른 태스크도 종료시킵니다.
+        stop_event.set()
 
 
-async def consumer(websocket: WebSocket, cancel_event: asyncio.Event):
+async def consumer(websocket: WebSocket, stop_event: asyncio.Event):
     """
     클라이언트로부터의 메시지를 계속 수신 대기하여 연결 종료를 즉시 감지합니다.
     """
     try:
-        while not cancel_event.is_set():
+        while not stop_event.is_set():
             await websocket.receive_text()
     except WebSocketDisconnect:
         print("Consumer: 클라이언트가 연결을 끊었습니다.")
     finally:
-        cancel_event.set()
+        stop_event.set()
 
 
-@router.websocket("/counterexample")
-async def counterexample_ws(
+async def _start_or_resume_run(
     websocket: WebSocket,
-    service: SolvedProblemService = Depends(get_solved_problem_service),
-    repo: SolvedProblemRepository = Depends(get_solved_problem_repository),
-    counterexample_runner: CounterexampleRunner = Depends(get_counterexample_runner),
-):
-    await websocket.accept()
-    cancel_event = asyncio.Event()
-    gen = None
+    init_payload: dict,
+    service: SolvedProblemService,
+    counterexample_runner: CounterexampleRunner,
+) -> Optional[CounterexampleRun]:
+    """init 메시지에 run_id가 있으면 진행 중인 실행에 붙거나 체크포인트에서 재개하고, 없으면 새로 시작
 
-    try:
-        init_text = await websocket.receive_text()
-        init_payload = json.loads(init_text)
-        problem_id = int(init_payload.get("problem_id"))
-        user_code = init_payload.get("user_code", "")
-        language = init_payload.get("language", "python")
+    실행 없이 응답을 끝낸 경우(오류, 결과 캐시 적중) None.
+    """
+    problem_id = int(init_payload.get("problem_id"))
+    run_id = init_payload.get("run_id")
+
+    if run_id:
+        run = run_registry.get(run_id)
+        # 연결이 끊긴 뒤 중단된 실행은 체크포인트에서 다시 시작
+        if run and run.cancel_event.is_set():
+            if run.task:
+                await asyncio.wait({run.task})
+            run = None
+        if run:
+            return run
+        if not await counterexample_runner.is_resumable(run_id):
+            await websocket.send_json({"type": "error", "message": f"Run {run_id} not found"})
+            return None
+        return run_registry.start(
+            run_id,
+            lambda cancel_event: counterexample_runner.stream_resume_counterexample(
+                run_id,
+                cancel_event=cancel_event,
+                on_prepared=service.save_prepared_solution(problem_id),
+            ),
+        )
 
-        if not user_code:
-            await websocket.send_json({"type": "error", "message": "user_code is required"})
-            return
+    user_code = init_payload.get("user_code", "")
+    language = init_payload.get("language", "python")
+    stress_mode = init_payload.get("mode") == "stress" or bool(init_payload.get("stress_mode", False))
+
+    if not user_code:
+        await websocket.send_json({"type": "error", "message": "user_code is required"})
+        return None
+
+    metadata = await service.get_problem_metadata(problem_id, refresh_limits=stress_mode)
+
+    # 같은 코드를 다시 제출한 경우 저장된 반례 하나만 확인하고 바로 결과 전송
+    if not stress_mode:
+        cached = await service.find_cached_counterexample(problem_id, user_code, language, metadata.description)
+        if cached:
+            await websocket.send_json({
+                "type": "finish",
+                "counterexample_found": True,
+                "counterexample_input": cached.counter_example_input,
+                "original_counterexample_input": cached.original_counter_example_input,
+                "counterexample_detail": cached.counter_example_detail,
+                "budget_exhausted": False,
+                "stats": cached.stats,
+            })
+            return None
+
+    async def notify_waiting():
+        await websocket.send_json({"type": "message", "role": "system", "content": "다른 요청이 이 문제의 해결책을 만드는 중입니다. 준비되면 이어서 진행합니다."})
 
-        metadata = await service.get_problem_metadata(problem_id)
-        solution = repo.get_problem_solution(problem_id)
+    solution, lease = await service.acquire_problem_solution(problem_id, stress_mode, notify_waiting, language)
 
-        gen = counterexample_runner.stream_find_counterexample(
+    run_id = uuid.uuid4().hex
+
+    def make_stream(cancel_event: asyncio.Event) -> AsyncGenerator[dict, None]:
+        events = counterexample_runner.stream_find_counterexample(
             problem_id=problem_id,
             problem_description=metadata.description,
             user_code=user_code,
             language=language,
             difficulty=metadata.difficulty,
+            category=metadata.category,
             correct_solution=solution.solution_code if solution else None,
+            solution_language=solution.solution_language if solution else None,
             input_generator=solution.input_generator if solution else None,
             start_from_compare=True if solution else False,
             cancel_event=cancel_event,
+            stress_mode=stress_mode,
+            on_prepared=service.save_prepared_solution(problem_id, lease) if lease else None,
+            run_id=run_id,
         )
+        # 찾은 오답 반례는 같은 코드의 재제출에 바로 답할 수 있도록 저장
+        return events if stress_mode else service.cache_streamed_result(problem_id, user_code, language, events)
+
+    return run_registry.start(
+        run_id,
+        make_stream,
+        # 해결책을 만들지 못하고 끝난 경우에도 기다리는 요청이 이어받을 수 있도록 해제
+        on_done=lease.release if lease else None,
+    )
+
+
+@router.websocket("/counterexample")
+async def counterexample_ws(
+    websocket: WebSocket,
+    service: SolvedProblemService = Depends(get_solved_problem_service),
+    counterexample_runner: CounterexampleRunner = Depends(get_counterexample_runner),
+):
+    """반례 탐색 스트리밍
+
+    실행은 연결과 분리되어 진행되므로, 연결이 끊겨도 처음 받은 run 이벤트의 run_id를
+    init 메시지에 담아 다시 연결하면 놓친 이벤트부터 이어서 받을 수 있습니다.
+    """
+    await websocket.accept()
+    stop_event = asyncio.Event()
+    run = None
+
+    try:
+        init_text = await websocket.receive_text()
+        init_payload = json.loads(init_text)
+
+        run = await _start_or_resume_run(websocket, init_payload, service, counterexample_runner)
+        if run is None:
+            return
+        run_registry.attach(run)
+        await websocket.send_json({"type": "run", "run_id": run.run_id})
 
-        producer_task = asyncio.create_task(producer(websocket, gen, cancel_event))
-        consumer_task = asyncio.create_task(consumer(websocket, cancel_event))
+        producer_task = asyncio.create_task(producer(websocket, run.subscribe(), stop_event))
+        consumer_task = asyncio.create_task(consumer(websocket, stop_event))
 
         done, pending = await asyncio.wait(
             {producer_task, consumer_task},
@@ -110,13 +197,11 @@ async def counterexample_ws(
             "trace": traceback.format_exc(limit=2)
         })
     finally:
-        cancel_event.set()
-        if gen:
-            try:
-                await gen.aclose()
-            except Exception:
-                pass
+        stop_event.set()
+        # 연결이 끊겨도 실행은 바로 취소하지 않음 (유예 시간 내 재연결 시 이어서 전송)
+        if run:
+            run_registry.detach(run)
         try:
             await websocket.close()
         except Exception:
-            pass
\ No newline at end of file
+            pass
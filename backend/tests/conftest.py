@@ -0,0 +1,35 @@
+import os
+import sys
+import pytest
+
+# backend/를 import 경로에 추가 (app, database 패키지)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# database.mysql_connection이 import 시점에 엔진 URL을 만들므로 접속 정보가 없는 환경에서도 파싱되도록 기본값을 둠
+# (엔진은 실제로 접속하지 않으며, DB가 필요한 테스트는 sqlite 세션을 직접 만든다)
+for key, value in {
+    "MYSQL_USER": "test",
+    "MYSQL_PASSWORD": "test",
+    "MYSQL_HOST": "localhost",
+    "MYSQL_PORT": "3306",
+    "MYSQL_DB": "test",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture
+def sqlite_engine():
+    """모든 모델의 테이블을 만든 메모리 sqlite 엔진
+
+    기록/조회는 asyncio.to_thread의 다른 스레드에서도 하므로 연결 하나를 공유한다.
+    """
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from sqlalchemy.pool import StaticPool
+    from database.mysql_connection import Base
+    import app.models  # noqa: F401 (모든 모델 등록)
+
+    engine = sqlalchemy.create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return engine
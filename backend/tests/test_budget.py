@@ -0,0 +1,45 @@
+"""탐색 예산: 난이도 비례 확장과 소진 판정"""
+import time
+from app.config import SEARCH_MAX_EXECUTIONS, SEARCH_MAX_LLM_CALLS, SEARCH_TIME_LIMIT_SECONDS
+from app.counterexample.utils.budget import get_search_budget, get_search_stats, is_budget_exhausted
+
+
+def test_budget_scales_with_difficulty():
+    assert get_search_budget(0) == {
+        "time_limit_seconds": SEARCH_TIME_LIMIT_SECONDS,
+        "max_llm_calls": SEARCH_MAX_LLM_CALLS,
+        "max_executions": SEARCH_MAX_EXECUTIONS,
+    }
+    ruby = get_search_budget(30)
+    assert ruby["time_limit_seconds"] == SEARCH_TIME_LIMIT_SECONDS * 4
+    assert ruby["max_llm_calls"] == SEARCH_MAX_LLM_CALLS * 4
+    assert get_search_budget(-5) == get_search_budget(0)
+
+
+def test_budget_exhaustion():
+    budget = {"time_limit_seconds": 60, "max_llm_calls": 3, "max_executions": 10}
+    state = {"search_budget": budget, "search_elapsed_seconds": 50.0, "llm_calls": 2, "executions": 9}
+    assert not is_budget_exhausted(state)
+    assert is_budget_exhausted({**state, "llm_calls": 3})
+    assert is_budget_exhausted({**state, "executions": 10})
+    assert is_budget_exhausted({**state, "search_elapsed_seconds": 61.0})
+    # 실행 중인 노드의 경과 시간도 포함
+    assert is_budget_exhausted({**state, "node_started_at": time.time() - 11})
+    assert not is_budget_exhausted({**state, "node_started_at": time.time()})
+    # 예산이 없는 상태(예전 체크포인트)는 소진되지 않음
+    assert not is_budget_exhausted({"llm_calls": 100})
+
+
+def test_search_stats():
+    stats = get_search_stats({
+        "search_elapsed_seconds": 1.5,
+        "llm_calls": 3,
+        "llm_cache_hits": 1,
+        "executions": 7,
+        "node_stats": {"generate_inputs": {"runs": 2, "duration_ms": 30, "llm_calls": 2}},
+    })
+    assert stats["llm_cache_hit_rate"] == 0.25
+    assert stats["executions"] == 7
+    assert not stats["budget_exhausted"]
+    assert stats["stages"]["generate_inputs"]["runs"] == 2
+    assert stats["stages"]["generate_inputs"]["duration_ms"] == 30
@@ -0,0 +1,86 @@
+"""사용자 코드/참조 해답 비교 라운드"""
+import asyncio
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from app.counterexample.nodes import code_runner as code_runner_node
+
+GENERATOR = "print(1)"
+USER_CODE = "print(0)"
+REFERENCE = "print(1)  # reference"
+
+
+class _ScriptedCodeRunner:
+    """코드별로 정해 둔 결과를 돌려주는 code-runner 대역"""
+
+    results = {}
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def run_code(self, code, input_data, language="python", time_limit=None, memory_limit_mb=None):
+        type(self).calls.append((code, time_limit))
+        for key, result in type(self).results.items():
+            if key in code:
+                return result(input_data) if callable(result) else dict(result)
+        raise AssertionError(f"unexpected code: {code}")
+
+
+@pytest.fixture
+def scripted_runner(monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(code_runner_node, "CodeRunnerClient", _ScriptedCodeRunner)
+    monkeypatch.setattr(code_runner_node, "record_reference_runs", noop)
+    monkeypatch.setattr(code_runner_node, "record_generator_round", noop)
+    _ScriptedCodeRunner.calls = []
+    return _ScriptedCodeRunner
+
+
+def _state():
+    return {
+        "problem_id": 1,
+        "problem_description": "# 문제",  # 샘플이 없으므로 생성기 입력만 사용
+        "user_code": USER_CODE,
+        "language": "python",
+        "correct_solution": REFERENCE,
+        "solution_language": "python",
+        "test_case_generator": GENERATOR,
+        "search_budget": {"time_limit_seconds": 60, "max_llm_calls": 6, "max_executions": 40},
+        "search_elapsed_seconds": 0.0,
+    }
+
+
+def test_failed_reference_run_is_not_reported_as_counterexample(scripted_runner):
+    scripted_runner.results = {
+        "reference": {"output": "", "verdict": "TLE", "time_ms": 10000, "error": "Reference solution TLE"},
+        GENERATOR: {"output": "1\n", "error": None},
+        USER_CODE: {"output": "0\n"},
+    }
+    result = asyncio.run(code_runner_node.run_codes_and_compare(_state(), {}))
+    assert not result["counterexample_found"]
+    assert result["test_cases_run"] == 0
+
+
+
+def test_reference_is_measured_once_per_round(scripted_runner):
+    scripted_runner.results = {
+        "reference": lambda input_data: {"output": input_data, "verdict": "OK", "time_ms": 12, "memory_kb": 1000},
+        # 시드마다 다른 입력, 사용자 코드는 세 번째 입력에서 틀림
+        GENERATOR: lambda seed: {"output": seed, "error": None},
+        USER_CODE: lambda input_data: {"output": "0\n" if input_data.strip() == "3" else input_data},
+    }
+    result = asyncio.run(code_runner_node.run_codes_and_compare(_state(), {}))
+    assert result["counterexample_found"]
+    assert result["test_cases_run"] == 3
+    limits = [limit for code, limit in scripted_runner.calls if code == REFERENCE]
+    assert limits == [code_runner_node.REFERENCE_TIME_LIMIT_SECONDS, None, None]
@@ -0,0 +1,51 @@
+"""code-runner 클라이언트의 작업 결과 처리"""
+import asyncio
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from app.counterexample.tools.code_runner_client import CodeRunnerClient
+
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+        self.status = 200
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.body
+
+
+class _Session:
+    """/run-code는 작업 ID를, /results는 정해진 상태를 돌려주는 세션"""
+
+    def __init__(self, status, result=None):
+        self.status = status
+        self.result = result
+
+    async def post(self, url, json, timeout):
+        return _Response({"task_id": "task-1"})
+
+    async def get(self, url, timeout):
+        return _Response({"status": self.status, "result": self.result})
+
+
+def _run(session):
+    client = CodeRunnerClient("http://code-runner")
+    client.session = session
+    return asyncio.run(client.run_code("print(1)", ""))
+
+
+def test_successful_task_returns_output():
+    result = _run(_Session("SUCCESS", {"output": "1\n", "error": "", "status": "success"}))
+
+    assert result["output"] == "1\n"
+
+
+def test_revoked_task_raises_instead_of_empty_output():
+    # 빈 출력을 돌려주면 정답과 비교해 잘못된 반례가 됨
+    with pytest.raises(asyncio.CancelledError):
+        _run(_Session("REVOKED"))
@@ -0,0 +1,61 @@
+"""채점 방식별 출력 비교와 오차 허용 문구 감지"""
+from app.counterexample.utils.compare import compare_outputs, detect_compare_options, outputs_match
+
+
+def test_exact_ignores_trailing_spaces_and_blank_lines():
+    assert compare_outputs("1 2\n3\n", "1 2   \n3\n\n\n")["equal"]
+    assert compare_outputs("", "\n")["equal"]
+
+
+def test_exact_reports_first_different_line():
+    result = compare_outputs("1\n2\n3\n", "1\n2 \n4\n")
+    assert not result["equal"]
+    assert (result["line"], result["expected"], result["actual"]) == (3, "3", "4")
+    assert result["token"] is None
+
+
+def test_exact_reports_missing_output():
+    result = compare_outputs("1\n2\n", "1\n")
+    assert not result["equal"]
+    assert (result["line"], result["expected"], result["actual"]) == (2, "2", None)
+
+
+def test_exact_is_whitespace_sensitive_within_lines():
+    assert not compare_outputs("1 2", "1  2")["equal"]
+    assert compare_outputs("1 2", "1  2", mode="token")["equal"]
+    assert compare_outputs("1 2", "1\n2", mode="token")["equal"]
+
+
+def test_token_reports_token_index_and_line():
+    result = compare_outputs("1 2\n3 4\n", "1 2\n3 5\n", mode="token")
+    assert (result["token"], result["line"]) == (4, 2)
+    assert (result["expected"], result["actual"]) == ("4", "5")
+    assert (result["expected_line"], result["actual_line"]) == ("3 4", "3 5")
+
+
+def test_float_tolerance():
+    options = {"mode": "float", "abs_eps": 1e-6, "rel_eps": None}
+    assert outputs_match("0.3333333", "0.33333330001", options)
+    assert not outputs_match("0.333", "0.334", options)
+    # 실수가 아닌 토큰은 정확히 같아야 함
+    assert not outputs_match("nan", "nan0", options)
+    assert not outputs_match("inf", "1e400", options)
+
+    relative = {"mode": "float", "abs_eps": None, "rel_eps": 1e-6}
+    assert outputs_match("1000000", "1000000.5", relative)
+    assert not outputs_match("1", "1.5", relative)
+
+
+def test_long_mismatch_is_clipped():
+    result = compare_outputs("a" * 1000, "b" * 1000)
+    assert result["expected"].endswith("...") and len(result["expected"]) < 1000
+
+
+def test_detect_compare_options():
+    assert detect_compare_options("A+B를 출력한다.")["mode"] == "exact"
+    assert detect_compare_options("정답과의 절대/상대 오차는 10-9 까지 허용한다.") == {
+        "mode": "float", "abs_eps": 1e-9, "rel_eps": 1e-9,
+    }
+    assert detect_compare_options("정답과의 절대 오차가 10^{-6} 이하이면 정답이다.") == {
+        "mode": "float", "abs_eps": 1e-6, "rel_eps": None,
+    }
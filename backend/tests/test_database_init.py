@@ -0,0 +1,33 @@
+"""이전 solved_problems 행의 참조 해답 언어 추정"""
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy.orm import Session
+from app.database_init import _detect_solution_languages
+from app.problem.problem_repository import SolvedProblemRepository
+
+
+def test_legacy_solutions_get_detected_language_or_are_retired(sqlite_engine):
+    codes = {
+        "print(1)\n": "python",
+        "#include <cstdio>\nint main() { printf(\"1\"); }\n": "cpp",
+        "public class Main { public static void main(String[] a) { System.out.print(1); } }\n": "java",
+        "console.log(1);\n": "javascript",
+    }
+    with Session(sqlite_engine) as db:
+        repository = SolvedProblemRepository(db)
+        for code in codes:
+            # 마이그레이션 직후처럼 모두 python으로 기록된 상태
+            repository.add_solution(1, code, "python")
+
+    with sqlite_engine.begin() as conn:
+        _detect_solution_languages(conn)
+
+    with Session(sqlite_engine) as db:
+        solutions = SolvedProblemRepository(db).get_problem_solutions(1)
+        # 참조 해답 언어(cpp, python)가 아닌 java/javascript 해답은 retired
+        assert {row.solution_code: row.solution_language for row in solutions} == {
+            "print(1)\n": "python",
+            "#include <cstdio>\nint main() { printf(\"1\"); }\n": "cpp",
+        }
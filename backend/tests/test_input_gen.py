@@ -0,0 +1,73 @@
+"""generate_inputs/regenerate_inputs 실패 처리"""
+import asyncio
+import pytest
+
+pytest.importorskip("langgraph")
+
+from app.counterexample.graph import should_have_inputs
+from app.counterexample.nodes import input_gen
+
+GENERATOR = "import random\nprint(random.randint(1, 10))\n"
+
+
+def _fake_llm(monkeypatch, code: str, cached: bool, preflight_error=None):
+    invalidated = []
+
+    async def invoke_with_cache(prompt, chat, inputs, prompt_version, variant=0, bypass=False):
+        return {"response": f"```python\n{code}```", "code": code, "cache_key": "key", "cached": cached}
+
+    async def preflight(code, language, code_runner=None):
+        return preflight_error
+
+    async def invalidate(keys):
+        invalidated.extend(keys)
+
+    monkeypatch.setattr(input_gen, "get_counterexample_chat", lambda difficulty=0: None)
+    monkeypatch.setattr(input_gen, "invoke_with_cache", invoke_with_cache)
+    monkeypatch.setattr(input_gen, "preflight", preflight)
+    monkeypatch.setattr(input_gen, "invalidate", invalidate)
+    return invalidated
+
+
+def test_failed_regeneration_keeps_existing_generator(monkeypatch):
+    _fake_llm(monkeypatch, code="", cached=False)
+    state = {"problem_description": "# 문제", "test_case_generator": GENERATOR}
+
+    update = asyncio.run(input_gen.generate_test_cases(state))
+
+    assert "test_case_generator" not in update
+    assert update == {"llm_calls": 1}
+    # 기존 생성기가 남아 있으므로 run_and_compare로 돌아감
+    assert should_have_inputs({**state, **update}) == "ok"
+
+
+def test_preflight_failure_on_cache_hit_is_not_charged(monkeypatch):
+    invalidated = _fake_llm(monkeypatch, code="print(", cached=True, preflight_error="SyntaxError")
+
+    update = asyncio.run(input_gen.generate_test_cases({"problem_description": "# 문제"}))
+
+    assert update == {"llm_cache_hits": 1}
+    assert invalidated == ["key"]
+    assert should_have_inputs(update) == "retry"
+
+
+def test_new_generator_replaces_old_one(monkeypatch):
+    _fake_llm(monkeypatch, code=GENERATOR, cached=False)
+
+    update = asyncio.run(input_gen.generate_test_cases({"test_case_generator": "print(1)\n"}))
+
+    assert update == {"test_case_generator": GENERATOR, "llm_calls": 1}
+
+
+def test_failed_chat_client_is_charged(monkeypatch):
+    _fake_llm(monkeypatch, code=GENERATOR, cached=False)
+
+    def get_counterexample_chat(difficulty=0):
+        raise RuntimeError("API key missing")
+
+    monkeypatch.setattr(input_gen, "get_counterexample_chat", get_counterexample_chat)
+
+    update = asyncio.run(input_gen.generate_test_cases({"problem_description": "# 문제"}))
+
+    # 예산을 쓰지 않으면 retry 루프가 예산 소진 없이 반복됨
+    assert update == {"llm_calls": 1}
@@ -0,0 +1,171 @@
+"""요청마다 실행되는 순수 함수들의 마이크로벤치마크 (pytest-benchmark)
+
+실제 크기의 큰 입력(긴 LLM 응답, 큰 문제 HTML, 긴 boj 출력, 10만 줄 출력, 긴 제출 코드, 큰 스트림 이벤트)으로
+호출당 시간을 잰다. 평소 테스트 실행(--benchmark-disable, pytest.ini)에서는 한 번씩만 호출해 동작만 확인하고,
+기준값은 장비마다 다르므로 같은 장비에서 먼저 저장한 뒤 비교한다.
+
+    pytest tests/test_microbench.py --benchmark-enable --benchmark-save=baseline      # 기준값 저장 (.benchmarks/)
+    pytest tests/test_microbench.py --benchmark-enable --benchmark-compare=0001 --benchmark-compare-fail=min:25%
+
+boj-runner의 _parse_status는 저장소의 boj-runner/main.py를 경로로 불러와 측정한다 (불러올 수 없으면 건너뜀).
+"""
+import os
+import json
+import random
+import importlib.util
+from typing import Any, Dict, List, Optional, Tuple
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("langchain_core")
+
+from app.counterexample.utils.compare import compare_outputs
+from app.counterexample.utils.markdown import extract_code_block
+from app.counterexample.utils.normalize import normalized_code_hash
+from app.crawler.crawler_schema import FullProblemInfo, TestCase
+from app.problem.problem_service import SolvedProblemService
+from app.websocket.websocket_router import sanitize_event
+
+BOJ_RUNNER_MAIN = os.getenv("BOJ_RUNNER_MAIN") or os.path.join(
+    os.path.dirname(__file__), "..", "..", "boj-runner", "main.py"
+)
+
+
+def _llm_response(with_code: bool) -> str:
+    """설명이 긴 LLM 응답 (코드 블록은 맨 끝, 없으면 두 패턴 모두 끝까지 탐색)"""
+    rng = random.Random(0)
+    prose = "\n".join(
+        f"{i}. 이 단계에서는 `dp[{i}]`를 계산합니다. " + "부분 문제를 나누어 생각하면 " * rng.randint(3, 12)
+        for i in range(2000)
+    )
+    code = "\n".join(f"    total += values[{i}] * {i}  # 누적" for i in range(400))
+    return prose + (f"\n\n```python\ndef solve(values):\n    total = 0\n{code}\n    return total\n```\n" if with_code else "\n")
+
+
+def _problem_info() -> FullProblemInfo:
+    """표/수식/예제가 많은 문제 (예제 입력은 수천 줄)"""
+    paragraph = "<p>정수 <em>N</em>개로 이루어진 수열 <code>A</code>가 주어진다. $1 \\le N \\le 100\\,000$</p>"
+    table = "<table><tr>" + "".join(f"<td>{i}</td>" for i in range(50)) + "</tr></table>"
+    big_input = "\n".join(" ".join(str((i * 7919 + j) % 1000) for j in range(20)) for i in range(2000))
+    return FullProblemInfo(
+        problem_id=1,
+        title="큰 문제",
+        description=(paragraph + table) * 60 + '<img src="/upload/a.png">',
+        constraints="<ul>" + "".join(f"<li>제약 {i}: $0 \\le x_{i} \\le 10^9$</li>" for i in range(40)) + "</ul>",
+        input_description=paragraph * 20,
+        output_description=paragraph * 10,
+        time_limit="1 초",
+        memory_limit="256 MB",
+        test_cases=[TestCase(input=big_input, output="42") for _ in range(5)],
+        level=15,
+        tags=[],
+    )
+
+
+def _boj_output(found: bool) -> List[str]:
+    """`boj submit` 진행 출력 (채점 진행률 줄 수천 개 뒤에 결과)"""
+    lines = [f"\r채점 중 ({i % 100}%) ████████░░" for i in range(5000)]
+    return lines + (["Accepted  128 KB  60 ms"] if found else ["Connection reset"])
+
+
+def _submission(language: str) -> str:
+    """주석이 섞인 긴 제출 코드 (함수 수백 개)"""
+    if language == "python":
+        return "\n".join(
+            f"def step_{i}(values, n):\n    \"\"\"{i}번째 단계\"\"\"\n    total = 0  # 누적\n"
+            f"    for j in range(n):\n        total += values[j] * {i}\n    return total\n"
+            for i in range(300)
+        )
+    return "\n".join(
+        f"// {i}번째 단계\nlong long step_{i}(const vector<int>& values, int n) {{\n"
+        f"    long long total = 0; /* 누적 */\n    for (int j = 0; j < n; j++) total += values[j] * {i};\n"
+        f"    return total;\n}}\n"
+        for i in range(300)
+    )
+
+
+def _outputs(lines: int, diff_at: Optional[int]) -> Tuple[str, str]:
+    expected = "\n".join(f"{i} {i * 31 % 1000003}" for i in range(lines)) + "\n"
+    actual = expected if diff_at is None else expected.replace(f"\n{diff_at} ", f"\n{diff_at}  x", 1)
+    # 같은 내용의 다른 문자열 (빠른 경로 == 비교가 객체 동일성으로 끝나지 않도록)
+    return expected, actual if diff_at is not None else "".join(list(actual))
+
+
+def _float_outputs(lines: int) -> Tuple[str, str]:
+    expected = "\n".join(f"{i / 7:.9f}" for i in range(lines)) + "\n"
+    actual = "\n".join(f"{i / 7 + 1e-10:.10f}" for i in range(lines)) + "\n"
+    return expected, actual
+
+
+def _stream_event() -> Dict[str, Any]:
+    """노드 하나의 node_update 이벤트 (최근 케이스/통계가 든 큰 data)"""
+    data: Dict[str, Any] = {
+        f"key_{i}": {"value": i, "items": list(range(20))} for i in range(40)
+    }
+    data["recent_cases"] = [
+        {"index": i, "source": "generator", "input_hash": f"{i:016x}", "input_size": 1000, "equal": True}
+        for i in range(20)
+    ]
+    data["_internal"] = "x" * 10000
+    return {"type": "node_update", "node": "run_and_compare", "data": data}
+
+
+@pytest.fixture(scope="module")
+def boj_runner() -> Any:
+    path = os.path.abspath(BOJ_RUNNER_MAIN)
+    if not os.path.exists(path):
+        pytest.skip(f"boj-runner not found ({path})")
+    spec = importlib.util.spec_from_file_location("boj_runner_main", path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:  # boj-runner 의존성이 없는 환경
+        pytest.skip(f"boj-runner import failed: {e}")
+    return module
+
+
+@pytest.mark.parametrize("with_code", [True, False], ids=["code_at_end", "no_code"])
+def test_extract_code_block(benchmark, with_code):
+    response = _llm_response(with_code)
+    code = benchmark(extract_code_block, response)
+    assert bool(code) == with_code
+
+
+def test_get_problem_markdown_large(benchmark):
+    problem_info = _problem_info()
+    markdown = benchmark(SolvedProblemService._get_problem_markdown, problem_info)
+    assert "큰 문제" in markdown
+
+
+@pytest.mark.parametrize("diff_at, mode, equal", [
+    (None, "exact", True),
+    (99_000, "exact", False),
+    (99_000, "token", False),
+], ids=["exact_equal_100k", "exact_diff_near_end_100k", "token_diff_near_end_100k"])
+def test_compare_outputs(benchmark, diff_at, mode, equal):
+    expected, actual = _outputs(100_000, diff_at)
+    result = benchmark(compare_outputs, expected, actual, mode)
+    assert result["equal"] == equal
+
+
+def test_compare_outputs_float_eps_100k(benchmark):
+    expected, actual = _float_outputs(100_000)
+    assert benchmark(compare_outputs, expected, actual, "float", 1e-6, 1e-6)["equal"]
+
+
+@pytest.mark.parametrize("language", ["python", "cpp"])
+def test_normalized_code_hash_300_functions(benchmark, language):
+    code = _submission(language)
+    assert len(benchmark(normalized_code_hash, code, language)) == 64
+
+
+def test_sanitize_event_node_update(benchmark):
+    event = _stream_event()
+    encoded = benchmark(lambda: json.dumps(sanitize_event(dict(event)), ensure_ascii=False))
+    assert "_internal" not in encoded
+
+
+@pytest.mark.parametrize("found", [True, False], ids=["accepted_5k_lines", "unknown_5k_lines"])
+def test_boj_parse_status(benchmark, boj_runner, found):
+    lines = _boj_output(found)
+    benchmark(boj_runner._parse_status, lines)
@@ -0,0 +1,35 @@
+"""샘플 입력 변이: 개수(N) 토큰과 본문을 함께 바꾸고 관찰된 값 범위를 벗어나지 않음"""
+import random
+from app.counterexample.utils.mutator import InputMutator, ParsedInput
+
+SAMPLE = "5\n3 1 4 1 5\n"
+
+
+def test_count_link_detection():
+    assert ParsedInput("3\n1\n2\n3\n").count_link == (0, "lines")
+    assert ParsedInput(SAMPLE).count_link == (0, "tokens")
+    assert ParsedInput("2 7\n1\n5\n").count_link == (0, "lines")
+    assert ParsedInput("10\n").count_link is None
+
+
+def test_mutations_keep_structure_and_value_range():
+    mutator = InputMutator([SAMPLE], rng=random.Random(0))
+    assert mutator.allow_duplicates and mutator.allow_permutation
+    outputs = {mutator.mutate() for _ in range(200)}
+    assert len(outputs) > 10
+    for output in outputs:
+        lines = output.split("\n")
+        count, values = int(lines[0]), [int(v) for v in lines[1].split()]
+        assert count == len(values)
+        assert 1 <= count <= 5
+        assert all(1 <= value <= 5 for value in values)
+
+
+def test_mutation_is_deterministic_for_seeded_rng():
+    first = [InputMutator([SAMPLE], rng=random.Random(42)).mutate() for _ in range(3)]
+    assert len(set(first)) == 1
+
+
+def test_no_seeds():
+    assert InputMutator([]).mutate() is None
+    assert InputMutator(["", "   \n"]).mutate() is None
@@ -0,0 +1,68 @@
+"""제출 코드 정규화와 해시 안정성 (반례 결과 캐시 키)"""
+import os
+import sys
+import subprocess
+from app.counterexample.utils.normalize import normalize_code, normalized_code_hash
+
+A_PLUS_B = "a, b = map(int, input().split())\nprint(a + b)\n"
+
+
+def test_python_ignores_comments_docstrings_and_names():
+    variant = '''"""A+B"""
+# 두 수를 더함
+x,  y = map(int, input().split())   # 입력
+print(x + y)
+'''
+    assert normalized_code_hash(variant, "python") == normalized_code_hash(A_PLUS_B, "python")
+    # 타입 주석도 동작과 무관
+    typed = "def f(n: int) -> int:\n    return n * 2\nprint(f(int(input())))\n"
+    untyped = "def g(k):\n    return k * 2\nprint(g(int(input())))\n"
+    assert normalize_code(typed, "python") == normalize_code(untyped, "python")
+
+
+def test_python_keeps_behaviour_changes_apart():
+    different = [
+        "a, b = map(int, input().split())\nprint(a - b)\n",
+        "a, b = map(int, input().split())\nprint(b + a)\n",     # 이름 순서가 바뀜
+        "b, a = map(float, input().split())\nprint(a + b)\n",   # 내장 함수는 그대로
+        "a, b = map(int, input().split(','))\nprint(a + b)\n",
+        "import sys\na, b = map(int, sys.stdin.readline().split())\nprint(a + b)\n",
+    ]
+    hashes = {normalized_code_hash(code, "python") for code in different + [A_PLUS_B]}
+    assert len(hashes) == len(different) + 1
+
+
+def test_python_keeps_attribute_and_keyword_names():
+    assert normalize_code("print(1, end='')", "python") != normalize_code("print(1, sep='')", "python")
+    assert normalize_code("import math\nprint(math.floor(2.5))", "python") != \
+        normalize_code("import math\nprint(math.ceil(2.5))", "python")
+
+
+def test_python_syntax_error_falls_back_to_text_with_indentation():
+    broken = "for i in range(3):\n    print(i)  # 출력\nprint('done'\n"
+    assert normalize_code(broken, "python") == "text:0:for i in range ( 3 ) :\n4:print ( i )\n0:print ( 'done'"
+    dedented = "for i in range(3):\n    print(i)\n  print('done'\n"
+    assert normalize_code(broken, "python") != normalize_code(dedented, "python")
+
+
+def test_text_languages_strip_comments_but_keep_strings():
+    code = 'int main(){ // c\n  printf("%d //x", 1); /* y */ }'
+    assert normalize_code(code, "cpp") == 'text:int main ( ) { printf ( "%d //x" , 1 ) ; }'
+    assert normalize_code('printf("a  b");', "cpp") != normalize_code('printf("a b");', "cpp")
+
+
+def test_hash_is_stable_across_processes():
+    # 캐시 키는 DB에 저장되므로 프로세스마다 달라지는 값(문자열 hash, set 순서)에 의존하면 안 됨
+    script = (
+        "from app.counterexample.utils.normalize import normalized_code_hash as h;"
+        f"print(h({A_PLUS_B!r}, 'python'), h('int main(){{}}', 'cpp'))"
+    )
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=backend, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("0", "1", "12345")
+    }
+    assert outputs == {f"{normalized_code_hash(A_PLUS_B, 'python')} {normalized_code_hash('int main(){}', 'cpp')}\n"}
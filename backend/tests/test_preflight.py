@@ -0,0 +1,53 @@
+"""생성된 코드의 사전 검사: 빈 코드, 언어 혼동, 문법, code-runner 컴파일 검사"""
+import asyncio
+import pytest
+
+pytest.importorskip("httpx")
+
+from app.counterexample.utils.preflight import detect_language, local_preflight, preflight
+
+
+def test_local_checks():
+    assert local_preflight("  \n", "python") == "empty code"
+    assert local_preflight("print(int(input()) * 2)\n", "python") is None
+    assert local_preflight("print(1\n", "python").startswith("SyntaxError")
+    assert local_preflight("#include <cstdio>\nint main() { return 0; }\n", "python").startswith("wrong language")
+    assert local_preflight("def solve():\n    pass\nprint(1)\n", "cpp").startswith("wrong language")
+    assert local_preflight("int solve() { return 0; }\n", "cpp") == "no main function"
+    assert local_preflight("public class Solution {}\n", "java") == "no class Main"
+    # 검사 방법이 없는 언어는 통과
+    assert local_preflight("console.log(1)", "javascript") is None
+
+
+class _SyntaxChecker:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    async def check_syntax(self, code, language):
+        self.calls += 1
+        return self.result
+
+
+def test_remote_syntax_check_for_compiled_languages():
+    code = "int main() { return 0 }\n"
+    checker = _SyntaxChecker({"verdict": "CE", "error": "expected ';'\n"})
+    assert asyncio.run(preflight(code, "cpp", checker)) == "compile error: expected ';'"
+
+    # 검사 자체가 실패하면 통과로 간주
+    assert asyncio.run(preflight(code, "cpp", _SyntaxChecker({"verdict": None, "error": "connection"}))) is None
+
+    # 로컬 검사에서 걸리거나 Python이면 code-runner를 부르지 않음
+    checker = _SyntaxChecker({"verdict": "OK"})
+    assert asyncio.run(preflight("int solve() {}", "cpp", checker)) == "no main function"
+    assert asyncio.run(preflight("print(1)", "python", checker)) is None
+    assert checker.calls == 0
+
+
+def test_detect_language():
+    assert detect_language("print(int(input()) * 2)\n") == "python"
+    assert detect_language("#include <iostream>\nint main() { std::cout << 1; }\n") == "cpp"
+    assert detect_language("public class Main { public static void main(String[] a) {} }\n") == "java"
+    assert detect_language("console.log(1);\n") == "javascript"
+    assert detect_language("x = 1\ny = x => 2\n") == "javascript"
+    assert detect_language("int f() { return 0; }\n") is None
@@ -0,0 +1,54 @@
+"""사전 풀이 배치: 문제 번호 파싱과 진행 파일로 이어서 실행"""
+import json
+import asyncio
+import pytest
+
+pytest.importorskip("langgraph")
+
+from app.problem import presolve as presolve_module
+from app.problem.presolve import load_finished, parse_problem_ids, presolve
+from app.problem.problem_schema import PresolveResult
+
+
+def test_parse_problem_ids_expands_ranges_in_order():
+    values = ["1003", "1000-1002", "", "# 주석", "1001  # 중복", "2000"]
+    assert parse_problem_ids(values) == [1003, 1000, 1001, 1002, 2000]
+
+
+def test_load_finished_uses_last_status_and_skips_truncated_line(tmp_path):
+    progress = tmp_path / "progress.jsonl"
+    progress.write_text(
+        json.dumps({"problem_id": 1000, "status": "failed"}) + "\n"
+        + json.dumps({"problem_id": 1000, "status": "solved"}) + "\n"
+        + json.dumps({"problem_id": 1001, "status": "exists"}) + "\n"
+        + json.dumps({"problem_id": 1002, "status": "failed"}) + "\n"
+        + '{"problem_id": 10',  # 중단되며 잘린 줄
+        encoding="utf-8",
+    )
+    assert load_finished(str(progress), retry_failed=False) == {1000, 1001, 1002}
+    assert load_finished(str(progress), retry_failed=True) == {1000, 1001}
+    assert load_finished(str(tmp_path / "missing.jsonl"), retry_failed=False) == set()
+
+
+def test_presolve_resumes_from_progress_file(monkeypatch, tmp_path):
+    attempted = []
+
+    async def presolve_one(problem_id):
+        attempted.append(problem_id)
+        if problem_id == 1001:
+            return PresolveResult(problem_id=problem_id, status="failed", error="boom")
+        return PresolveResult(problem_id=problem_id, status="solved")
+
+    monkeypatch.setattr(presolve_module, "presolve_one", presolve_one)
+    progress = str(tmp_path / "progress.jsonl")
+
+    results = asyncio.run(presolve([1000, 1001], concurrency=2, per_minute=0, progress_path=progress))
+    assert sorted(result.problem_id for result in results) == [1000, 1001]
+
+    # 다시 실행하면 새 문제만, --retry-failed면 실패한 문제도 다시 시도
+    attempted.clear()
+    asyncio.run(presolve([1000, 1001, 1002], per_minute=0, progress_path=progress))
+    assert attempted == [1002]
+    attempted.clear()
+    asyncio.run(presolve([1000, 1001, 1002], per_minute=0, progress_path=progress, retry_failed=True))
+    assert attempted == [1001]
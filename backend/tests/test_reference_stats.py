@@ -0,0 +1,66 @@
+"""참조 해답 실행 시간 기록과 가장 빠른 해답 선택"""
+import asyncio
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("langchain_core")
+
+from sqlalchemy.orm import Session, sessionmaker
+from app.problem.problem_repository import SolvedProblemRepository
+from app.counterexample.benchmark.corpus import TILING
+from app.counterexample.benchmark.fakes import FakeCodeRunnerClient
+from app.counterexample.nodes import code_runner as code_runner_node
+from app.counterexample.tools import reference_stats
+
+
+def test_compare_round_records_measured_reference_runs(monkeypatch):
+    recorded = []
+
+    async def record_reference_runs(problem_id, solution_code, runs, total_time_ms):
+        recorded.append((problem_id, solution_code, runs, total_time_ms))
+
+    async def record_generator_round(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(code_runner_node, "CodeRunnerClient", FakeCodeRunnerClient)
+    monkeypatch.setattr(code_runner_node, "record_reference_runs", record_reference_runs)
+    monkeypatch.setattr(code_runner_node, "record_generator_round", record_generator_round)
+
+    state = {
+        "problem_id": TILING["problem_id"],
+        "problem_description": TILING["description"],
+        "user_code": TILING["submissions"][1]["code"],  # n = 1에서 틀림
+        "language": "python",
+        "correct_solution": TILING["solution"],
+        "solution_language": "python",
+        "test_case_generator": TILING["generator"],
+        "search_budget": {"time_limit_seconds": 60, "max_llm_calls": 6, "max_executions": 40},
+        "search_elapsed_seconds": 0.0,
+    }
+    result = asyncio.run(code_runner_node.run_codes_and_compare(state, {}))
+
+    assert result["counterexample_found"]
+    assert len(recorded) == 1
+    problem_id, solution_code, runs, total_time_ms = recorded[0]
+    assert (problem_id, solution_code) == (TILING["problem_id"], TILING["solution"])
+    assert runs >= 1
+    assert total_time_ms > 0
+
+
+def test_fastest_measured_reference_is_chosen(monkeypatch, sqlite_engine):
+    monkeypatch.setattr(reference_stats, "SessionLocal", sessionmaker(bind=sqlite_engine))
+    with Session(sqlite_engine) as db:
+        repository = SolvedProblemRepository(db)
+        repository.add_solution(1, "int main() {}", "cpp")
+        repository.add_solution(1, "print(1)", "python")
+
+        # 측정 전에는 언어 우선순위 (cpp 먼저)
+        assert repository.get_problem_solution(1).solution_language == "cpp"
+
+        asyncio.run(reference_stats.record_reference_runs(1, "int main() {}", 2, 400.0))
+        asyncio.run(reference_stats.record_reference_runs(1, "print(1)", 4, 200.0))
+
+        fastest = repository.get_latest_problem_solution(1)
+        assert fastest.solution_language == "python"
+        assert fastest.avg_time_ms == 50.0
+        assert [row.solution_language for row in repository.get_problem_solutions(1)] == ["python", "cpp"]
@@ -0,0 +1,78 @@
+"""반례 결과 캐시: 저장한 반례로 확인 실행 후 응답, 저장하지 않은 최소화 이전 입력은 생성기로 다시 만듦"""
+import asyncio
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("langchain_core")
+
+from sqlalchemy.orm import Session, sessionmaker
+from app.models.input_generator_model import InputGeneratorModel
+from app.models.solved_problem_model import code_hash
+from app.counterexample.benchmark.fakes import FakeCodeRunnerClient
+from app.counterexample.tools import generator_runner, result_cache
+from app.counterexample.tools.generator_runner import input_digest, run_generator
+
+GENERATOR = "s = int(input())\nprint(3)\nprint(*range(s, s + 3))\n"
+WRONG_CODE = "n = int(input())\nprint(0)\n"
+
+
+@pytest.fixture
+def cache_db(monkeypatch, sqlite_engine):
+    session_factory = sessionmaker(bind=sqlite_engine)
+    monkeypatch.setattr(result_cache, "SessionLocal", session_factory)
+    monkeypatch.setattr(generator_runner, "SessionLocal", session_factory)
+    monkeypatch.setattr(result_cache, "CodeRunnerClient", FakeCodeRunnerClient)
+    monkeypatch.setattr(generator_runner, "CodeRunnerClient", FakeCodeRunnerClient)
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_ENABLED", True)
+    return sqlite_engine
+
+
+def _store_shrunk_counterexample(original_input: str, seed: int) -> None:
+    detail = {
+        "input": "1\n",
+        "user_output": "0",
+        "correct_output": "1",
+        "source": "generator",
+        "generator_hash": code_hash(GENERATOR),
+        "seed": seed,
+        "input_hash": input_digest(original_input),
+    }
+    asyncio.run(result_cache.store_result(1, "python", WRONG_CODE, "1\n", original_input, detail))
+
+
+def test_cached_counterexample_is_verified_before_reuse(cache_db):
+    original_input = "3\n7 8 9\n"
+    _store_shrunk_counterexample(original_input, 7)
+
+    # 변수 이름과 주석만 다른 재제출
+    resubmitted = "# 다시 제출\nm = int(input())\nprint(0)\n"
+    cached = asyncio.run(result_cache.lookup_result(1, "python", resubmitted, "# 문제"))
+    assert cached is not None
+    assert cached["counterexample_input"] == "1\n"
+    assert cached["original_counterexample_input"] == original_input
+    assert cached["counterexample_detail"]["cached"]
+    assert cached["stats"]["executions"] == 1
+
+    # 같은 키라도 이번 코드가 맞게 출력하면 전체 탐색으로 넘어감
+    assert asyncio.run(result_cache.lookup_result(1, "python", "n = int(input())\nprint(1)\n", "# 문제")) is None
+
+
+def test_original_input_not_stored_is_replayed_from_generator(monkeypatch, cache_db):
+    with Session(cache_db) as db:
+        db.add(InputGeneratorModel(problem_id=1, code=GENERATOR, code_hash=code_hash(GENERATOR)))
+        db.commit()
+
+    async def generate(seed):
+        async with FakeCodeRunnerClient() as code_runner:
+            return (await run_generator(code_runner, GENERATOR, seed))["output"]
+
+    original_input = asyncio.run(generate(7))
+    # 최소화한 반례와 참조 출력만 저장되도록 상한을 낮춤
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_MAX_BYTES", len("1\n") + len("1") + 1)
+    _store_shrunk_counterexample(original_input, 7)
+
+    cached = asyncio.run(result_cache.lookup_result(1, "python", WRONG_CODE, "# 문제"))
+    assert cached is not None
+    assert cached["original_counterexample_input"] == original_input
+    assert cached["counterexample_detail"]["original_input"] == original_input
+    assert cached["stats"]["executions"] == 2
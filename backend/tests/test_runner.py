@@ -0,0 +1,50 @@
+"""스트림 실행 종료 시 체크포인트 정리"""
+import asyncio
+import pytest
+
+pytest.importorskip("langgraph.checkpoint.sqlite")
+
+from app.counterexample.runner import CounterexampleRunner
+
+
+class _Graph:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def astream(self, graph_input, config, stream_mode):
+        yield "values", {"counterexample_found": False}
+        if self.error:
+            raise self.error
+
+
+def _stream(runner, graph):
+    async def collect():
+        return [event async for event in runner._stream_graph(graph, {}, "run-1", {}, None, None)]
+    return asyncio.run(collect())
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    runner = CounterexampleRunner()
+    runner.discarded = []
+
+    async def discard_run(run_id):
+        runner.discarded.append(run_id)
+
+    monkeypatch.setattr(runner, "discard_run", discard_run)
+    return runner
+
+
+def test_finished_run_discards_checkpoint(runner):
+    events = _stream(runner, _Graph())
+
+    assert events[-1]["type"] == "finish"
+    assert runner.discarded == ["run-1"]
+
+
+def test_failed_run_keeps_checkpoint(runner):
+    events = _stream(runner, _Graph(RuntimeError("code-runner down")))
+
+    # 실패한 실행은 재개할 수 있도록 체크포인트를 남기고 완료 이벤트를 보내지 않음
+    assert [e["type"] for e in events] == ["error"]
+    assert runner.discarded == []
@@ -0,0 +1,26 @@
+"""반례 축소 후보: 개수 토큰을 맞춘 원소 제거와 값 축소, 작은 후보부터"""
+from app.counterexample.utils.shrink import input_size, shrink_candidates
+
+
+def test_candidates_remove_elements_and_update_count():
+    candidates = shrink_candidates("4\n10 20 30 40\n", granularity=2)
+    assert "2\n30 40\n" in candidates
+    assert "2\n10 20\n" in candidates
+    for candidate in candidates:
+        lines = candidate.split("\n")
+        assert int(lines[0]) == len(lines[1].split())
+
+
+def test_candidates_shrink_values_towards_floor():
+    candidates = shrink_candidates("1\n100\n", granularity=2, value_floor=1)
+    assert {"1\n1\n", "1\n50\n", "1\n99\n"} <= set(candidates)
+    # 개수 토큰은 값으로 줄이지 않음
+    assert all(candidate.startswith("1\n") for candidate in candidates)
+
+
+def test_candidates_are_sorted_smallest_first_without_original():
+    text = "3\n5 6 7\n"
+    candidates = shrink_candidates(text, granularity=3)
+    assert text not in candidates
+    assert candidates == sorted(candidates, key=input_size)
+    assert len(candidates) == len(set(candidates))
@@ -0,0 +1,77 @@
+"""반례 축소 노드의 실행 예산"""
+import asyncio
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from app.counterexample.nodes import shrinker
+
+COUNTEREXAMPLE = "4\n10 20 30 40\n"
+
+
+class _Client:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class _Pairs:
+    """30이 들어 있는 입력에서만 사용자 출력이 달라지는 run_pair (실행한 입력을 기록)"""
+
+    def __init__(self):
+        self.inputs = []
+        self.delay = 0.0
+
+    async def __call__(self, code_runner, user_code, correct_solution, test_input, language, solution_language):
+        self.inputs.append(test_input)
+        await asyncio.sleep(self.delay)
+        user_output = "wrong\n" if "30" in test_input.split() else "ok\n"
+        return {"output": user_output, "error": None}, {"output": "ok\n", "error": None}
+
+
+@pytest.fixture
+def pairs(monkeypatch):
+    pairs = _Pairs()
+    monkeypatch.setattr(shrinker, "CodeRunnerClient", _Client)
+    monkeypatch.setattr(shrinker, "run_pair", pairs)
+    monkeypatch.setattr(shrinker, "SHRINK_PARALLELISM", 2)
+    return pairs
+
+
+def _state(executions=0, max_executions=100):
+    return {
+        "problem_description": "# 문제",
+        "counterexample_found": True,
+        "counterexample_input": COUNTEREXAMPLE,
+        "counterexample_detail": {},
+        "executions": executions,
+        "search_budget": {"time_limit_seconds": 60, "max_llm_calls": 6, "max_executions": max_executions},
+    }
+
+
+def test_shrink_reduces_counterexample(pairs):
+    update = asyncio.run(shrinker.shrink_counterexample(_state(), {}))
+
+    assert update["counterexample_input"].split() == ["1", "30"]
+    assert update["executions"] == 2 * len(pairs.inputs)
+
+
+def test_shrink_stays_within_execution_budget(pairs):
+    update = asyncio.run(shrinker.shrink_counterexample(_state(executions=94, max_executions=100), {}))
+
+    # 남은 6번으로는 후보 3개(사용자/정답 한 쌍씩)까지만 평가
+    assert len(pairs.inputs) == 3
+    assert update["executions"] == 100
+
+
+def test_shrink_counts_runs_cut_off_by_time_limit(pairs, monkeypatch):
+    pairs.delay = 1
+    monkeypatch.setattr(shrinker, "SHRINK_TIME_LIMIT_SECONDS", 0.05)
+
+    update = asyncio.run(shrinker.shrink_counterexample(_state(), {}))
+
+    assert len(pairs.inputs) == 2
+    assert update["executions"] == 4
+    assert update["counterexample_input"] == COUNTEREXAMPLE
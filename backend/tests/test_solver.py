@@ -0,0 +1,116 @@
+"""해결책 후보를 예제로 거르기"""
+import asyncio
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from app.counterexample.nodes import solver
+
+PROBLEM = """# 문제
+두 수를 더하시오.
+
+## 예제 입력 1
+```
+1 2
+```
+
+## 예제 출력 1
+```
+3
+```
+"""
+CORRECT = "a, b = map(int, input().split())\nprint(a + b)"
+WRONG = "a, b = map(int, input().split())\nprint(a - b)"
+CRASHING = "print(1 / 0)"
+
+
+class _SampleRunner:
+    """후보 코드마다 정해진 출력/오류를 돌려주는 code-runner"""
+
+    RESULTS = {
+        CORRECT: {"output": "3\n", "error": None},
+        WRONG: {"output": "-1\n", "error": None},
+        CRASHING: {"output": "", "error": "ZeroDivisionError"},
+    }
+    runs = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def run_code(self, code, input_data, language="python", **kwargs):
+        _SampleRunner.runs += 1
+        return self.RESULTS[code]
+
+
+@pytest.fixture
+def single_candidate(monkeypatch):
+    """LLM이 후보 하나(SOLVE_CANDIDATES=1)만 돌려주도록 바꾸고, 그 코드를 정하는 함수를 반환"""
+    invalidated = []
+    _SampleRunner.runs = 0
+
+    async def choose_solve_tier(*args):
+        return {"provider": "fake", "model": "fake", "effort": None}
+
+    async def preflight(code, language, code_runner=None):
+        return None
+
+    async def record_solve_attempts(attempts):
+        pass
+
+    async def invalidate(keys):
+        invalidated.extend(keys)
+
+    monkeypatch.setattr(solver, "SOLVE_CANDIDATES", 1)
+    monkeypatch.setattr(solver, "choose_solve_tier", choose_solve_tier)
+    monkeypatch.setattr(solver, "tier_name", lambda tier: "fake:fake")
+    monkeypatch.setattr(solver, "get_tier_chat", lambda tier: None)
+    monkeypatch.setattr(solver, "preflight", preflight)
+    monkeypatch.setattr(solver, "record_solve_attempts", record_solve_attempts)
+    monkeypatch.setattr(solver, "invalidate", invalidate)
+    monkeypatch.setattr(solver, "CodeRunnerClient", _SampleRunner)
+
+    def use(code):
+        async def invoke_with_cache(*args, **kwargs):
+            return {
+                "response": code, "code": code, "cache_key": "key", "cached": False,
+                "elapsed_ms": 1, "prompt_tokens": 0, "input_tokens": 0, "output_tokens": 0,
+            }
+        monkeypatch.setattr(solver, "invoke_with_cache", invoke_with_cache)
+        return invalidated
+
+    return use
+
+
+def _solve():
+    state = {"problem_id": 1000, "problem_description": PROBLEM, "solution_language": "python"}
+    return asyncio.run(solver.generate_solution(state))
+
+
+def test_single_candidate_is_checked_on_samples(single_candidate):
+    single_candidate(CORRECT)
+    result = _solve()
+
+    assert result["correct_solution"] == CORRECT
+    assert result["executions"] == _SampleRunner.runs == 1
+
+
+def test_single_candidate_failing_samples_is_not_submitted(single_candidate):
+    invalidated = single_candidate(CRASHING)
+    result = _solve()
+
+    # 예제에서 실행 오류가 나면 백준에 제출하지 않고 재시도로 이어짐
+    assert result["correct_solution"] == ""
+    assert result["solution_candidates"] == []
+    assert invalidated == ["key"]
+
+
+def test_rank_candidates_falls_back_to_best_runnable_candidate(monkeypatch):
+    monkeypatch.setattr(solver, "CodeRunnerClient", _SampleRunner)
+    ranked, runs = asyncio.run(solver.rank_candidates([CRASHING, WRONG], PROBLEM, "python"))
+
+    # 예제 출력이 다르면 채점 방식 때문일 수 있으므로 남기지만, 실행 오류가 난 후보는 버림
+    assert ranked == [WRONG]
+    assert runs == 2
@@ -0,0 +1,104 @@
+"""스트레스 모드: 성능 판정, 입력 생성기 예산, 같은 언어 참조 해답 우선, 제한 없는 옛 문제 정보 갱신"""
+import asyncio
+import pytest
+
+pytest.importorskip("langgraph")
+
+from sqlalchemy.orm import Session
+from app.counterexample.nodes import stress
+from app.counterexample.nodes.stress import _performance_issue
+from app.counterexample.runner import CounterexampleRunner
+from app.counterexample.utils.limits import parse_problem_limits
+from app.crawler.crawler_schema import FullProblemInfo
+from app.problem.problem_repository import SolvedProblemRepository
+from app.problem.problem_schema import ProblemMetadataCreate
+from app.problem.problem_service import SolvedProblemService
+
+
+def test_reference_ratio_only_for_same_language():
+    user = {"verdict": "OK", "time_ms": 900, "memory_kb": 1000}
+    reference = {"verdict": "OK", "time_ms": 100, "memory_kb": 1000}
+
+    assert _performance_issue(user, reference, 2.0, 256, same_language=True) == "reference_ratio"
+    assert _performance_issue(user, reference, 2.0, 256, same_language=False) is None
+    assert _performance_issue({**user, "time_ms": 2500}, reference, 2.0, 256, same_language=False) == "time_limit"
+    assert _performance_issue({**user, "verdict": "MLE"}, reference, None, None) == "memory_limit"
+
+
+def test_stress_generator_failure_is_charged(monkeypatch):
+    def get_counterexample_chat(difficulty=0):
+        raise RuntimeError("API key missing")
+
+    monkeypatch.setattr(stress, "get_counterexample_chat", get_counterexample_chat)
+
+    update = asyncio.run(stress.generate_stress_inputs({"problem_description": "# 문제"}))
+
+    assert update == {"llm_calls": 1}
+
+
+def test_stress_mode_prefers_reference_in_user_language(sqlite_engine):
+    with Session(sqlite_engine) as db:
+        repository = SolvedProblemRepository(db)
+        repository.add_solution(1, "int main() {}", "cpp")
+        repository.add_solution(1, "print(1)", "python")
+
+        assert repository.get_prepared_problem(1, require_generator=False).solution_language == "cpp"
+        prepared = repository.get_prepared_problem(1, require_generator=False, language="python")
+        assert prepared.solution_language == "python"
+        # 사용자 언어의 참조 해답이 없으면 가장 빠른(우선) 해답
+        assert repository.get_prepared_problem(1, require_generator=False, language="java").solution_language == "cpp"
+
+
+def test_stress_mode_generates_reference_in_user_language():
+    state = CounterexampleRunner._build_initial_state(
+        1, "# 문제", "print(1)", "python", 0, None, None, None, stress_mode=True,
+    )
+    assert state["solution_language"] == "python"
+    state = CounterexampleRunner._build_initial_state(
+        1, "# 문제", "console.log(1)", "javascript", 0, None, None, None, stress_mode=True,
+    )
+    assert state["solution_language"] == "cpp"
+
+
+class _FakeCrawler:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_full_problem(self, problem_id: int) -> FullProblemInfo:
+        self.calls += 1
+        return FullProblemInfo(
+            problem_id=problem_id,
+            title="A+B",
+            description="<p>두 정수 A와 B를 입력받은 다음, A+B를 출력하는 프로그램을 작성하시오.</p>",
+            constraints="",
+            input_description="<p>첫째 줄에 A와 B가 주어진다.</p>",
+            output_description="<p>첫째 줄에 A+B를 출력한다.</p>",
+            time_limit="2 초",
+            memory_limit="128 MB",
+            test_cases=[],
+            level=1,
+            tags=[],
+        )
+
+
+def test_stress_mode_refreshes_metadata_without_limits(sqlite_engine):
+    with Session(sqlite_engine) as db:
+        repository = SolvedProblemRepository(db)
+        # 제한 표가 생기기 전에 저장된 문제 정보
+        repository.create_problem_metadata(ProblemMetadataCreate(
+            problem_id=1000, title="A+B", description="# A+B\n\n## 문제 \n\nA+B", category="", difficulty=1,
+        ))
+        crawler = _FakeCrawler()
+        service = SolvedProblemService(repository, crawler, None, None)
+
+        metadata = asyncio.run(service.get_problem_metadata(1000))
+        assert crawler.calls == 0
+        assert parse_problem_limits(metadata.description)["time_limit_seconds"] is None
+
+        metadata = asyncio.run(service.get_problem_metadata(1000, refresh_limits=True))
+        assert crawler.calls == 1
+        assert parse_problem_limits(metadata.description) == {"time_limit_seconds": 2.0, "memory_limit_mb": 128}
+
+        # 한 번 갱신하면 다시 크롤링하지 않음
+        asyncio.run(service.get_problem_metadata(1000, refresh_limits=True))
+        assert crawler.calls == 1
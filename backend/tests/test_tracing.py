@@ -0,0 +1,70 @@
+"""노드 실행 통계 누적 (node_stats)"""
+import asyncio
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from app.counterexample.utils.tracing import (
+    measure_call,
+    merge_node_stats,
+    node_trace_from_stats,
+    summarize_node_stats,
+    traced_node,
+)
+
+
+async def _node(state):
+    with measure_call("code_runner"):
+        await asyncio.sleep(0)
+    return {"executions": 1}
+
+
+def test_traced_node_accumulates_bounded_stats():
+    node = traced_node("run_and_compare", _node)
+    state = {"node_stats": {}}
+    for attempt in range(1, 51):
+        update = asyncio.run(node(state, {}))
+        stats = update["node_stats"]["run_and_compare"]
+        assert stats["runs"] == 1
+        assert stats["attempt"] == attempt
+        assert node_trace_from_stats("run_and_compare", stats)["node"] == "run_and_compare"
+        state["node_stats"] = merge_node_stats(state["node_stats"], update["node_stats"])
+
+    # 실행 횟수와 무관하게 노드 이름마다 한 항목
+    assert list(state["node_stats"]) == ["run_and_compare"]
+    summary = summarize_node_stats(state["node_stats"])["run_and_compare"]
+    assert summary["runs"] == 50
+    assert summary["code_runner_calls"] == 50
+
+
+def test_traced_node_accumulates_search_time():
+    seen = {}
+
+    async def node_fn(state):
+        seen.update(state)
+        await asyncio.sleep(0.01)
+        return {}
+
+    node = traced_node("solve", node_fn)
+    # 재개된 실행: 이전에 쓴 시간만 이어서 세고, 멈춰 있던 시간은 세지 않음
+    update = asyncio.run(node({"search_elapsed_seconds": 30.0}, {}))
+
+    assert "node_started_at" in seen
+    assert 30.01 <= update["search_elapsed_seconds"] < 31
+    assert "node_started_at" not in update
+
+
+def test_merge_node_stats_sums_parallel_updates():
+    left = {"solve": {"runs": 1, "duration_ms": 10.0, "llm_calls": 1, "attempt": 1}}
+    right = {
+        "solve": {"runs": 1, "duration_ms": 5.5, "llm_calls": 2, "attempt": 2},
+        "generate_inputs": {"runs": 1, "duration_ms": 3.0, "llm_calls": 1, "attempt": 1},
+    }
+
+    merged = merge_node_stats(left, right)
+
+    assert merged["solve"] == {"runs": 2, "duration_ms": 15.5, "llm_calls": 3, "attempt": 2}
+    assert merged["generate_inputs"]["runs"] == 1
+    # 입력은 바꾸지 않음
+    assert left["solve"]["runs"] == 1
+    assert merge_node_stats(None, right) == right
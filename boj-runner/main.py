@@ -1,8 +1,9 @@
 import os
 import re
+import signal
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
@@ -18,6 +19,7 @@ class CodeRequest(BaseModel):
     problem_id: int = Field(..., description="백준 문제 번호")
     language: str = Field(..., description="언어 (예: python3, c++17)")
     code: str = Field(..., description="제출 코드")
+    submission_id: Optional[str] = Field(None, description="중단 요청(/abort)에 사용할 식별자")
 
 
 class SubmitResponse(BaseModel):
@@ -25,6 +27,10 @@ class SubmitResponse(BaseModel):
     raw_output: List[str]
 
 
+# submission_id → 실행 중인 `boj submit` 프로세스
+_running: Dict[str, asyncio.subprocess.Process] = {}
+
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
@@ -83,28 +89,38 @@ def _parse_status(lines: List[str]) -> str:
     return "Unknown"
 
 
-async def _run_submit(problem_id: int) -> SubmitResponse:
+async def _run_submit(problem_id: int, submission_id: Optional[str] = None) -> SubmitResponse:
     # Run `boj submit {id}` from workspace
+    # 자식 프로세스까지 한 번에 종료할 수 있도록 새 프로세스 그룹으로 실행
     proc = await asyncio.create_subprocess_exec(
         "boj", "submit", str(problem_id),
         cwd=str(WORKSPACE_DIR),
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
     )
+    if submission_id:
+        _running[submission_id] = proc
     lines: List[str] = []
     assert proc.stdout is not None
-    # Read line by line as bytes
-    while True:
-        line = await proc.stdout.readline()
-        if not line:
-            break
-        try:
-            decoded = line.decode('utf-8', errors='replace').rstrip('\n')
-        except Exception:
-            decoded = str(line)
-        lines.append(decoded)
-        print(decoded)
-    await proc.wait()
+    try:
+        # Read line by line as bytes
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            try:
+                decoded = line.decode('utf-8', errors='replace').rstrip('\n')
+            except Exception:
+                decoded = str(line)
+            lines.append(decoded)
+            print(decoded)
+        await proc.wait()
+    finally:
+        if submission_id:
+            _running.pop(submission_id, None)
+    if proc.returncode is not None and proc.returncode < 0:
+        return SubmitResponse(status="Aborted", raw_output=lines)
     status = _parse_status(lines)
     if proc.returncode != 0 and status == "Unknown":
         raise RuntimeError("boj submit 실패")
@@ -119,7 +135,7 @@ async def submit(req: CodeRequest):
         problem_dir, main_file = await asyncio.to_thread(_ensure_problem, req.problem_id, filetype)
         await asyncio.to_thread(_write_code, main_file, req.code)
         # Submit
-        resp = await _run_submit(req.problem_id)
+        resp = await _run_submit(req.problem_id, req.submission_id)
         return resp
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -127,3 +143,16 @@ async def submit(req: CodeRequest):
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"알 수 없는 오류: {e}")
+
+
+@app.post("/abort/{submission_id}")
+async def abort(submission_id: str):
+    """진행 중인 제출의 `boj submit` 프로세스 그룹 종료 (이미 백준에 전송된 제출은 취소되지 않고 결과 대기만 멈춤)"""
+    proc = _running.get(submission_id)
+    if proc is None or proc.returncode is not None:
+        return {"aborted": False}
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        return {"aborted": False}
+    return {"aborted": True}
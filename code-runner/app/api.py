@@ -1,7 +1,8 @@
+import asyncio
 from fastapi import FastAPI, HTTPException
 from celery.result import AsyncResult
-from .worker import celery_app, run_code_task
-from .schemas import CodeRequest, TaskResponse
+from .worker import celery_app, run_code_task, kill_task_containers
+from .schemas import CodeRequest, TaskResponse, RevokeRequest, RevokeResponse
 
 app = FastAPI()
 
@@ -14,7 +15,9 @@ def health_check():
 @app.post("/run-code", response_model=TaskResponse)
 async def submit_code(req: CodeRequest):
     """코드를 실행 요청을 받아 Celery 작업 큐에 넣고 작업 ID를 반환합니다."""
-    task = run_code_task.delay(req.language, req.code, req.input_value)
+    task = run_code_task.delay(
+        req.language, req.code, req.input_value, req.time_limit, req.memory_limit_mb, req.syntax_only
+    )
     return {"task_id": task.id}
 
 
@@ -27,6 +30,10 @@ async def get_result(task_id: str):
         # 작업이 아직 완료되지 않았을 경우
         return {"status": task_result.status, "result": None}
 
+    if task_result.status == "REVOKED":
+        # /revoke로 취소된 작업
+        return {"status": task_result.status, "result": None}
+
     if task_result.failed():
         # 작업이 실패했을 경우
         raise HTTPException(status_code=500, detail=str(task_result.info))
@@ -34,3 +41,12 @@ async def get_result(task_id: str):
     # 작업이 성공적으로 완료되었을 경우
     result = task_result.get()
     return {"status": task_result.status, "result": result}
+
+
+@app.post("/revoke", response_model=RevokeResponse)
+async def revoke_tasks(req: RevokeRequest):
+    """작업을 취소합니다. 대기 중인 작업은 실행되지 않고, 실행 중인 작업은 워커 프로세스와 컨테이너를 종료합니다."""
+    if req.task_ids:
+        celery_app.control.revoke(req.task_ids, terminate=True, signal="SIGKILL")
+    killed = await asyncio.to_thread(kill_task_containers, req.task_ids)
+    return {"revoked": len(req.task_ids), "containers_killed": killed}
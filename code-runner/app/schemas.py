@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -5,7 +6,21 @@ class CodeRequest(BaseModel):
     language: str
     input_value: str
     code: str
+    # 지정하면 실행 시간/메모리를 측정하고 시간 제한(초)을 넘기면 강제 종료합니다.
+    time_limit: Optional[float] = None
+    memory_limit_mb: Optional[int] = None
+    # true면 실행하지 않고 컴파일러/인터프리터로 문법만 검사합니다 (input_value는 무시).
+    syntax_only: bool = False
 
 
 class TaskResponse(BaseModel):
     task_id: str
+
+
+class RevokeRequest(BaseModel):
+    task_ids: List[str]
+
+
+class RevokeResponse(BaseModel):
+    revoked: int
+    containers_killed: int
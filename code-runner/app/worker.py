@@ -1,5 +1,7 @@
+from typing import List, Optional
+
 import docker
-from docker.errors import ContainerError
+from docker.errors import ContainerError, NotFound
 from celery import Celery
 
 # Celery 애플리케이션을 생성합니다.
@@ -13,79 +15,230 @@ celery_app = Celery(
 client = docker.from_env()
 
 # 지원할 언어와 해당 언어의 도커 이미지, 실행 명령어를 정의합니다.
+# measured_image는 같은 이미지에 GNU time을 더한 측정 실행용 이미지입니다 (images/Dockerfile).
 SUPPORTED_LANGUAGES = {
     "python": {
         "image": "python:3.12-slim",
+        "measured_image": "code-runner-python:3.12-slim",
         "command": ["/bin/sh", "-c"],
     },
     "javascript": {
         "image": "node:18-slim",
+        "measured_image": "code-runner-node:18-slim",
         "command": ["/bin/sh", "-c"],
     },
     "c": {
         "image": "gcc:12.3",
+        "measured_image": "code-runner-gcc:12.3",
         "command": ["/bin/sh", "-c"],
     },
     "cpp": {
         "image": "gcc:12.3",
+        "measured_image": "code-runner-gcc:12.3",
         "command": ["/bin/sh", "-c"],
     },
     "java": {
         "image": "openjdk:17-slim",
+        "measured_image": "code-runner-openjdk:17-slim",
         "command": ["/bin/sh", "-c"],
     },
 }
 
 
-@celery_app.task
-def run_code_task(language: str, code: str, input_val: str):
-    """Celery 작업으로, 주어진 코드를 Docker 컨테이너에서 실행합니다."""
+# 언어별 (소스 파일명, 컴파일 명령, 실행 명령) - 일반 실행과 측정 실행이 같은 컴파일 옵션으로 만든 프로그램을 돌리도록 한 곳에서 정의
+RUN_COMMANDS = {
+    "python": ("main.py", None, "python3 main.py"),
+    "javascript": ("main.js", None, "node main.js"),
+    "c": ("a.c", "gcc -O2 a.c -o a.out", "./a.out"),
+    "cpp": ("a.cpp", "g++ -O2 -std=c++17 a.cpp -o a.out", "./a.out"),
+    "java": ("Main.java", "javac Main.java", "java Main"),
+}
+
+# 문법 검사용: (소스 파일명, 실행하지 않고 문법/타입만 확인하는 명령)
+SYNTAX_CHECK_COMMANDS = {
+    "python": ("main.py", "python3 -m py_compile main.py"),
+    "javascript": ("main.js", "node --check main.js"),
+    "c": ("a.c", "gcc -fsyntax-only a.c"),
+    "cpp": ("a.cpp", "g++ -std=c++17 -fsyntax-only a.cpp"),
+    "java": ("Main.java", "javac -d /tmp Main.java"),
+}
+
+# 작업 취소(revoke) 시 실행 중인 컨테이너를 찾기 위한 라벨
+TASK_LABEL = "code-runner.task-id"
+
+METRICS_MARKER = "__CODE_RUNNER_METRICS__"
+# 측정 실행의 메모리 상한 (문제 제한을 넘는 사용량도 관측할 수 있도록 여유를 둠)
+MAX_MEASURED_MEMORY_MB = 1024
+TIMEOUT_EXIT_CODE = 124
+
+
+def _build_plain_script(language: str, code: str, input_val: str) -> str:
+    """소스를 쓰고 (컴파일한 뒤) 입력을 표준 입력으로 넣어 실행하는 셸 스크립트"""
+    filename, compile_cmd, run_cmd = RUN_COMMANDS[language]
+    compile_step = f"{compile_cmd} >/dev/null 2>&1 || exit 1\n" if compile_cmd else ""
+    return (
+        f"cat <<'EOF' > {filename}\n{code}\nEOF\n"
+        f"{compile_step}"
+        f"cat <<'EOI' | {run_cmd}\n{input_val}\nEOI\n"
+    )
+
+
+def _build_measured_script(language: str, code: str, input_val: str, time_limit: float) -> str:
+    """GNU time으로 실행 시간과 최대 RSS를 재며 프로그램을 실행하는 셸 스크립트.
+
+    time은 종료한 프로그램의 rusage(wait4)로 값을 남기므로 측정 중에 다른 프로세스가 돌지 않고,
+    바로 끝나는 프로그램의 메모리도 기록된다. 제한 시간을 넘기면 timeout이 종료시킨다 (종료 코드 124,
+    TERM을 무시하면 1초 뒤 KILL).
+    stdout 뒤에 `__CODE_RUNNER_METRICS__ <exit code> <elapsed s> <peak kb>` 한 줄과 stderr가 이어집니다.
+    컴파일 시간/메모리는 측정에 포함되지 않습니다.
+    """
+    filename, compile_cmd, run_cmd = RUN_COMMANDS[language]
+    compile_step = (
+        f"{compile_cmd} >/dev/null 2>&1 || {{ echo 'Compile Error' >&2; exit 1; }}\n"
+        if compile_cmd else ""
+    )
+    return (
+        f"cat <<'EOF' > {filename}\n{code}\nEOF\n"
+        f"cat <<'EOI' > input.txt\n{input_val}\nEOI\n"
+        f"{compile_step}"
+        f"/usr/bin/time -f '%e %M' -o metrics.txt timeout -k 1 {time_limit} {run_cmd} < input.txt > out.txt 2> err.txt\n"
+        "rc=$?\n"
+        "cat out.txt\n"
+        # 프로그램이 0이 아닌 코드로 끝나면 time이 안내 줄을 먼저 쓰므로 마지막 줄만 사용
+        f"printf '\\n{METRICS_MARKER} %s %s\\n' \"$rc\" \"$(tail -n 1 metrics.txt 2>/dev/null)\"\n"
+        "cat err.txt\n"
+    )
+
+
+def kill_task_containers(task_ids: List[str]) -> int:
+    """취소된 작업이 띄운 컨테이너 강제 종료 (워커 프로세스를 죽여도 컨테이너는 도커 데몬에서 계속 돌기 때문)"""
+    killed = 0
+    for task_id in task_ids:
+        for container in client.containers.list(filters={"label": f"{TASK_LABEL}={task_id}"}):
+            try:
+                container.kill()
+                killed += 1
+            except NotFound:
+                pass
+    return killed
+
+
+def _check_syntax(task_id: str, language: str, code: str):
+    """컴파일러/인터프리터로 문법만 검사합니다. 실패하면 verdict CE와 진단 메시지를 반환합니다."""
+    image = SUPPORTED_LANGUAGES[language]["image"]
+    command = SUPPORTED_LANGUAGES[language]["command"].copy()
+    filename, check_cmd = SYNTAX_CHECK_COMMANDS[language]
+    command.append(f"cat <<'EOF' > {filename}\n{code}\nEOF\n{check_cmd}\n")
+
+    try:
+        client.containers.run(
+            image=image,
+            command=command,
+            detach=False,
+            remove=True,
+            network_disabled=True,
+            mem_limit="512m",
+            cpu_period=100000,
+            cpu_quota=100000,
+            labels={TASK_LABEL: task_id},
+            stderr=True,
+            stdout=True,
+            tty=False,
+        )
+    except ContainerError as e:
+        # 컴파일러 진단 메시지는 stderr로 나옴 (종료 코드가 0이 아니면 ContainerError)
+        diagnostics = e.stderr
+        if isinstance(diagnostics, bytes):
+            diagnostics = diagnostics.decode("utf-8", errors="replace")
+        return {"output": "", "error": diagnostics or "Compile Error", "verdict": "CE"}
+    except Exception as e:
+        return {"error": str(e)}
+    return {"output": "", "verdict": "OK"}
+
+
+def _run_measured(task_id: str, language: str, code: str, input_val: str, time_limit: float, memory_limit_mb: Optional[int]):
+    """시간 제한을 걸고 실행하여 출력과 함께 실행 시간/최대 메모리/판정을 반환합니다."""
+    image = SUPPORTED_LANGUAGES[language]["measured_image"]
+    command = SUPPORTED_LANGUAGES[language]["command"].copy()
+    command.append(_build_measured_script(language, code, input_val, time_limit))
+    mem_limit_mb = min(max(2 * (memory_limit_mb or 128), 128), MAX_MEASURED_MEMORY_MB)
+
+    try:
+        logs = client.containers.run(
+            image=image,
+            command=command,
+            detach=False,
+            remove=True,
+            network_disabled=True,
+            mem_limit=f"{mem_limit_mb}m",
+            cpu_period=100000,
+            cpu_quota=100000,  # 1 CPU (측정의 안정성을 위해 채점 환경과 비슷하게)
+            labels={TASK_LABEL: task_id},
+            stderr=True,
+            stdout=True,
+            tty=False,
+        ).decode("utf-8", errors="replace")
+    except ContainerError as e:
+        return {"error": e.stderr.decode("utf-8", errors="replace") if isinstance(e.stderr, bytes) else e.stderr}
+    except Exception as e:
+        return {"error": str(e)}
+
+    output, marker, rest = logs.rpartition(f"\n{METRICS_MARKER} ")
+    if not marker:
+        return {"output": logs, "error": "Failed to collect execution metrics"}
+    metrics_line, _, stderr = rest.partition("\n")
+    metrics = metrics_line.split()
+    if len(metrics) != 3:
+        # time이 없는 이미지이거나 측정 전에 컨테이너가 종료된 경우
+        return {"output": output, "error": stderr or "Failed to collect execution metrics"}
+    exit_code, time_ms, memory_kb = int(metrics[0]), round(float(metrics[1]) * 1000), int(metrics[2])
+
+    if exit_code == TIMEOUT_EXIT_CODE or time_ms >= time_limit * 1000:
+        verdict = "TLE"
+    elif memory_limit_mb and memory_kb > memory_limit_mb * 1024:
+        verdict = "MLE"
+    elif exit_code == 137:
+        # 컨테이너 메모리 상한에 걸려 OOM kill 된 경우
+        verdict = "MLE"
+    elif exit_code != 0:
+        verdict = "RE"
+    else:
+        verdict = "OK"
+
+    result = {"output": output, "time_ms": time_ms, "memory_kb": memory_kb, "verdict": verdict}
+    if verdict == "RE":
+        result["error"] = stderr or f"exit code {exit_code}"
+    return result
+
+
+@celery_app.task(bind=True)
+def run_code_task(
+    self,
+    language: str,
+    code: str,
+    input_val: str,
+    time_limit: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    syntax_only: bool = False,
+):
+    """Celery 작업으로, 주어진 코드를 Docker 컨테이너에서 실행합니다.
+
+    time_limit이 주어지면 실행 시간/메모리를 측정하는 모드로 실행합니다.
+    syntax_only면 실행하지 않고 문법만 검사합니다.
+    """
     if language not in SUPPORTED_LANGUAGES:
         return {"error": f"Unsupported language: {language}"}
 
+    if syntax_only:
+        return _check_syntax(self.request.id, language, code)
+
+    if time_limit is not None:
+        return _run_measured(self.request.id, language, code, input_val, time_limit, memory_limit_mb)
+
     lang_config = SUPPORTED_LANGUAGES[language]
     image = lang_config["image"]
     command = lang_config["command"].copy()
-
-    if language == "c":
-        command.append(
-            (
-                "cat <<'EOF' > a.c\n" f"{code}\nEOF\n"
-                "cat <<'IN' | gcc a.c -o a.out >/dev/null 2>&1 && ./a.out\n" f"{input_val}\nIN\n"
-            )
-        )
-    elif language == "cpp":
-        command.append(
-            (
-                "cat <<'EOF' > a.cpp\n" f"{code}\nEOF\n"
-                "cat <<'IN' | g++ a.cpp -o a.out >/dev/null 2>&1 && ./a.out\n" f"{input_val}\nIN\n"
-            )
-        )
-    elif language == "java":
-        command.append(
-            (
-                "cat <<'EOF' > Main.java\n" f"{code}\nEOF\n"
-                "javac Main.java >/dev/null 2>&1 || exit 1\n"
-                "cat <<'IN' | java Main\n" f"{input_val}\nIN\n"
-            )
-        )
-    elif language == "python":
-        command.append(
-            (
-                "cat <<'EOF' > main.py\n" f"{code}\nEOF\n"  # write code
-                "cat <<'EOI' | python3 main.py\n" f"{input_val}\nEOI\n"  # run with stdin
-            ),
-        )
-    elif language == "javascript":
-        command.append(
-            (
-                "cat <<'EOF' > main.js\n" f"{code}\nEOF\n"
-                "cat <<'EOI' | node main.js\n" f"{input_val}\nEOI\n"
-            )
-        )
-    else:
-        # Fallback: just run the interpreter with -c style if somehow hit (defensive)
-        command.extend([code])
+    command.append(_build_plain_script(language, code, input_val))
 
     try:
         container = client.containers.run(
@@ -97,6 +250,7 @@ def run_code_task(language: str, code: str, input_val: str):
             mem_limit="128m",
             cpu_period=100000,
             cpu_quota=50000,  # 0.5 CPU
+            labels={TASK_LABEL: self.request.id},
             stderr=True,
             stdout=True,
             tty=False,
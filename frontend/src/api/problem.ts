@@ -15,10 +15,15 @@ export type ProblemMetadata = {
 export type CalcCounterExampleRequest = {
   user_code: string
   user_code_language: string
+  stress_mode?: boolean
 }
 
 export type CalcCounterExampleResponse = {
-  counter_example_input: string
+  counter_example_found: boolean
+  counter_example_input?: string | null
+  original_counter_example_input?: string | null
+  counter_example_detail?: Record<string, unknown> | null
+  stats: Record<string, unknown>
 }
 
 // GET /problem/{id}
@@ -1,15 +1,35 @@
+export interface NodeTrace {
+	node: string;
+	attempt: number;
+	difficulty: number;
+	started_at: number;
+	ended_at: number;
+	duration_ms: number;
+	llm_calls: number;
+	llm_ms: number;
+	llm_input_tokens: number;
+	llm_output_tokens: number;
+	code_runner_calls: number;
+	code_runner_ms: number;
+	boj_calls: number;
+	boj_ms: number;
+	error?: string | null;
+}
+
 export type CounterexampleEvent =
 	| { type: 'token'; node: string; content: string }
 	| { type: 'node_start'; node: string }
 	| { type: 'node_end'; node: string; success?: boolean; counterexample_found?: boolean }
-	| { type: 'node_update'; node: string; data?: any }
+	| { type: 'node_update'; node: string; data?: any; trace?: NodeTrace }
+	| { type: 'run'; run_id: string }
 	| { type: 'message'; role?: string; content?: string }
-	| { type: 'finish'; counterexample_found: boolean; counterexample_input?: string; counterexample_detail?: any; correct_solution?: string; input_generator?: string }
+	| { type: 'finish'; counterexample_found: boolean; counterexample_input?: string; counterexample_detail?: any; correct_solution?: string; solution_language?: string; input_generator?: string }
 	| { type: 'error'; message: string; trace?: string };
 
 export enum NodeType {
   Solve = 'solve',
   BojSubmit = 'boj_submit',
   GenerateInputs = 'generate_inputs',
+  RegenerateInputs = 'regenerate_inputs',
   RunAndCompare = 'run_and_compare',
 }
\ No newline at end of file
@@ -65,6 +65,7 @@ function get_current_node(e: CounterexampleEvent): string | null {
         else
           return NodeType.Solve
       case NodeType.GenerateInputs:
+      case NodeType.RegenerateInputs:
         return NodeType.RunAndCompare
       case NodeType.RunAndCompare:
         if (e.data.counterexample_found)